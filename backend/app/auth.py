@@ -1,17 +1,32 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app import metrics
 from app.database import get_db
 from app.models import User
+from app.utils.cache import TTLCache
 
 SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+PRINCIPAL_CACHE_SIZE = 10_000
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+PASSWORD_HASH_QUEUE_DEPTH = 32
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -24,6 +39,68 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 
+class PasswordHashPool:
+    """Runs bcrypt on a dedicated thread pool so that password work cannot
+    occupy the threadpool that serves the rest of the API. At most
+    ``max_workers + max_queued`` calls may be in flight; beyond that the
+    request is rejected with 503 and a Retry-After header."""
+
+    def __init__(self, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, func: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.PASSWORD_HASH_REJECTED.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry",
+                    headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+                )
+            self._pending += 1
+        metrics.PASSWORD_HASH_PENDING.inc()
+        labels = (func.__name__,)
+        queued_at = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            metrics.PASSWORD_HASH_WAIT.observe(started - queued_at, labels)
+            try:
+                return func(*args)
+            finally:
+                metrics.PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, labels)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            metrics.PASSWORD_HASH_PENDING.dec()
+            with self._lock:
+                self._pending -= 1
+
+
+password_pool = PasswordHashPool(
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_queued=PASSWORD_HASH_QUEUE_DEPTH,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -36,6 +113,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def decode_token_subject(token: str) -> Optional[int]:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("sub")
+        if user_id is None:
+            return None
+        return int(user_id)
+    except (JWTError, ValueError):
+        return None
+
+
+def load_principal(db: Session, user_id: int) -> Optional[User]:
+    """Return the authenticated user for ``user_id``, served from the principal
+    cache when possible. Cached principals are detached copies without the
+    password hash, so they must not be added to a session."""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    return cache_principal(db.query(User).filter(User.id == user_id).first())
+
+
+def cache_principal(user: Optional[User]) -> Optional[User]:
+    if user is None:
+        return None
+    principal = User(id=user.id, email=user.email, created_at=user.created_at)
+    principal_cache.set(user.id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_principal(mapper, connection, target):
+    invalidate_principal(target.id)
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -45,16 +162,11 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        user_id = int(user_id)
-    except (JWTError, ValueError):
+    user_id = decode_token_subject(token)
+    if user_id is None:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_principal(db, user_id)
     if user is None:
         raise credentials_exception
     return user
@@ -74,12 +186,7 @@ def get_current_user_optional(
     token = get_token_from_request(request)
     if not token:
         return None
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-        user_id = int(user_id)
-    except (JWTError, ValueError):
+    user_id = decode_token_subject(token)
+    if user_id is None:
         return None
-    return db.query(User).filter(User.id == user_id).first()
+    return load_principal(db, user_id)
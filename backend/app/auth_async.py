@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import Depends, HTTPException, status, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import (
+    oauth2_scheme,
+    principal_cache,
+    cache_principal,
+    decode_token_subject,
+    get_token_from_request,
+)
+from app.database import get_async_db
+from app.models import User
+
+
+async def load_principal_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    return cache_principal(result.scalar_one_or_none())
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    user_id = decode_token_subject(token)
+    if user_id is None:
+        raise credentials_exception
+
+    user = await load_principal_async(db, user_id)
+    if user is None:
+        raise credentials_exception
+    return user
+
+
+async def get_current_user_optional_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    token = get_token_from_request(request)
+    if not token:
+        return None
+    user_id = decode_token_subject(token)
+    if user_id is None:
+        return None
+    return await load_principal_async(db, user_id)
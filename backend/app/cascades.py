@@ -0,0 +1,80 @@
+from sqlalchemy.engine import Engine
+
+from app.database import engine
+from app.models import User, create_change_triggers, task_tags
+
+
+def has_cascades(conn) -> bool:
+    actions = [row[6] for row in conn.exec_driver_sql("PRAGMA foreign_key_list(task_tags)")]
+    return bool(actions) and all(action == "CASCADE" for action in actions)
+
+
+def apply_cascades(bind: Engine = engine) -> bool:
+    """Rebuild ``task_tags`` of a database created before its foreign keys
+    cascaded. SQLite cannot alter a constraint, so the table is recreated and
+    its links copied over, minus any that already point at missing rows.
+    Returns True when the table was rebuilt."""
+    with bind.begin() as conn:
+        if has_cascades(conn):
+            return False
+        dependents = conn.exec_driver_sql(
+            "SELECT type, name FROM sqlite_master "
+            "WHERE tbl_name = 'task_tags' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ).all()
+        for kind, name in dependents:
+            conn.exec_driver_sql(f"DROP {kind.upper()} {name}")
+        conn.exec_driver_sql("ALTER TABLE task_tags RENAME TO task_tags_old")
+        task_tags.create(conn)
+        conn.exec_driver_sql(
+            "INSERT INTO task_tags (task_id, tag_id) SELECT task_id, tag_id FROM task_tags_old "
+            "WHERE task_id IN (SELECT id FROM tasks) AND tag_id IN (SELECT id FROM tags)"
+        )
+        conn.exec_driver_sql("DROP TABLE task_tags_old")
+        create_change_triggers(conn)
+    return True
+
+
+def has_autoincrement(conn) -> bool:
+    sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'users'").scalar()
+    return sql is not None and "AUTOINCREMENT" in sql.upper()
+
+
+def apply_autoincrement(bind: Engine = engine) -> bool:
+    """Rebuild ``users`` of a database created before it used AUTOINCREMENT.
+    Without it SQLite hands the id of the newest deleted account to the next
+    one, and the deleted account's tokens would authenticate as the new user.
+    Foreign keys are off while the table is swapped, and the rename leaves the
+    references of other tables alone. Returns True when the table was rebuilt."""
+    with bind.connect() as conn:
+        if has_autoincrement(conn):
+            return False
+        conn.commit()
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+        conn.commit()
+        try:
+            with conn.begin():
+                dependents = conn.exec_driver_sql(
+                    "SELECT type, name FROM sqlite_master "
+                    "WHERE tbl_name = 'users' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+                ).all()
+                for kind, name in dependents:
+                    conn.exec_driver_sql(f"DROP {kind.upper()} {name}")
+                conn.exec_driver_sql("ALTER TABLE users RENAME TO users_old")
+                User.__table__.create(conn)
+                conn.exec_driver_sql(
+                    "INSERT INTO users (id, email, password, created_at) "
+                    "SELECT id, email, password, created_at FROM users_old"
+                )
+                conn.exec_driver_sql("DROP TABLE users_old")
+                create_change_triggers(conn)
+        finally:
+            conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+            conn.commit()
+    return True
+
+
+if __name__ == "__main__":
+    print("Rebuilt task_tags with cascading foreign keys" if apply_cascades() else "Cascades present")
+    print("Rebuilt users with AUTOINCREMENT" if apply_autoincrement() else "AUTOINCREMENT present")
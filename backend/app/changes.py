@@ -0,0 +1,73 @@
+import hashlib
+import os
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import user_versions, create_change_triggers
+from app.utils.cache import UserResponseCache
+
+TASK_LIST_CACHE_SIZE = int(os.getenv("TODO_TASK_LIST_CACHE_SIZE", "2048"))
+TASK_LIST_CACHE_TTL_SECONDS = float(os.getenv("TODO_TASK_LIST_CACHE_TTL", "30"))
+TASK_LIST_CACHE_MAX_BYTES = int(os.getenv("TODO_TASK_LIST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TASK_LIST_CACHE_MAX_ENTRY_BYTES = int(os.getenv("TODO_TASK_LIST_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+
+# Serialized GET /tasks bodies keyed by (user_id, data version, query). The
+# version makes entries from before a write unreachable even when the write
+# happened in another process; invalidate_task_lists frees them eagerly.
+task_list_cache = UserResponseCache(
+    maxsize=TASK_LIST_CACHE_SIZE,
+    ttl=TASK_LIST_CACHE_TTL_SECONDS,
+    max_bytes=TASK_LIST_CACHE_MAX_BYTES,
+    max_entry_bytes=TASK_LIST_CACHE_MAX_ENTRY_BYTES,
+)
+
+
+def invalidate_task_lists(user_id: int) -> None:
+    task_list_cache.invalidate_user(user_id)
+
+
+def apply_triggers(bind: Engine = engine) -> None:
+    """Install the change-tracking triggers on a database whose tables were
+    created before they existed."""
+    with bind.begin() as conn:
+        create_change_triggers(conn)
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    version = db.scalar(select(user_versions.c.version).where(user_versions.c.user_id == user_id))
+    return version or 0
+
+
+def make_etag(request: Request, user_id: int, version: int) -> str:
+    # The body depends on the path and query string as well as the data, so
+    # they are folded into the tag alongside the user's data version.
+    query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+    digest = hashlib.blake2b(
+        f"{user_id}:{request.url.path}?{query}".encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    # Weak comparison: W/"x" and "x" match.
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == opaque for tag in candidates)
+
+
+def etag_headers(request: Request, user_id: int, version: int) -> dict:
+    return {"ETag": make_etag(request, user_id, version), "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, headers: dict) -> Optional[Response]:
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
@@ -1,12 +1,107 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./todo.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("TODO_DATABASE_URL", "sqlite:///./todo.db")
+# "sync" serves every router from the threadpool with a blocking Session;
+# "async" mounts the asyncio routers backed by aiosqlite.
+DB_MODE = os.getenv("TODO_DB_MODE", "sync")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+# "tuned" applies SQLITE_PRAGMAS on every new connection and sizes the pool
+# from the settings below; "default" keeps SQLite's and SQLAlchemy's defaults.
+SQLITE_PROFILE = os.getenv("TODO_SQLITE_PROFILE", "tuned")
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("TODO_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("TODO_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": int(os.getenv("TODO_SQLITE_CACHE_SIZE", "-65536")),
+    "mmap_size": int(os.getenv("TODO_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "busy_timeout": int(os.getenv("TODO_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": os.getenv("TODO_SQLITE_TEMP_STORE", "MEMORY"),
+}
+# Applied on every connection whatever the profile: deleting a task or tag
+# relies on ON DELETE CASCADE to remove its task_tags rows.
+SQLITE_REQUIRED_PRAGMAS = {"foreign_keys": "ON"}
+DB_POOL_SIZE = int(os.getenv("TODO_DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("TODO_DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("TODO_DB_POOL_TIMEOUT", "30"))
+
+
+def is_memory_url(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def engine_options(url: str, profile: str = SQLITE_PROFILE) -> dict:
+    options = {"connect_args": {"check_same_thread": False}}
+    if profile == "tuned" and not is_memory_url(url):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def configure_engine(engine: Engine, url: str, profile: str = SQLITE_PROFILE) -> Engine:
+    """Install the connect-time pragma hook: SQLITE_REQUIRED_PRAGMAS always,
+    plus SQLITE_PRAGMAS for the tuned profile. ``engine`` may be a sync engine
+    or the ``sync_engine`` of an async one."""
+    pragmas = dict(SQLITE_REQUIRED_PRAGMAS)
+    if profile == "tuned":
+        pragmas.update(SQLITE_PRAGMAS)
+        if is_memory_url(url):
+            pragmas.pop("journal_mode")
+            pragmas.pop("mmap_size")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return engine
+
+
+def build_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = SQLITE_PROFILE) -> Engine:
+    return configure_engine(create_engine(url, **engine_options(url, profile)), url, profile)
+
+
+def describe_engine(engine: Engine) -> dict:
+    """Report the pragmas in effect on a pooled connection and the pool state.
+    The database URL is left out: ``/health/db`` serves this without auth."""
+    with engine.connect() as conn:
+        pragmas = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in {**SQLITE_REQUIRED_PRAGMAS, **SQLITE_PRAGMAS}
+        }
+    pool = engine.pool
+
+    def pool_stat(name):
+        stat = getattr(pool, name, None)
+        return stat() if callable(stat) else stat
+
+    return {
+        "profile": SQLITE_PROFILE,
+        "mode": DB_MODE,
+        "pragmas": pragmas,
+        "pool": {
+            "class": type(pool).__name__,
+            "size": pool_stat("size"),
+            "checked_out": pool_stat("checkedout"),
+            "overflow": pool_stat("overflow"),
+            "timeout": pool_stat("timeout"),
+        },
+    }
+
+
+engine = build_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -19,3 +114,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """Create the async engine on first use so that the asyncio extension and
+    aiosqlite are only required when async mode is enabled."""
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        async_url = to_async_url(SQLALCHEMY_DATABASE_URL)
+        options = engine_options(SQLALCHEMY_DATABASE_URL)
+        options.pop("connect_args")
+        _async_engine = create_async_engine(async_url, **options)
+        configure_engine(_async_engine.sync_engine, SQLALCHEMY_DATABASE_URL)
+        from app.metrics import instrument_pool
+        from app.profiling import instrument_engine
+
+        instrument_pool(_async_engine.sync_engine, "async")
+        instrument_engine(_async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,137 @@
+"""In-process publish/subscribe for per-user change events, streamed to
+clients as Server-Sent Events. Write paths publish after they commit; every
+open stream of that user gets the event. Events are not persisted, so a
+client that reconnects refetches what it shows."""
+import asyncio
+import itertools
+import json
+import os
+import threading
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+from app import metrics
+
+EVENT_QUEUE_SIZE = int(os.getenv("TODO_EVENT_QUEUE_SIZE", "100"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("TODO_EVENT_HEARTBEAT_SECONDS", "15"))
+EVENT_MAX_STREAMS_PER_USER = int(os.getenv("TODO_EVENT_MAX_STREAMS_PER_USER", "10"))
+# Events about more tasks than this carry no ids; clients refetch instead.
+EVENT_MAX_IDS = 100
+EVENT_RETRY_MS = 5000
+
+HEARTBEAT = b": ping\n\n"
+# Sent in place of the events a slow client missed when its queue filled up.
+RESYNC = b"event: resync\ndata: {}\n\n"
+# Ends a stream, e.g. when the user's sessions are revoked.
+CLOSE = b""
+
+
+class TooManyStreams(Exception):
+    pass
+
+
+class Subscription:
+    """One open stream. Its queue is bounded: a client that stops reading
+    loses the queued events and gets a single ``resync`` instead, so a slow
+    tab cannot make the server buffer without limit."""
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize)
+        # Until the client reads the queued resync, later events add nothing.
+        self.resync_pending = False
+
+    def offer(self, payload: bytes) -> None:
+        """Queue ``payload``; must run on the subscription's loop."""
+        if self.resync_pending and payload is not CLOSE:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            if payload is CLOSE:
+                self.queue.put_nowait(CLOSE)
+            else:
+                self.queue.put_nowait(RESYNC)
+                self.resync_pending = True
+
+    async def stream(self, heartbeat: Optional[float] = None) -> AsyncIterator[bytes]:
+        heartbeat = EVENT_HEARTBEAT_SECONDS if heartbeat is None else heartbeat
+        yield f"retry: {EVENT_RETRY_MS}\n\n".encode()
+        while True:
+            try:
+                payload = await asyncio.wait_for(self.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if payload is CLOSE:
+                return
+            if payload is RESYNC:
+                self.resync_pending = False
+            yield payload
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE, max_streams_per_user: int = EVENT_MAX_STREAMS_PER_USER):
+        self.queue_size = queue_size
+        self.max_streams_per_user = max_streams_per_user
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            streams = self._subscriptions.setdefault(user_id, set())
+            if len(streams) >= self.max_streams_per_user:
+                raise TooManyStreams()
+            streams.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            streams = self._subscriptions.get(subscription.user_id)
+            if streams is not None:
+                streams.discard(subscription)
+                if not streams:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self, user_id: Optional[int] = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscriptions.get(user_id, ()))
+            return sum(len(streams) for streams in self._subscriptions.values())
+
+    def _send(self, user_id: int, payload: bytes) -> None:
+        with self._lock:
+            streams = list(self._subscriptions.get(user_id, ()))
+        for subscription in streams:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, payload)
+            except RuntimeError:
+                # The stream's loop has shut down; its finally block never ran.
+                self.unsubscribe(subscription)
+
+    def publish(self, user_id: int, event: str, ids: Optional[Iterable[int]] = None) -> None:
+        """Send ``event`` about ``ids`` to the user's open streams. Safe to
+        call from any thread; the event is encoded once for all streams."""
+        if user_id not in self._subscriptions:
+            return
+        ids = list(ids) if ids is not None else None
+        if ids is not None and len(ids) > EVENT_MAX_IDS:
+            ids = None
+        data = json.dumps({"type": event, "ids": ids}, separators=(",", ":"))
+        self._send(user_id, f"id: {next(self._ids)}\nevent: {event}\ndata: {data}\n\n".encode())
+
+    def disconnect(self, user_id: int) -> None:
+        """End every open stream of ``user_id``."""
+        self._send(user_id, CLOSE)
+
+
+event_broker = EventBroker()
+
+metrics.registry.register(metrics.Gauge(
+    "event_streams_open", "Open change-event streams.",
+    function=lambda: [((), event_broker.subscriber_count())],
+))
@@ -0,0 +1,58 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database import Base, engine
+import app.models  # noqa: F401  (registers tables on Base.metadata)
+
+
+def merge_duplicate_tags(conn) -> None:
+    """Fold tags that share a name for one user into the oldest of them, moving
+    their task links over, so that uq_tags_user_id_name can be created."""
+    duplicates = (
+        "SELECT t.id AS id, k.keep_id AS keep_id FROM tags t JOIN ("
+        "SELECT user_id, name, MIN(id) AS keep_id FROM tags WHERE user_id IS NOT NULL "
+        "GROUP BY user_id, name HAVING COUNT(*) > 1"
+        ") k ON k.user_id = t.user_id AND k.name = t.name WHERE t.id <> k.keep_id"
+    )
+    conn.exec_driver_sql(
+        "INSERT OR IGNORE INTO task_tags (task_id, tag_id) SELECT tt.task_id, d.keep_id "
+        f"FROM task_tags tt JOIN ({duplicates}) d ON d.id = tt.tag_id"
+    )
+    conn.exec_driver_sql(f"DELETE FROM task_tags WHERE tag_id IN (SELECT id FROM ({duplicates}))")
+    conn.exec_driver_sql(f"DELETE FROM tags WHERE id IN (SELECT id FROM ({duplicates}))")
+
+
+# Run before creating an index that existing rows may violate.
+INDEX_PREPARATIONS = {"uq_tags_user_id_name": merge_duplicate_tags}
+# Indexes made redundant by a declared one; dropped when found.
+RETIRED_INDEXES = {"tags": ["ix_tags_user_id_name"]}
+
+
+def apply_indexes(bind: Engine = engine) -> list:
+    """Create any index declared on the models that is missing from an existing
+    database. ``create_all`` skips indexes of tables that already exist, so this
+    upgrades ``todo.db`` files created before the index set was declared."""
+    created = []
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    if index.name in INDEX_PREPARATIONS:
+                        INDEX_PREPARATIONS[index.name](conn)
+                    index.create(conn)
+                    created.append(index.name)
+            for name in RETIRED_INDEXES.get(table.name, ()):
+                if name in existing:
+                    conn.exec_driver_sql(f"DROP INDEX {name}")
+        if created:
+            conn.execute(text("ANALYZE"))
+    return created
+
+
+if __name__ == "__main__":
+    names = apply_indexes()
+    print(f"Created {len(names)} index(es): {', '.join(names)}" if names else "All indexes present")
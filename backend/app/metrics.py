@@ -0,0 +1,252 @@
+"""Prometheus metrics kept in process and rendered in the text exposition
+format on ``GET /metrics``. Updates take one lock per series, so they can stay
+on under full load."""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PASSWORD_HASH_BUCKETS = (0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+# Requests that matched no route share one label value, so that scans of
+# random URLs cannot grow the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield self.name, _format_labels(self.labels, labels), value
+
+
+class Gauge(Metric):
+    """A gauge that is either set directly or, with ``function``, read at
+    scrape time as ``[(labels, value), ...]``."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 function: Optional[Callable[[], Iterable[Tuple[tuple, float]]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[tuple, float] = {}
+        self.function = function
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+    def samples(self):
+        if self.function is not None:
+            values = sorted(self.function())
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        for labels, value in values:
+            yield self.name, _format_labels(self.labels, labels), value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        names = self.labels + ("le",)
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(names, labels + (_format_value(bound),)), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labels, labels), total
+            yield f"{self.name}_count", _format_labels(self.labels, labels), cumulative
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP responses by route template and status code.", ("method", "route", "status")
+))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to send the complete response.", ("method", "route")
+))
+HTTP_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "Requests being served."))
+
+_pools: Dict[str, Engine] = {}
+
+
+def _pool_stats() -> List[Tuple[tuple, float]]:
+    stats = []
+    for name, engine in list(_pools.items()):
+        for stat in ("size", "checkedout", "overflow"):
+            method = getattr(engine.pool, stat, None)
+            if callable(method):
+                stats.append(((name, stat), method()))
+    return stats
+
+
+DB_POOL_CONNECTIONS = registry.register(Gauge(
+    "db_pool_connections", "Pool size, checked-out connections and overflow.", ("pool", "state"),
+    function=_pool_stats,
+))
+DB_POOL_CHECKOUTS = registry.register(Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.", ("pool",)
+))
+DB_POOL_CONNECTS = registry.register(Counter(
+    "db_pool_connects_total", "New DBAPI connections opened by the pool.", ("pool",)
+))
+DB_POOL_CHECKOUT_DURATION = registry.register(Histogram(
+    "db_pool_checkout_duration_seconds", "Time a connection stayed checked out.", ("pool",)
+))
+
+PASSWORD_HASH_DURATION = registry.register(Histogram(
+    "password_hash_duration_seconds", "Time spent in bcrypt.", ("operation",), buckets=PASSWORD_HASH_BUCKETS
+))
+PASSWORD_HASH_WAIT = registry.register(Histogram(
+    "password_hash_wait_seconds", "Time bcrypt calls waited for a worker.", ("operation",)
+))
+PASSWORD_HASH_REJECTED = registry.register(Counter(
+    "password_hash_rejected_total", "bcrypt calls rejected because the pool was full."
+))
+PASSWORD_HASH_PENDING = registry.register(Gauge(
+    "password_hash_pending", "bcrypt calls running or queued."
+))
+
+
+def instrument_pool(engine: Engine, name: str = "sync") -> Engine:
+    """Count checkouts and new connections of ``engine``'s pool and time how
+    long each connection stays checked out. ``engine`` may be the
+    ``sync_engine`` of an async engine."""
+    _pools[name] = engine
+    labels = (name,)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.inc(labels)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        DB_POOL_CHECKOUTS.inc(labels)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started, labels)
+
+    return engine
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status per route template. The
+    router stores the matched route in the scope, so ``/tasks/1`` and
+    ``/tasks/2`` both count as ``/tasks/{task_id}``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.observe(elapsed, (scope["method"], route))
+            HTTP_REQUESTS.inc((scope["method"], route, str(status_code)))
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Table
+from sqlalchemy import (
+    Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Table, Index, UniqueConstraint, text, event
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -7,11 +9,120 @@ from app.database import Base
 task_tags = Table(
     "task_tags",
     Base.metadata,
-    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
-    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    # Deleting a task or tag removes its links in the same statement; needs
+    # PRAGMA foreign_keys=ON, which every engine from app.database sets.
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+)
+
+# Per-user counter bumped by the triggers below on every write to the user's
+# tasks, tags or task_tags rows, whichever code path performs it.
+user_versions = Table(
+    "user_versions",
+    Base.metadata,
+    Column("user_id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+
+# One row per task or tag holding its latest change, so that catching up reads
+# only what changed since a client's token: every write moves the row to a new
+# ``seq`` (AUTOINCREMENT never reuses one), and deletes leave a tombstone
+# (``deleted = 1``) until it is compacted away.
+sync_log = Table(
+    "sync_log",
+    Base.metadata,
+    Column("seq", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False),
+    Column("entity", String, nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("deleted", Boolean, nullable=False, default=False),
+    Column("changed_at", DateTime, nullable=False, server_default=func.now()),
+    UniqueConstraint("entity", "entity_id", name="uq_sync_log_entity"),
+    Index("ix_sync_log_user_id_seq", "user_id", "seq"),
+    Index("ix_sync_log_tombstones", "changed_at", sqlite_where=text("deleted = 1")),
+    sqlite_autoincrement=True,
+)
+
+# Highest seq removed by each tombstone compaction; tokens older than the
+# latest one may have missed deletions.
+sync_compactions = Table(
+    "sync_compactions",
+    Base.metadata,
+    Column("seq", Integer, primary_key=True),
+    Column("compacted_at", DateTime, nullable=False, server_default=func.now()),
 )
 
 
+def _bump_version(user_id_sql: str) -> str:
+    return (
+        "INSERT INTO user_versions (user_id, version) "
+        f"SELECT {user_id_sql}, 1 WHERE {user_id_sql} IS NOT NULL "
+        "ON CONFLICT (user_id) DO UPDATE SET version = version + 1;"
+    )
+
+
+_TASK_OWNER = "(SELECT user_id FROM tasks WHERE id = {row}.task_id)"
+
+
+def _log_change(entity: str, id_sql: str, user_id_sql: str, deleted: int) -> str:
+    # DELETE + INSERT rather than INSERT OR REPLACE: an outer INSERT OR IGNORE
+    # (as in bulk tagging) would override the trigger's conflict clause.
+    return (
+        f"DELETE FROM sync_log WHERE entity = '{entity}' AND entity_id = {id_sql};"
+        "INSERT INTO sync_log (user_id, entity, entity_id, deleted) "
+        f"SELECT {user_id_sql}, '{entity}', {id_sql}, {deleted} WHERE {user_id_sql} IS NOT NULL;"
+    )
+
+
+def _log_task_tags_change(row: str) -> str:
+    # A link change is a change of its task, unless the task itself is gone
+    # (bulk delete removes links after their tasks) and already has a tombstone.
+    return (
+        f"DELETE FROM sync_log WHERE entity = 'task' AND entity_id = {row}.task_id "
+        f"AND EXISTS (SELECT 1 FROM tasks WHERE id = {row}.task_id);"
+        "INSERT INTO sync_log (user_id, entity, entity_id, deleted) "
+        f"SELECT user_id, 'task', id, 0 FROM tasks WHERE id = {row}.task_id AND user_id IS NOT NULL;"
+    )
+
+
+CHANGE_TRIGGERS = {
+    "trg_tasks_version_insert": ("AFTER INSERT ON tasks", _bump_version("NEW.user_id")),
+    "trg_tasks_version_update": ("AFTER UPDATE ON tasks", _bump_version("NEW.user_id")),
+    "trg_tasks_version_delete": ("AFTER DELETE ON tasks", _bump_version("OLD.user_id")),
+    "trg_tags_version_insert": ("AFTER INSERT ON tags", _bump_version("NEW.user_id")),
+    "trg_tags_version_update": ("AFTER UPDATE ON tags", _bump_version("NEW.user_id")),
+    "trg_tags_version_delete": ("AFTER DELETE ON tags", _bump_version("OLD.user_id")),
+    "trg_task_tags_version_insert": (
+        "AFTER INSERT ON task_tags", _bump_version(_TASK_OWNER.format(row="NEW"))
+    ),
+    "trg_task_tags_version_delete": (
+        "AFTER DELETE ON task_tags", _bump_version(_TASK_OWNER.format(row="OLD"))
+    ),
+    "trg_tasks_sync_insert": ("AFTER INSERT ON tasks", _log_change("task", "NEW.id", "NEW.user_id", 0)),
+    "trg_tasks_sync_update": ("AFTER UPDATE ON tasks", _log_change("task", "NEW.id", "NEW.user_id", 0)),
+    "trg_tasks_sync_delete": ("AFTER DELETE ON tasks", _log_change("task", "OLD.id", "OLD.user_id", 1)),
+    "trg_tags_sync_insert": ("AFTER INSERT ON tags", _log_change("tag", "NEW.id", "NEW.user_id", 0)),
+    "trg_tags_sync_update": ("AFTER UPDATE ON tags", _log_change("tag", "NEW.id", "NEW.user_id", 0)),
+    "trg_tags_sync_delete": ("AFTER DELETE ON tags", _log_change("tag", "OLD.id", "OLD.user_id", 1)),
+    "trg_task_tags_sync_insert": ("AFTER INSERT ON task_tags", _log_task_tags_change("NEW")),
+    "trg_task_tags_sync_delete": ("AFTER DELETE ON task_tags", _log_task_tags_change("OLD")),
+}
+
+
+def create_change_triggers(connection) -> None:
+    for name, (timing, body) in CHANGE_TRIGGERS.items():
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {name} {timing} FOR EACH ROW BEGIN {body} END"
+        )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_change_triggers(target, connection, **kw):
+    create_change_triggers(connection)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -23,6 +134,9 @@ class User(Base):
     tasks = relationship("Task", back_populates="user")
     tags = relationship("Tag", back_populates="user")
 
+    # Ids of deleted accounts are never reused, so their tokens stay dead.
+    __table_args__ = {"sqlite_autoincrement": True}
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -39,7 +153,22 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user = relationship("User", back_populates="tasks")
-    tags = relationship("Tag", secondary=task_tags, back_populates="tasks")
+    tags = relationship("Tag", secondary=task_tags, back_populates="tasks", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_tasks_user_id_position", "user_id", "position", "id"),
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date", "id"),
+        Index("ix_tasks_user_id_priority", "user_id", "priority", "id"),
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_completed_position", "user_id", "completed", "position", "id"),
+        Index("ix_tasks_user_id_priority_completed", "user_id", "priority", "completed"),
+        Index(
+            "ix_tasks_pending_due_date",
+            "user_id",
+            "due_date",
+            sqlite_where=text("completed = 0 AND due_date IS NOT NULL"),
+        ),
+    )
 
 
 class Tag(Base):
@@ -52,4 +181,9 @@ class Tag(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="tags")
-    tasks = relationship("Task", secondary=task_tags, back_populates="tags")
+    tasks = relationship("Task", secondary=task_tags, back_populates="tags", passive_deletes=True)
+
+    __table_args__ = (
+        # Tag names are unique per user, so tags can be got or created by name.
+        Index("uq_tags_user_id_name", "user_id", "name", unique=True),
+    )
@@ -0,0 +1,128 @@
+"""Per-request SQL profiling. Engine events add each statement's time to the
+current request's ``QueryProfile``; the middleware reports the totals in a
+``Server-Timing`` header and logs requests whose slowest statement took
+``SLOW_QUERY_MS`` or more, with that statement's literals redacted."""
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SERVER_TIMING = os.getenv("TODO_SERVER_TIMING", "1") == "1"
+SLOW_QUERY_MS = float(os.getenv("TODO_SLOW_QUERY_MS", "100"))
+
+logger = logging.getLogger("app.sql.slow")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RUN = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def redact(statement: str) -> str:
+    """``statement`` on one line with string and number literals replaced by
+    ``?`` and runs of placeholders, as in long IN lists, collapsed."""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_RUN.sub("?, ...", statement)
+
+
+class QueryProfile:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    @property
+    def slowest(self) -> Optional[str]:
+        return redact(self.slowest_statement) if self.slowest_statement else None
+
+
+_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _profile.get()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Time every statement on ``engine``. ``engine`` may be the
+    ``sync_engine`` of an async engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        profile = _profile.get()
+        if profile is not None:
+            profile.record(statement, seconds)
+        elif seconds * 1000 >= SLOW_QUERY_MS:
+            logger.warning("slow query (%.1f ms): %s", seconds * 1000, redact(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    return engine
+
+
+def server_timing(profile: QueryProfile, total_seconds: float) -> str:
+    return (
+        f'db;dur={profile.seconds * 1000:.2f};desc="{profile.count} queries", '
+        f"db-slowest;dur={profile.slowest_seconds * 1000:.2f}, "
+        f"app;dur={total_seconds * 1000:.2f}"
+    )
+
+
+class ProfilingMiddleware:
+    """Profile the SQL of each HTTP request. The header goes out with the
+    response head, so it leaves out statements run while a body streams;
+    the slow-query log covers the whole request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and SERVER_TIMING:
+                timing = server_timing(profile, time.perf_counter() - started).encode("latin-1")
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing)]
+            await send(message)
+
+        token = _profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _profile.reset(token)
+            if profile.slowest_seconds * 1000 >= SLOW_QUERY_MS:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                logger.warning(
+                    "slow query (%.1f ms) in %s %s, %d queries taking %.1f ms: %s",
+                    profile.slowest_seconds * 1000, scope["method"], route, profile.count,
+                    profile.seconds * 1000, profile.slowest,
+                )
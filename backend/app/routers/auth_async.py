@@ -0,0 +1,79 @@
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models import User
+from app.schemas import UserCreate, UserResponse, Token
+from app.auth import (
+    get_password_hash_async,
+    verify_password_async,
+    create_access_token,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+)
+from app.auth_async import get_current_user_async
+from app.utils.accounts import account_deletion_statements, forget_account
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+async def _get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
+
+
+@router.post("/register", response_model=UserResponse, status_code=201)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await _get_user_by_email(db, user.email)
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = User(email=user.email, password=hashed_password)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user = await _get_user_by_email(db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.id},
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+
+@router.delete("/me", status_code=204)
+async def delete_me(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    for statement in account_deletion_statements(current_user.id):
+        await db.execute(statement.execution_options(synchronize_session=False))
+    await db.commit()
+    forget_account(current_user.id)
+    return None
@@ -0,0 +1,56 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import User
+from app.auth import decode_token_subject, get_token_from_request, load_principal
+from app.events import TooManyStreams, event_broker
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def get_stream_user(
+    request: Request,
+    access_token: Optional[str] = Query(
+        None, description="Bearer token, for clients such as EventSource that cannot set headers"
+    ),
+    # Released when the endpoint returns, so that open streams hold no
+    # pooled connection.
+    db: Session = Depends(get_db, scope="function"),
+) -> User:
+    token = get_token_from_request(request) or access_token
+    user_id = decode_token_subject(token) if token else None
+    user = load_principal(db, user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+@router.get("")
+async def stream_events(current_user: User = Depends(get_stream_user)):
+    try:
+        subscription = event_broker.subscribe(current_user.id)
+    except TooManyStreams:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many open event streams")
+
+    async def events():
+        try:
+            async for chunk in subscription.stream():
+                yield chunk
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also covers clients that disconnect before the first chunk.
+        background=BackgroundTask(event_broker.unsubscribe, subscription),
+    )
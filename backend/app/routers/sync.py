@@ -0,0 +1,23 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import User
+from app.schemas import SyncResponse
+from app.auth import get_current_user
+from app.sync import DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT, read_changes
+from app.utils.serialization import dumps
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def sync_changes(
+    since: Optional[str] = Query(None, description="Token from the previous response; omit for a full snapshot"),
+    limit: int = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    body = read_changes(db, current_user.id, since, limit)
+    return Response(dumps(body, body["tasks"]), media_type="application/json")
@@ -1,21 +1,46 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Tag, User
-from app.schemas import TagCreate, TagResponse
+from app.schemas import (
+    BulkTagCreateRequest,
+    BulkTagCreateResponse,
+    BulkTagRenameRequest,
+    TagCreate,
+    TagResponse,
+    TagWithCounts,
+)
 from app.auth import get_current_user
+from app.changes import etag_headers, get_data_version, invalidate_task_lists, not_modified
+from app.events import event_broker
+from app.sync import compact_tombstones_in_background
+from app.utils.serialization import TAG_COLUMNS, dumps, tag_dicts
+from app.utils.tags import TAG_USAGE_KEYS, get_or_create_tags, rename_tags, tag_usage_query
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("", response_model=List[TagResponse])
+@router.get("", response_model=Union[List[TagWithCounts], List[TagResponse]])
 def get_tags(
+    request: Request,
+    counts: bool = Query(False, description="Include task_count and pending_count for each tag"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return db.query(Tag).filter(Tag.user_id == current_user.id).all()
+    headers = etag_headers(request, current_user.id, get_data_version(db, current_user.id))
+    cached_response = not_modified(request, headers)
+    if cached_response:
+        return cached_response
+
+    if counts:
+        tags = tag_dicts(db.execute(tag_usage_query(current_user.id)), TAG_USAGE_KEYS)
+    else:
+        tags = tag_dicts(db.execute(select(*TAG_COLUMNS).where(Tag.user_id == current_user.id)))
+    return Response(dumps(tags), media_type="application/json", headers=headers)
 
 
 @router.post("", response_model=TagResponse, status_code=201)
@@ -26,21 +51,62 @@ def create_tag(
 ):
     db_tag = Tag(name=tag.name, color=tag.color, user_id=current_user.id)
     db.add(db_tag)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Tag already exists")
     db.refresh(db_tag)
+    event_broker.publish(current_user.id, "tag.created", [db_tag.id])
     return db_tag
 
 
+@router.post("/bulk", response_model=BulkTagCreateResponse)
+def create_tags_bulk(
+    request: BulkTagCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get or create tags by name; existing tags are returned unchanged."""
+    found, created = get_or_create_tags(db, current_user.id, request.tags)
+    db.commit()
+    if created:
+        event_broker.publish(current_user.id, "tag.created", created)
+    names = dict.fromkeys(tag.name for tag in request.tags)
+    body = {"tags": [found[name] for name in names], "created": len(created)}
+    return Response(dumps(body), media_type="application/json")
+
+
+@router.patch("/bulk", response_model=List[TagResponse])
+def rename_tags_bulk(
+    request: BulkTagRenameRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    tags = rename_tags(db, current_user.id, request.tags)
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "tag.updated", [tag["id"] for tag in tags])
+    return Response(dumps(tags), media_type="application/json")
+
+
 @router.delete("/{tag_id}", status_code=204)
 def delete_tag(
     tag_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
-    if not tag or tag.user_id != current_user.id:
+    # However many tasks carry the tag, this is one statement: its links are
+    # removed by ON DELETE CASCADE rather than loaded through Tag.tasks.
+    deleted = db.execute(
+        delete(Tag)
+        .where(Tag.id == tag_id, Tag.user_id == current_user.id)
+    ).rowcount
+    if not deleted:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    db.delete(tag)
     db.commit()
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "tag.deleted", [tag_id])
+    background_tasks.add_task(compact_tombstones_in_background, db.get_bind())
     return None
@@ -0,0 +1,56 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models import Tag, User
+from app.schemas import TagCreate, TagResponse
+from app.auth_async import get_current_user_async
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("", response_model=List[TagResponse])
+async def get_tags(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(select(Tag).where(Tag.user_id == current_user.id))
+    return result.scalars().all()
+
+
+@router.post("", response_model=TagResponse, status_code=201)
+async def create_tag(
+    tag: TagCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_tag = Tag(name=tag.name, color=tag.color, user_id=current_user.id)
+    db.add(db_tag)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Tag already exists")
+    await db.refresh(db_tag)
+    return db_tag
+
+
+@router.delete("/{tag_id}", status_code=204)
+async def delete_tag(
+    tag_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(
+        delete(Tag)
+        .where(Tag.id == tag_id, Tag.user_id == current_user.id)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    await db.commit()
+    return None
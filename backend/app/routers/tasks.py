@@ -1,66 +1,157 @@
-from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc
+from typing import Dict, List, Optional, Tuple, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, select, true, update
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
-from app.models import Task, Tag, User
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, ReorderRequest
+from app.models import Task, Tag, User, task_tags
+from app.schemas import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskPage,
+    ReorderRequest,
+    MoveTaskRequest,
+    BulkTaskCreateRequest,
+    BulkTaskCreateResponse,
+    BulkTaskCreateResult,
+    BulkToggleRequest,
+    BulkUpdateRequest,
+    BulkTagRequest,
+    TaskSelection,
+    BulkMutationResponse,
+    BulkTagResponse,
+    TaskImportRow,
+    TaskImportError,
+    TaskImportResponse,
+    TaskStats,
+    TagCreate,
+)
 from app.auth import get_current_user
+from app.changes import (
+    etag_headers,
+    get_data_version,
+    invalidate_task_lists,
+    not_modified,
+    task_list_cache,
+)
+from app.events import event_broker
+from app.sync import compact_tombstones_in_background
+from app.utils.export import csv_lines, export_batches, ndjson_lines
+from app.utils.imports import IMPORT_CHUNK_SIZE, MAX_IMPORT_ERRORS, detect_format, read_import_records
+from app.utils.stats import task_stats
+from app.utils.tags import get_or_create_tags
+from app.utils.serialization import TASK_COLUMNS, TaskProjection, dumps, task_dict, task_dicts
+from app.utils.filters import TaskFilters, TaskSort, filtered, selection_clauses
+from app.utils.positions import (
+    POSITION_STEP,
+    position_between,
+    needs_rebalance,
+    rebalance_positions,
+    rebalance_positions_in_background,
+    reorder_statements,
+)
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, split_page
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-
-@router.get("", response_model=List[TaskResponse])
+@router.get("", response_model=Union[List[TaskResponse], TaskPage])
 def get_tasks(
-    status: Optional[str] = Query(None, description="Filter by completed or pending"),
-    priority: Optional[int] = Query(None, ge=1, le=5, description="Filter by priority: 1-5"),
-    tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
-    due_before: Optional[datetime] = Query(None, description="Due before date"),
-    due_after: Optional[datetime] = Query(None, description="Due after date"),
-    overdue: Optional[bool] = Query(None, description="Show only overdue pending tasks"),
-    no_due_date: Optional[bool] = Query(None, description="Show tasks without due date"),
-    sort_by: Optional[str] = Query("position", description="Sort by: position, due_date, priority, created_at"),
-    sort_order: Optional[str] = Query("asc", description="Sort direction: asc, desc"),
+    request: Request,
+    filters: TaskFilters = Depends(),
+    sort: TaskSort = Depends(),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables cursor pagination"),
+    projection: TaskProjection = Depends(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Task).filter(Task.user_id == current_user.id)
-
-    if status == "completed":
-        query = query.filter(Task.completed == True)
-    elif status == "pending":
-        query = query.filter(Task.completed == False)
-
-    if priority:
-        query = query.filter(Task.priority == priority)
-
-    if tag_id:
-        query = query.filter(Task.tags.any(Tag.id == tag_id))
-
-    if due_before:
-        query = query.filter(Task.due_date <= due_before)
-
-    if due_after:
-        query = query.filter(Task.due_date >= due_after)
-
-    if overdue:
-        query = query.filter(
-            Task.completed == False,
-            Task.due_date < datetime.now()
+    # Overdue results change with the clock rather than with writes, so they
+    # get neither an ETag nor a cache entry.
+    headers = {"Cache-Control": "no-store"}
+    cache_key = None
+    if not filters.overdue:
+        version = get_data_version(db, current_user.id)
+        headers = etag_headers(request, current_user.id, version)
+        cached_response = not_modified(request, headers)
+        if cached_response:
+            return cached_response
+
+        cache_key = (
+            current_user.id, version, filters.key(), sort.sort_by, sort.descending, cursor, limit, projection.key
         )
+        body = task_list_cache.get(cache_key)
+        if body is not None:
+            return Response(body, media_type="application/json", headers=headers)
 
-    if no_due_date:
-        query = query.filter(Task.due_date == None)
-
-    sort_column = getattr(Task, sort_by, Task.position)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
+    tasks, next_cursor = _query_tasks(db, current_user.id, filters, sort, cursor, limit, projection)
+    if cursor is None and limit is None:
+        body = dumps(tasks, tasks)
     else:
-        query = query.order_by(asc(sort_column))
+        body = dumps({"items": tasks, "next_cursor": next_cursor}, tasks)
+    if cache_key is not None:
+        task_list_cache.set(cache_key, body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _query_tasks(
+    db: Session,
+    user_id: int,
+    filters: TaskFilters,
+    sort: TaskSort,
+    cursor: Optional[str],
+    limit: Optional[int],
+    projection: TaskProjection,
+) -> Tuple[List[dict], Optional[str]]:
+    """Fetch the requested tasks as response dicts, read from column tuples
+    rather than ORM objects, plus the next page's cursor."""
+    stmt = filtered(select(*projection.columns), filters, sort, user_id).order_by(*sort.order_by())
+
+    if cursor is None and limit is None:
+        return task_dicts(db, db.execute(stmt), projection), None
+
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort.sort_by, sort.descending)
+        stmt = stmt.where(sort.after(value, last_id))
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    rows = db.execute(stmt.add_columns(sort.key.label("sort_key")).limit(page_size + 1)).all()
+    items, next_cursor = split_page([(row, row[-1]) for row in rows], page_size, sort)
+    return task_dicts(db, items, projection), next_cursor
+
+
+@router.get("/stats", response_model=TaskStats)
+def get_task_stats(
+    filters: TaskFilters = Depends(),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return task_stats(db, current_user.id, filters)
 
-    return query.all()
+
+@router.get("/export")
+def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson, csv"),
+    filters: TaskFilters = Depends(),
+    sort: TaskSort = Depends(),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    stmt = filtered(select(*TASK_COLUMNS), filters, sort, current_user.id).order_by(*sort.order_by())
+    batches = export_batches(db, stmt)
+    if format == "csv":
+        return StreamingResponse(
+            csv_lines(batches),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="tasks.csv"'},
+        )
+    return StreamingResponse(
+        ndjson_lines(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tasks.ndjson"'},
+    )
 
 
 @router.post("", response_model=TaskResponse, status_code=201)
@@ -83,20 +174,322 @@ def create_task(
 
     db.add(db_task)
     db.commit()
+    invalidate_task_lists(current_user.id)
     db.refresh(db_task)
+    event_broker.publish(current_user.id, "task.created", [db_task.id])
     return db_task
 
 
+def format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+@router.post("/bulk", response_model=BulkTaskCreateResponse)
+def create_tasks_bulk(
+    request: BulkTaskCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    results = [BulkTaskCreateResult(index=i) for i in range(len(request.tasks))]
+    valid = []
+    for i, raw in enumerate(request.tasks):
+        try:
+            valid.append((i, TaskCreate.model_validate(raw)))
+        except ValidationError as exc:
+            results[i].error = format_validation_error(exc)
+
+    requested_tag_ids = {tag_id for _, item in valid for tag_id in item.tag_ids}
+    owned_tag_ids = set()
+    if requested_tag_ids:
+        owned_tag_ids = set(db.scalars(
+            select(Tag.id).where(Tag.id.in_(requested_tag_ids), Tag.user_id == current_user.id)
+        ))
+
+    rows = []
+    for i, item in valid:
+        unknown = sorted(set(item.tag_ids) - owned_tag_ids)
+        if unknown:
+            results[i].error = f"tag_ids: unknown tags {unknown}"
+            continue
+        rows.append((i, item))
+
+    if rows:
+        # SQLite hands out ascending rowids to the rows of a multi-row INSERT in
+        # statement order, so sorting the returned ids restores input order
+        # without falling back to one INSERT per row.
+        task_ids = sorted(db.scalars(
+            insert(Task).returning(Task.id),
+            [
+                {
+                    "title": item.title,
+                    "description": item.description,
+                    "priority": item.priority,
+                    "due_date": item.due_date,
+                    "completed": False,
+                    "position": 0.0,
+                    "user_id": current_user.id,
+                }
+                for _, item in rows
+            ],
+        ))
+
+        links = [
+            {"task_id": task_id, "tag_id": tag_id}
+            for task_id, (_, item) in zip(task_ids, rows)
+            for tag_id in dict.fromkeys(item.tag_ids)
+        ]
+        if links:
+            db.execute(insert(task_tags), links)
+        db.commit()
+        invalidate_task_lists(current_user.id)
+        event_broker.publish(current_user.id, "task.created", task_ids)
+
+        created = {
+            task.id: task
+            for task in db.query(Task).options(selectinload(Task.tags)).filter(Task.id.in_(task_ids))
+        }
+        for task_id, (i, _) in zip(task_ids, rows):
+            results[i].task = TaskResponse.model_validate(created[task_id])
+
+    created_count = len(rows)
+    return BulkTaskCreateResponse(
+        created=created_count,
+        failed=len(results) - created_count,
+        results=results,
+    )
+
+
+def _resolve_tag_names(db: Session, user_id: int, names: set, tag_ids: Dict[str, int]) -> int:
+    """Add the ids of ``names`` to ``tag_ids``, creating the tags that do not
+    exist yet. Returns the number of tags created."""
+    missing = names - tag_ids.keys()
+    if not missing:
+        return 0
+    found, created = get_or_create_tags(db, user_id, [TagCreate(name=name) for name in sorted(missing)])
+    for name, tag in found.items():
+        tag_ids[name] = tag["id"]
+    return len(created)
+
+
+def _import_chunk(db: Session, user_id: int, rows: List[TaskImportRow], tag_ids: Dict[str, int]) -> int:
+    tags_created = _resolve_tag_names(db, user_id, {name for row in rows for name in row.tags}, tag_ids)
+    task_ids = sorted(db.scalars(
+        insert(Task).returning(Task.id),
+        [
+            {
+                "title": row.title,
+                "description": row.description,
+                "priority": row.priority,
+                "due_date": row.due_date,
+                "completed": row.completed,
+                "position": row.position,
+                "user_id": user_id,
+            }
+            for row in rows
+        ],
+    ))
+    links = [
+        {"task_id": task_id, "tag_id": tag_ids[name]}
+        for task_id, row in zip(task_ids, rows)
+        for name in row.tags
+    ]
+    if links:
+        db.execute(insert(task_tags), links)
+    db.commit()
+    return tags_created
+
+
+@router.post("/import", response_model=TaskImportResponse)
+def import_tasks(
+    file: UploadFile = File(..., description="NDJSON or CSV file in the format written by /tasks/export"),
+    format: Optional[str] = Query(
+        None, pattern="^(ndjson|csv)$", description="File format; inferred from the file name when omitted"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    report = TaskImportResponse()
+    tag_ids: Dict[str, int] = {}
+    chunk: List[TaskImportRow] = []
+    last_position: Optional[float] = None
+
+    def fail(line: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < MAX_IMPORT_ERRORS:
+            report.errors.append(TaskImportError(line=line, error=error))
+
+    def flush() -> None:
+        nonlocal last_position
+        if last_position is None:
+            last_position = db.scalar(
+                select(func.max(Task.position)).where(Task.user_id == current_user.id)
+            ) or 0.0
+        for row in chunk:
+            if row.position is None:
+                last_position += POSITION_STEP
+                row.position = last_position
+            else:
+                last_position = max(last_position, row.position)
+        report.tags_created += _import_chunk(db, current_user.id, chunk, tag_ids)
+        report.imported += len(chunk)
+        chunk.clear()
+
+    try:
+        for line, record, error in read_import_records(file.file, format or detect_format(file.filename)):
+            if error:
+                fail(line, error)
+                continue
+            try:
+                chunk.append(TaskImportRow.model_validate(record))
+            except ValidationError as exc:
+                fail(line, format_validation_error(exc))
+                continue
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        if report.imported:
+            invalidate_task_lists(current_user.id)
+            event_broker.publish(current_user.id, "task.created")
+    return report
+
+
+@router.post("/bulk/toggle", response_model=BulkMutationResponse)
+def toggle_tasks_bulk(
+    request: BulkToggleRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    completed = ~Task.completed if request.completed is None else request.completed
+    task_ids = db.scalars(
+        update(Task)
+        .where(*selection_clauses(request, current_user.id))
+        .values(completed=completed)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "task.toggled", task_ids)
+    return BulkMutationResponse(affected=len(task_ids))
+
+
+@router.patch("/bulk", response_model=BulkMutationResponse)
+def update_tasks_bulk(
+    request: BulkUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    changes = request.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
+
+    task_ids = db.scalars(
+        update(Task)
+        .where(*selection_clauses(request, current_user.id))
+        .values(**changes)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "task.updated", task_ids)
+    return BulkMutationResponse(affected=len(task_ids))
+
+
+@router.post("/bulk/delete", response_model=BulkMutationResponse)
+def delete_tasks_bulk(
+    request: TaskSelection,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # task_tags rows go with their tasks (ON DELETE CASCADE).
+    task_ids = db.scalars(
+        delete(Task)
+        .where(*selection_clauses(request, current_user.id))
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "task.deleted", task_ids)
+    background_tasks.add_task(compact_tombstones_in_background, db.get_bind())
+    return BulkMutationResponse(affected=len(task_ids))
+
+
+@router.post("/bulk/tags", response_model=BulkTagResponse)
+def tag_tasks_bulk(
+    request: BulkTagRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    requested = set(request.add) | set(request.remove)
+    if requested:
+        owned = set(db.scalars(
+            select(Tag.id).where(Tag.id.in_(requested), Tag.user_id == current_user.id)
+        ))
+        unknown = sorted(requested - owned)
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Tags not found: {unknown}")
+
+    selected = select(Task.id).where(*selection_clauses(request, current_user.id))
+    removed = added = []
+    if request.remove:
+        removed = db.scalars(
+            delete(task_tags)
+            .where(
+                task_tags.c.tag_id.in_(request.remove),
+                task_tags.c.task_id.in_(selected.scalar_subquery()),
+            )
+            .returning(task_tags.c.task_id)
+        ).all()
+    if request.add:
+        pairs = (
+            select(Task.id, Tag.id)
+            .join(Tag, true())
+            .where(*selection_clauses(request, current_user.id))
+            .where(Tag.id.in_(request.add))
+        )
+        added = db.scalars(
+            insert(task_tags)
+            .from_select(["task_id", "tag_id"], pairs)
+            .prefix_with("OR IGNORE")
+            .returning(task_tags.c.task_id)
+        ).all()
+    db.commit()
+    invalidate_task_lists(current_user.id)
+    task_ids = sorted(set(added) | set(removed))
+    if task_ids:
+        event_broker.publish(current_user.id, "task.updated", task_ids)
+    return BulkTagResponse(added=len(added), removed=len(removed))
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: int,
+    request: Request,
+    projection: TaskProjection = Depends(),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task or task.user_id != current_user.id:
+    # Looked up first so that If-None-Match: * cannot turn a 404 into a 304.
+    row = db.execute(
+        select(*projection.columns).where(Task.id == task_id, Task.user_id == current_user.id)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+
+    headers = etag_headers(request, current_user.id, get_data_version(db, current_user.id))
+    cached_response = not_modified(request, headers)
+    if cached_response:
+        return cached_response
+    task = task_dict(db, row, projection)
+    return Response(dumps(task, [task]), media_type="application/json", headers=headers)
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
@@ -122,22 +515,32 @@ def update_task(
         setattr(task, field, value)
 
     db.commit()
+    invalidate_task_lists(current_user.id)
     db.refresh(task)
+    event_broker.publish(current_user.id, "task.updated", [task_id])
     return task
 
 
 @router.delete("/{task_id}", status_code=204)
 def delete_task(
     task_id: int,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task or task.user_id != current_user.id:
+    # One statement; the task's tag links are removed by ON DELETE CASCADE
+    # instead of being loaded through the ORM collection first.
+    deleted = db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+    ).rowcount
+    if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
     db.commit()
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "task.deleted", [task_id])
+    background_tasks.add_task(compact_tombstones_in_background, db.get_bind())
     return None
 
 
@@ -153,7 +556,9 @@ def toggle_task(
 
     task.completed = not task.completed
     db.commit()
+    invalidate_task_lists(current_user.id)
     db.refresh(task)
+    event_broker.publish(current_user.id, "task.toggled", [task_id])
     return task
 
 
@@ -163,10 +568,59 @@ def reorder_tasks(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    for item in reorder.tasks:
-        task = db.query(Task).filter(Task.id == item.id).first()
-        if task and task.user_id == current_user.id:
-            task.position = item.position
+    positions = {item.id: item.position for item in reorder.tasks}
+    if positions:
+        for statement in reorder_statements(positions, current_user.id):
+            db.execute(statement)
+        db.commit()
+        invalidate_task_lists(current_user.id)
+        event_broker.publish(current_user.id, "task.reordered", list(positions))
+    return None
+
+
+@router.patch("/{task_id}/move", response_model=TaskResponse)
+def move_task(
+    task_id: int,
+    move: MoveTaskRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    neighbour_ids = [i for i in (move.after_id, move.before_id) if i is not None]
+    rows = db.execute(
+        select(Task.id, Task.position).where(
+            Task.id.in_([task_id, *neighbour_ids]), Task.user_id == current_user.id
+        )
+    ).all()
+    positions = dict(rows)
+    if task_id not in positions:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if any(i not in positions for i in neighbour_ids):
+        raise HTTPException(status_code=404, detail="Neighbour task not found")
+
+    after = positions.get(move.after_id)
+    before = positions.get(move.before_id)
+    position = position_between(before, after)
+    if position is None:
+        rebalance_positions(db, current_user.id)
+        positions = dict(db.execute(
+            select(Task.id, Task.position).where(Task.id.in_(neighbour_ids))
+        ).all())
+        after = positions.get(move.after_id)
+        before = positions.get(move.before_id)
+        position = position_between(before, after)
+    elif needs_rebalance(before, after):
+        background_tasks.add_task(
+            rebalance_positions_in_background, db.get_bind(), current_user.id
+        )
 
+    db.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(position=position)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
-    return None
+    invalidate_task_lists(current_user.id)
+    event_broker.publish(current_user.id, "task.reordered", [task_id])
+    return db.query(Task).options(selectinload(Task.tags)).filter(Task.id == task_id).first()
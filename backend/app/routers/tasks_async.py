@@ -0,0 +1,156 @@
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.database import get_async_db
+from app.models import Task, Tag, User
+from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskPage, ReorderRequest
+from app.auth_async import get_current_user_async
+from app.utils.filters import TaskFilters, TaskSort, filtered
+from app.utils.positions import reorder_statements
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, split_page
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+async def _get_owned_task(db: AsyncSession, task_id: int, user_id: int) -> Task:
+    result = await db.execute(
+        select(Task)
+        .options(selectinload(Task.tags))
+        .where(Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    task = result.scalar_one_or_none()
+    if not task or task.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+async def _get_tags(db: AsyncSession, tag_ids: List[int]) -> List[Tag]:
+    result = await db.execute(select(Tag).where(Tag.id.in_(tag_ids)))
+    return list(result.scalars().all())
+
+
+@router.get("", response_model=Union[List[TaskResponse], TaskPage])
+async def get_tasks(
+    filters: TaskFilters = Depends(),
+    sort: TaskSort = Depends(),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; enables cursor pagination"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = filtered(
+        select(Task).options(selectinload(Task.tags)), filters, sort, current_user.id
+    ).order_by(*sort.order_by())
+
+    if cursor is None and limit is None:
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort.sort_by, sort.descending)
+        stmt = stmt.where(sort.after(value, last_id))
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    result = await db.execute(stmt.add_columns(sort.key).limit(page_size + 1))
+    items, next_cursor = split_page(result.all(), page_size, sort)
+    return TaskPage(items=items, next_cursor=next_cursor)
+
+
+@router.post("", response_model=TaskResponse, status_code=201)
+async def create_task(
+    task: TaskCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_task = Task(
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        due_date=task.due_date,
+        user_id=current_user.id,
+        tags=await _get_tags(db, task.tag_ids) if task.tag_ids else [],
+    )
+
+    db.add(db_task)
+    await db.commit()
+    return await _get_owned_task(db, db_task.id, current_user.id)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _get_owned_task(db, task_id, current_user.id)
+
+
+@router.patch("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: int,
+    task_update: TaskUpdate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    task = await _get_owned_task(db, task_id, current_user.id)
+
+    update_data = task_update.model_dump(exclude_unset=True)
+
+    if "tag_ids" in update_data:
+        tag_ids = update_data.pop("tag_ids")
+        if tag_ids is not None:
+            task.tags = await _get_tags(db, tag_ids)
+
+    for field, value in update_data.items():
+        setattr(task, field, value)
+
+    await db.commit()
+    return await _get_owned_task(db, task_id, current_user.id)
+
+
+@router.delete("/{task_id}", status_code=204)
+async def delete_task(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    await db.commit()
+    return None
+
+
+@router.patch("/{task_id}/toggle", response_model=TaskResponse)
+async def toggle_task(
+    task_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    task = await _get_owned_task(db, task_id, current_user.id)
+    task.completed = not task.completed
+    await db.commit()
+    return await _get_owned_task(db, task_id, current_user.id)
+
+
+@router.put("/reorder", status_code=204)
+async def reorder_tasks(
+    reorder: ReorderRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    positions = {item.id: item.position for item in reorder.tasks}
+    if positions:
+        for statement in reorder_statements(positions, current_user.id):
+            await db.execute(statement)
+        await db.commit()
+    return None
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+MAX_BULK_ITEMS = 1000
 
 
 class TagBase(BaseModel):
@@ -20,6 +22,40 @@ class TagResponse(TagBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TagWithCounts(TagResponse):
+    task_count: int
+    pending_count: int
+
+
+class BulkTagCreateRequest(BaseModel):
+    tags: List[TagCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkTagCreateResponse(BaseModel):
+    # One entry per distinct name, in request order, whether it was created
+    # or already existed.
+    tags: List[TagResponse]
+    created: int
+
+
+class TagRename(BaseModel):
+    id: int
+    name: str
+    color: Optional[str] = None
+
+
+class BulkTagRenameRequest(BaseModel):
+    tags: List[TagRename] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+    @model_validator(mode="after")
+    def check_unique(self):
+        if len({tag.id for tag in self.tags}) != len(self.tags):
+            raise ValueError("Each tag may be renamed once")
+        if len({tag.name for tag in self.tags}) != len(self.tags):
+            raise ValueError("New names must be distinct")
+        return self
+
+
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -53,6 +89,92 @@ class TaskResponse(TaskBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+class BulkTaskCreateRequest(BaseModel):
+    # Items are validated one by one so that a bad row is reported in its
+    # result instead of rejecting the whole batch.
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkTaskCreateResult(BaseModel):
+    index: int
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class BulkTaskCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkTaskCreateResult]
+
+
+class TaskFilterSpec(BaseModel):
+    """Body form of the ``GET /tasks`` filter parameters."""
+    status: Optional[str] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    tag_id: Optional[int] = None
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+    overdue: Optional[bool] = None
+    no_due_date: Optional[bool] = None
+    q: Optional[str] = Field(None, max_length=200)
+
+
+class TaskSelection(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=MAX_BULK_ITEMS)
+    filter: Optional[TaskFilterSpec] = None
+
+    @model_validator(mode="after")
+    def check_one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+        return self
+
+
+class BulkToggleRequest(TaskSelection):
+    # None flips each task; true/false sets every selected task.
+    completed: Optional[bool] = None
+
+
+class BulkTaskChanges(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    due_date: Optional[datetime] = None
+    position: Optional[float] = None
+
+    # Omitted fields are left alone; these columns cannot be cleared.
+    @field_validator("title", "completed", "position")
+    @classmethod
+    def reject_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class BulkUpdateRequest(TaskSelection):
+    changes: BulkTaskChanges
+
+
+class BulkTagRequest(TaskSelection):
+    add: List[int] = []
+    remove: List[int] = []
+
+
+class BulkMutationResponse(BaseModel):
+    affected: int
+
+
+class BulkTagResponse(BaseModel):
+    added: int
+    removed: int
+
+
 class ReorderItem(BaseModel):
     id: int
     position: float
@@ -62,6 +184,85 @@ class ReorderRequest(BaseModel):
     tasks: List[ReorderItem]
 
 
+class MoveTaskRequest(BaseModel):
+    # Neighbours in the list after the move: ``after_id`` is the task that
+    # will sit directly above, ``before_id`` the task directly below.
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+
+class TaskImportRow(TaskBase):
+    """One task of an import file. Tags are given by name, either as a list
+    (strings or tag objects, as in the NDJSON export) or as one
+    ``;``-separated string (as in the CSV export). Rows without a position
+    go after the user's last task, in file order."""
+    completed: bool = False
+    position: Optional[float] = None
+    tags: List[str] = []
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tag_names(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = value.split(";")
+        if isinstance(value, list):
+            names = (item.get("name") if isinstance(item, dict) else item for item in value)
+            return list(dict.fromkeys(
+                name.strip() for name in names if isinstance(name, str) and name.strip()
+            ))
+        return value
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    tags_created: int = 0
+    # Only the first MAX_IMPORT_ERRORS failures are listed.
+    errors: List[TaskImportError] = []
+
+
+class PriorityCount(BaseModel):
+    priority: Optional[int]
+    count: int
+
+
+class TagCount(BaseModel):
+    tag_id: int
+    name: str
+    count: int
+
+
+class TaskStats(BaseModel):
+    total: int
+    pending: int
+    completed: int
+    overdue: int
+    due_today: int
+    by_priority: List[PriorityCount]
+    by_tag: List[TagCount]
+
+
+class SyncDeleted(BaseModel):
+    tasks: List[int]
+    tags: List[int]
+
+
+class SyncResponse(BaseModel):
+    token: str
+    reset: bool
+    has_more: bool
+    tasks: List[TaskResponse]
+    tags: List[TagResponse]
+    deleted: SyncDeleted
+
+
 class UserCreate(BaseModel):
     email: str
     password: str
@@ -0,0 +1,100 @@
+import re
+from typing import Optional
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, event, select, text
+from sqlalchemy.engine import Engine
+
+from app.database import Base, engine
+from app.models import Task
+
+# External-content FTS5 index over tasks.title and tasks.description. It is
+# kept on its own MetaData so that create_all never tries to create it as a
+# regular table; the DDL below owns its lifecycle.
+fts_metadata = MetaData()
+tasks_fts = Table(
+    "tasks_fts",
+    fts_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("title", String),
+    Column("description", String),
+    Column("rank", Float),
+)
+
+SEARCH_TABLE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+
+_FTS_INSERT = (
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (NEW.id, NEW.title, NEW.description);"
+)
+_FTS_DELETE = (
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', OLD.id, OLD.title, OLD.description);"
+)
+
+SEARCH_TRIGGERS = {
+    "trg_tasks_fts_insert": ("AFTER INSERT ON tasks", _FTS_INSERT),
+    # Only text edits touch the index; toggles and moves leave it alone.
+    "trg_tasks_fts_update": ("AFTER UPDATE OF title, description ON tasks", _FTS_DELETE + _FTS_INSERT),
+    "trg_tasks_fts_delete": ("AFTER DELETE ON tasks", _FTS_DELETE),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(connection) -> bool:
+    """Create the FTS table and its sync triggers. Returns True when the table
+    was new, in which case it has been populated from the existing tasks."""
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).first()
+    connection.exec_driver_sql(SEARCH_TABLE_DDL)
+    for name, (timing, body) in SEARCH_TRIGGERS.items():
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {name} {timing} FOR EACH ROW BEGIN {body} END"
+        )
+    if not exists:
+        connection.exec_driver_sql("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    return not exists
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    connection.exec_driver_sql("DROP TABLE IF EXISTS tasks_fts")
+
+
+def apply_search_index(bind: Engine = engine) -> bool:
+    """Install the search index on a database created before it existed."""
+    with bind.begin() as conn:
+        return create_search_index(conn)
+
+
+def match_query(q: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, and the last
+    one also matches as a prefix so results follow the user as they type.
+    Quoting each token keeps FTS5 operators in user input from being parsed.
+    Returns None when ``q`` has no searchable words, which callers treat as
+    matching no task."""
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def match_clause(fts_query: str):
+    return text("tasks_fts MATCH :fts_query").bindparams(fts_query=fts_query)
+
+
+def search_clause(fts_query: str):
+    """``tasks.id IN (matching rowids)``, for queries that filter on the
+    search without ranking by it."""
+    return Task.id.in_(select(tasks_fts.c.rowid).where(match_clause(fts_query)))
@@ -0,0 +1,149 @@
+import base64
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, literal, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import Tag, Task, sync_compactions, sync_log
+from app.utils.serialization import TAG_COLUMNS, TASK_COLUMNS, tag_dicts, task_dicts
+
+DEFAULT_SYNC_LIMIT = 1000
+MAX_SYNC_LIMIT = 5000
+SYNC_TOMBSTONE_TTL = timedelta(days=float(os.getenv("TODO_SYNC_TOMBSTONE_TTL_DAYS", "30")))
+SYNC_COMPACT_INTERVAL_SECONDS = float(os.getenv("TODO_SYNC_COMPACT_INTERVAL", "3600"))
+
+
+def encode_token(seq: int, snapshot: Optional[int] = None) -> str:
+    payload = {"q": seq} if snapshot is None else {"q": seq, "s": snapshot}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> Tuple[int, Optional[int]]:
+    """The seq a token stands for and, if it continues a snapshot, the last
+    seq logged when that snapshot began."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        snapshot = payload.get("s")
+        return int(payload["q"]), None if snapshot is None else int(snapshot)
+    except (ValueError, KeyError, TypeError, OverflowError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token")
+
+
+def log_bounds(db: Session, user_id: int) -> Tuple[int, int]:
+    """The seq of the last tombstone compaction and of the user's latest
+    change, read in one statement."""
+    horizon, latest = db.execute(select(
+        select(func.max(sync_compactions.c.seq)).scalar_subquery(),
+        select(func.max(sync_log.c.seq)).where(sync_log.c.user_id == user_id).scalar_subquery(),
+    )).one()
+    return horizon or 0, latest or 0
+
+
+def read_changes(db: Session, user_id: int, since: Optional[str], limit: int) -> dict:
+    """Tasks and tags changed after ``since``, oldest change first, as a
+    ``/sync`` response body. Without a token, or with one older than the last
+    tombstone compaction, the client gets a snapshot of every live row instead
+    (``reset``), paged like any other catch-up."""
+    seq, snapshot = decode_token(since) if since else (0, None)
+    horizon, latest = log_bounds(db, user_id)
+    reset = not since or (snapshot is None and seq < horizon)
+    if reset:
+        seq, snapshot = 0, latest
+
+    query = select(sync_log.c.seq, sync_log.c.entity, sync_log.c.entity_id, sync_log.c.deleted).where(
+        sync_log.c.user_id == user_id, sync_log.c.seq > seq
+    )
+    if snapshot is not None:
+        # Rows deleted before the snapshot began were never sent, but later
+        # deletes may hit rows that earlier pages delivered.
+        query = query.where(or_(sync_log.c.deleted == False, sync_log.c.seq > snapshot))  # noqa: E712
+    rows = db.execute(query.order_by(sync_log.c.seq).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = {"task": [], "tag": []}
+    deleted = {"task": [], "tag": []}
+    for _, entity, entity_id, is_deleted in rows:
+        (deleted if is_deleted else changed)[entity].append(entity_id)
+
+    last = rows[-1].seq if rows else seq
+    if snapshot is not None and not has_more:
+        # Every live row has been sent, so the client can continue from here
+        # with plain catch-ups, which must not look older than the horizon.
+        token = encode_token(max(last, horizon))
+    else:
+        token = encode_token(last, snapshot)
+
+    tasks = []
+    if changed["task"]:
+        tasks = task_dicts(db, db.execute(
+            select(*TASK_COLUMNS).where(Task.id.in_(changed["task"])).order_by(Task.position, Task.id)
+        ))
+    tags = []
+    if changed["tag"]:
+        tags = tag_dicts(db.execute(select(*TAG_COLUMNS).where(Tag.id.in_(changed["tag"])).order_by(Tag.id)))
+
+    return {
+        "token": token,
+        "reset": reset,
+        "has_more": has_more,
+        "tasks": tasks,
+        "tags": tags,
+        "deleted": {"tasks": deleted["task"], "tags": deleted["tag"]},
+    }
+
+
+def compact_tombstones(db: Session, older_than: timedelta = SYNC_TOMBSTONE_TTL) -> int:
+    """Delete tombstones older than ``older_than`` and raise the compaction
+    horizon past them. Returns the number removed."""
+    cutoff = datetime.utcnow() - older_than
+    removed = db.scalars(
+        delete(sync_log)
+        .where(sync_log.c.deleted == True, sync_log.c.changed_at < cutoff)  # noqa: E712
+        .returning(sync_log.c.seq)
+    ).all()
+    if removed:
+        db.execute(insert(sync_compactions).values(seq=max(removed)))
+    db.commit()
+    return len(removed)
+
+
+_compaction_lock = threading.Lock()
+_last_compaction = float("-inf")
+
+
+def compact_tombstones_in_background(bind) -> None:
+    """Run compact_tombstones at most once per SYNC_COMPACT_INTERVAL_SECONDS
+    per process; deletes schedule it as a background task."""
+    global _last_compaction
+    with _compaction_lock:
+        now = time.monotonic()
+        if now - _last_compaction < SYNC_COMPACT_INTERVAL_SECONDS:
+            return
+        _last_compaction = now
+    with Session(bind=bind) as db:
+        compact_tombstones(db)
+
+
+def backfill_sync_log(bind: Engine = engine) -> None:
+    """Log every existing task and tag of a database created before the sync
+    log existed, so that snapshots include them."""
+    with bind.begin() as conn:
+        if conn.execute(select(sync_log.c.seq).limit(1)).first() is not None:
+            return
+        columns = ["user_id", "entity", "entity_id"]
+        for model, entity in ((Task, "task"), (Tag, "tag")):
+            conn.execute(insert(sync_log).from_select(
+                columns,
+                select(model.user_id, literal(entity), model.id).where(model.user_id != None),  # noqa: E711
+            ))
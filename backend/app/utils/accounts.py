@@ -0,0 +1,36 @@
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.auth import invalidate_principal
+from app.changes import invalidate_task_lists
+from app.events import event_broker
+from app.models import Tag, Task, User, sync_log, user_versions
+
+
+def account_deletion_statements(user_id: int) -> list:
+    """Statements that remove a user and everything they own. Their number
+    does not grow with the data: task_tags rows go with the tasks by ON
+    DELETE CASCADE, and nothing is loaded into the session."""
+    return [
+        delete(Task).where(Task.user_id == user_id),
+        delete(Tag).where(Tag.user_id == user_id),
+        # The deletes above leave tombstones and bump the data version; no
+        # client of this user can ask for them any more.
+        delete(sync_log).where(sync_log.c.user_id == user_id),
+        delete(user_versions).where(user_versions.c.user_id == user_id),
+        delete(User).where(User.id == user_id),
+    ]
+
+
+def forget_account(user_id: int) -> None:
+    """Drop the per-process state of a deleted account and end its streams."""
+    invalidate_principal(user_id)
+    invalidate_task_lists(user_id)
+    event_broker.disconnect(user_id)
+
+
+def delete_account(db: Session, user_id: int) -> None:
+    for statement in account_deletion_statements(user_id):
+        db.execute(statement.execution_options(synchronize_session=False))
+    db.commit()
+    forget_account(user_id)
@@ -0,0 +1,163 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after
+    they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                self._removed(key)
+                self.misses += 1
+                self.evictions += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, self._timer() + self.ttl)
+            self._data.move_to_end(key)
+            self._added(key, value)
+            while self._data and self._full():
+                evicted, _ = self._data.popitem(last=False)
+                self._removed(evicted)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._removed(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._cleared()
+
+    # Hooks for subclasses that index keys; called with the lock held.
+    def _full(self) -> bool:
+        return len(self._data) > self.maxsize
+
+    def _added(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def _removed(self, key: Hashable) -> None:
+        pass
+
+    def _cleared(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _weigh(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class UserResponseCache(TTLCache):
+    """TTLCache of serialized responses whose keys are ``(user_id, ...)``
+    tuples, indexed by user so that a write can drop exactly that user's
+    entries. Besides ``maxsize`` entries it holds at most ``max_bytes`` of
+    values in total, and values larger than ``max_entry_bytes`` are not
+    stored at all."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(maxsize, ttl, timer)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.bytes = 0
+        self._sizes: dict = {}
+        self._keys_by_user: dict = {}
+        self.invalidations = 0
+        self.oversized = 0
+
+    def set(self, key: tuple, value: Any) -> None:
+        if self.max_entry_bytes is not None and _weigh(value) > self.max_entry_bytes:
+            # Drop any smaller value stored under the key before.
+            self.pop(key)
+            with self._lock:
+                self.oversized += 1
+            return
+        super().set(key, value)
+
+    def _full(self) -> bool:
+        return super()._full() or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def _added(self, key: tuple, value: Any) -> None:
+        size = _weigh(value)
+        self.bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._keys_by_user.setdefault(key[0], set()).add(key)
+
+    def _removed(self, key: tuple) -> None:
+        self.bytes -= self._sizes.pop(key, 0)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def _cleared(self) -> None:
+        self.bytes = 0
+        self._sizes.clear()
+        self._keys_by_user.clear()
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, ()):
+                del self._data[key]
+                self.bytes -= self._sizes.pop(key, 0)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        with self._lock:
+            stats.update(
+                bytes=self.bytes,
+                max_bytes=self.max_bytes,
+                invalidations=self.invalidations,
+                oversized=self.oversized,
+            )
+        return stats
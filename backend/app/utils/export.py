@@ -0,0 +1,64 @@
+import csv
+import io
+from typing import Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.utils.serialization import dumps, task_dicts
+
+# Rows fetched per round trip; each batch costs extra queries for its tags.
+EXPORT_BATCH_SIZE = 1000
+
+CSV_HEADER = [
+    "id",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "position",
+    "user_id",
+    "created_at",
+    "updated_at",
+    "tags",
+]
+
+
+def export_batches(db: Session, stmt) -> Iterator[List[dict]]:
+    """Stream the rows of ``stmt`` (a select of TASK_COLUMNS) in batches of
+    task dicts with their tags attached. Rows are read as plain tuples through
+    a server-side cursor, so neither the session nor this generator holds more
+    than one batch at a time."""
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for rows in result.partitions():
+        yield task_dicts(db, rows)
+
+
+def ndjson_lines(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(dumps(task, [task]) + b"\n" for task in batch)
+
+
+def _csv_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def csv_lines(batches: Iterator[List[dict]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(CSV_HEADER)
+    yield drain()
+    for batch in batches:
+        writer.writerows(
+            [_csv_value(task[name]) for name in CSV_HEADER[:-1]]
+            + [";".join(tag["name"] for tag in task["tags"])]
+            for task in batch
+        )
+        yield drain()
@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, Query
+from sqlalchemy import DateTime, asc, desc, false, select, tuple_, type_coerce, String, or_, and_
+
+from app.models import Task, task_tags
+from app.schemas import TaskSelection
+from app.search import match_clause, match_query, search_clause, tasks_fts
+
+
+SORT_COLUMNS = {
+    "position": Task.position,
+    "due_date": Task.due_date,
+    "priority": Task.priority,
+    "created_at": Task.created_at,
+}
+# bm25 score of the match; lower is more relevant, so ascending is best first.
+RELEVANCE_COLUMN = tasks_fts.c.rank
+
+
+class TaskFilters:
+    def __init__(
+        self,
+        status: Optional[str] = Query(None, description="Filter by completed or pending"),
+        priority: Optional[int] = Query(None, ge=1, le=5, description="Filter by priority: 1-5"),
+        tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
+        due_before: Optional[datetime] = Query(None, description="Due before date"),
+        due_after: Optional[datetime] = Query(None, description="Due after date"),
+        overdue: Optional[bool] = Query(None, description="Show only overdue pending tasks"),
+        no_due_date: Optional[bool] = Query(None, description="Show tasks without due date"),
+        q: Optional[str] = Query(None, max_length=200, description="Full-text search in title and description"),
+    ):
+        self.status = status
+        self.priority = priority
+        self.tag_id = tag_id
+        self.due_before = due_before
+        self.due_after = due_after
+        self.overdue = overdue
+        self.no_due_date = no_due_date
+        # Stored as the normalized FTS5 query. A q without any words matches
+        # nothing rather than being dropped, which would select every task.
+        self.q = match_query(q) if q else None
+        self.unmatchable = bool(q) and self.q is None
+
+    def key(self) -> tuple:
+        return tuple(sorted(vars(self).items()))
+
+    def clauses(self, user_id: int, search: bool = True) -> list:
+        """WHERE clauses for these filters. ``search=False`` leaves out the
+        full-text match for queries that join tasks_fts themselves."""
+        clauses = [Task.user_id == user_id]
+
+        if search and self.q:
+            clauses.append(search_clause(self.q))
+        if self.unmatchable:
+            clauses.append(false())
+
+        if self.status == "completed":
+            clauses.append(Task.completed == True)
+        elif self.status == "pending":
+            clauses.append(Task.completed == False)
+
+        if self.priority:
+            clauses.append(Task.priority == self.priority)
+
+        if self.tag_id:
+            # IN over the (tag_id, task_id) index rather than a correlated
+            # EXISTS per task row.
+            clauses.append(Task.id.in_(select(task_tags.c.task_id).where(task_tags.c.tag_id == self.tag_id)))
+
+        if self.due_before:
+            clauses.append(Task.due_date <= self.due_before)
+
+        if self.due_after:
+            clauses.append(Task.due_date >= self.due_after)
+
+        if self.overdue:
+            clauses.append(Task.completed == False)
+            clauses.append(Task.due_date < datetime.now())
+
+        if self.no_due_date:
+            clauses.append(Task.due_date == None)
+
+        return clauses
+
+
+def selection_clauses(selection: TaskSelection, user_id: int) -> list:
+    """WHERE clauses for a bulk operation's explicit ids or filter, always
+    scoped to ``user_id``."""
+    if selection.ids is not None:
+        return [Task.user_id == user_id, Task.id.in_(selection.ids)]
+    return TaskFilters(**selection.filter.model_dump()).clauses(user_id)
+
+
+def filtered(query, filters: TaskFilters, sort: "TaskSort", user_id: int):
+    """Apply ``filters`` to a Task query or select. Ranking by relevance joins
+    the search index so that its score is available to ORDER BY."""
+    if sort.sort_by == "relevance":
+        return (
+            query.join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(match_clause(filters.q))
+            .where(*filters.clauses(user_id, search=False))
+        )
+    return query.where(*filters.clauses(user_id))
+
+
+class TaskSort:
+    def __init__(
+        self,
+        filters: TaskFilters = Depends(),
+        sort_by: Optional[str] = Query(
+            None,
+            description="Sort by: position, due_date, priority, created_at, relevance. "
+            "Defaults to relevance when q is given, otherwise position",
+        ),
+        sort_order: Optional[str] = Query("asc", description="Sort direction: asc, desc"),
+    ):
+        if filters.q and sort_by in (None, "relevance"):
+            self.sort_by = "relevance"
+            self.column = RELEVANCE_COLUMN
+        else:
+            self.sort_by = sort_by if sort_by in SORT_COLUMNS else "position"
+            self.column = SORT_COLUMNS[self.sort_by]
+        self.descending = sort_order == "desc"
+
+    @property
+    def key(self):
+        # DateTime columns are compared on their stored text so that rows written
+        # by CURRENT_TIMESTAMP and by SQLAlchemy compare consistently.
+        if isinstance(self.column.type, DateTime):
+            return type_coerce(self.column, String)
+        return self.column
+
+    def order_by(self) -> list:
+        direction = desc if self.descending else asc
+        return [direction(self.column), direction(Task.id)]
+
+    def after(self, value, last_id: int):
+        # A row-value comparison seeks the (user_id, column, id) index.
+        # SQLite sorts NULLs first ascending and last descending, and NULL
+        # keys never compare, so they keep a segment of their own.
+        seek = tuple_(self.key, Task.id)
+        if self.descending:
+            if value is None:
+                return and_(self.column == None, Task.id < last_id)
+            return or_(seek < tuple_(value, last_id), self.column == None)
+        if value is None:
+            return or_(
+                and_(self.column == None, Task.id > last_id),
+                self.column != None,
+            )
+        return seek > tuple_(value, last_id)
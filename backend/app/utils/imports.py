@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Rows inserted per transaction.
+IMPORT_CHUNK_SIZE = 1000
+# Failures listed in the import report; later ones are only counted.
+MAX_IMPORT_ERRORS = 100
+
+ImportRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_format(filename: Optional[str]) -> str:
+    return "csv" if (filename or "").lower().endswith(".csv") else "ndjson"
+
+
+def _ndjson_records(text: io.TextIOBase) -> Iterator[ImportRecord]:
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, None, "invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+def _csv_records(text: io.TextIOBase) -> Iterator[ImportRecord]:
+    reader = csv.DictReader(text)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield reader.line_num, None, f"invalid CSV: {exc}"
+            continue
+        # Empty cells mean "not set" so optional fields fall back to defaults.
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+
+
+def read_import_records(file: BinaryIO, format: str) -> Iterator[ImportRecord]:
+    """Yield ``(line, record, error)`` for each row of an uploaded file,
+    decoding and parsing it incrementally so that only one row is held in
+    memory. Undecodable input ends the stream with a final error."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    records = _csv_records(text) if format == "csv" else _ndjson_records(text)
+    line_no = 0
+    try:
+        for line_no, record, error in records:
+            yield line_no, record, error
+    except UnicodeDecodeError:
+        yield line_no + 1, None, "file is not valid UTF-8"
+    finally:
+        text.detach()
@@ -0,0 +1,48 @@
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_by: str, descending: bool, value: Any, last_id: int) -> str:
+    payload = {"s": sort_by, "d": descending, "v": value, "i": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> Tuple[Optional[Any], int]:
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor",
+    )
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = int(payload["i"])
+        value = payload["v"]
+    except (ValueError, KeyError, TypeError, OverflowError):
+        raise invalid_cursor
+    # Only scalars can be compared with a sort column; booleans are ints to Python.
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (str, int, float))):
+        raise invalid_cursor
+
+    if payload.get("s") != sort_by or payload.get("d") != descending:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort order",
+        )
+    return value, last_id
+
+
+def split_page(rows: Sequence[tuple], page_size: int, sort) -> Tuple[List[Any], Optional[str]]:
+    """Split ``(item, sort_key)`` rows fetched with ``limit(page_size + 1)``
+    into the page items and the cursor for the next page."""
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_item, last_value = rows[-1]
+        next_cursor = encode_cursor(sort.sort_by, sort.descending, last_value, last_item.id)
+    return [item for item, _ in rows], next_cursor
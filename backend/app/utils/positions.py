@@ -0,0 +1,80 @@
+from typing import Dict, Iterator, Optional
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.changes import invalidate_task_lists
+from app.models import Task
+
+POSITION_STEP = 1.0
+# Once neighbours are closer than this, the user's positions are renumbered
+# in the background before repeated bisection runs out of float precision.
+REBALANCE_GAP = 1e-6
+
+
+# SQLite builds before 3.32 allow 999 bound parameters per statement. Each
+# reordered task takes three (IN and the CASE's WHEN/THEN) and the user id one.
+SQLITE_MAX_VARIABLES = 999
+REORDER_CHUNK_SIZE = (SQLITE_MAX_VARIABLES - 1) // 3
+
+
+def reorder_statements(positions: Dict[int, float], user_id: int) -> Iterator:
+    """UPDATE statements that write every requested position, one per
+    REORDER_CHUNK_SIZE tasks; rows the user does not own are filtered out by
+    the WHERE clause."""
+    items = list(positions.items())
+    for offset in range(0, len(items), REORDER_CHUNK_SIZE):
+        chunk = dict(items[offset:offset + REORDER_CHUNK_SIZE])
+        yield (
+            update(Task)
+            .where(Task.id.in_(chunk), Task.user_id == user_id)
+            .values(position=case(chunk, value=Task.id))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def position_between(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    """Position strictly between ``after`` (the task above) and ``before`` (the
+    task below), or None when float precision has run out."""
+    if after is None and before is None:
+        return 0.0
+    if after is None:
+        return before - POSITION_STEP
+    if before is None:
+        return after + POSITION_STEP
+    low, high = sorted((after, before))
+    middle = low + (high - low) / 2
+    if not low < middle < high:
+        return None
+    return middle
+
+
+def needs_rebalance(before: Optional[float], after: Optional[float]) -> bool:
+    return before is not None and after is not None and abs(before - after) < REBALANCE_GAP
+
+
+def rebalance_statement(user_id: int):
+    ranked = (
+        select(
+            Task.id.label("id"),
+            func.row_number().over(order_by=(Task.position, Task.id)).label("rank"),
+        )
+        .where(Task.user_id == user_id)
+        .subquery()
+    )
+    return (
+        update(Task)
+        .where(Task.id == ranked.c.id)
+        .values(position=ranked.c.rank * POSITION_STEP)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebalance_positions(db: Session, user_id: int) -> None:
+    db.execute(rebalance_statement(user_id))
+    db.commit()
+    invalidate_task_lists(user_id)
+
+
+def rebalance_positions_in_background(bind, user_id: int) -> None:
+    with Session(bind=bind) as db:
+        rebalance_positions(db, user_id)
@@ -0,0 +1,162 @@
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Task, Tag, task_tags
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Columns in TaskResponse / TagResponse field order, so that dicts built from
+# these rows serialize to the same bytes as the response models.
+TASK_COLUMNS = (
+    Task.title,
+    Task.description,
+    Task.priority,
+    Task.due_date,
+    Task.id,
+    Task.completed,
+    Task.position,
+    Task.user_id,
+    Task.created_at,
+    Task.updated_at,
+)
+TAG_COLUMNS = (Tag.name, Tag.color, Tag.id, Tag.user_id, Tag.created_at)
+TASK_KEYS = tuple(column.key for column in TASK_COLUMNS)
+TAG_KEYS = tuple(column.key for column in TAG_COLUMNS)
+
+_ANY_ADAPTER = TypeAdapter(Any)
+# orjson writes floats of 1e16 and above as "1e16" where pydantic writes
+# "1e+16"; such values go through pydantic to keep the output identical.
+_ORJSON_FLOAT_LIMIT = 1e16
+
+
+def _tag_links(db: Session, task_ids: Sequence[int]) -> list:
+    return db.execute(
+        select(task_tags.c.task_id, task_tags.c.tag_id)
+        .where(task_tags.c.task_id.in_(task_ids))
+        .order_by(task_tags.c.task_id, task_tags.c.tag_id)
+    ).all()
+
+
+def tag_ids_by_task(db: Session, task_ids: Sequence[int]) -> Dict[int, List[int]]:
+    tag_ids: Dict[int, List[int]] = {task_id: [] for task_id in task_ids}
+    if task_ids:
+        for task_id, tag_id in _tag_links(db, task_ids):
+            tag_ids[task_id].append(tag_id)
+    return tag_ids
+
+
+def tags_by_task(db: Session, task_ids: Sequence[int]) -> Dict[int, List[dict]]:
+    """Tags of ``task_ids`` as response dicts. The links and the distinct
+    tags are read separately so that each tag row is decoded once, however
+    many tasks carry it."""
+    tags: Dict[int, List[dict]] = {task_id: [] for task_id in task_ids}
+    if not task_ids:
+        return tags
+    links = _tag_links(db, task_ids)
+    if links:
+        by_id = {
+            row.id: dict(zip(TAG_KEYS, row))
+            for row in db.execute(select(*TAG_COLUMNS).where(Tag.id.in_({tag_id for _, tag_id in links})))
+        }
+        for task_id, tag_id in links:
+            tags[task_id].append(by_id[tag_id])
+    return tags
+
+
+class TaskProjection:
+    """``fields`` and ``expand`` query parameters: which task columns to
+    select and how, if at all, to include each task's tags."""
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated task fields to return; id is always included"
+        ),
+        expand: str = Query(
+            "tags", pattern="^(tags|tag_ids|none)$", description="Tags as objects (tags), ids (tag_ids) or omitted (none)"
+        ),
+    ):
+        if fields:
+            requested = {name.strip() for name in fields.split(",") if name.strip()}
+            unknown = sorted(requested - set(TASK_KEYS))
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(unknown)}",
+                )
+            requested.add("id")
+            self.columns = tuple(column for column in TASK_COLUMNS if column.key in requested)
+        else:
+            self.columns = TASK_COLUMNS
+        self.keys = tuple(column.key for column in self.columns)
+        self.expand = expand
+
+    @property
+    def key(self) -> tuple:
+        return self.keys, self.expand
+
+
+DEFAULT_PROJECTION = TaskProjection(fields=None, expand="tags")
+
+
+def task_dicts(db: Session, rows: Iterable[Sequence], projection: TaskProjection = DEFAULT_PROJECTION) -> List[dict]:
+    """Build task dicts from rows whose first columns are
+    ``projection.columns``, with tags attached as the projection asks. Only
+    the tags that are asked for are queried."""
+    tasks = [dict(zip(projection.keys, row)) for row in rows]
+    if projection.expand == "tags":
+        tags = tags_by_task(db, [task["id"] for task in tasks])
+        for task in tasks:
+            task["tags"] = tags[task["id"]]
+    elif projection.expand == "tag_ids":
+        tag_ids = tag_ids_by_task(db, [task["id"] for task in tasks])
+        for task in tasks:
+            task["tag_ids"] = tag_ids[task["id"]]
+    return tasks
+
+
+def task_dict(db: Session, row: Sequence, projection: TaskProjection = DEFAULT_PROJECTION) -> dict:
+    """Single-task form of task_dicts; its tags come from one join."""
+    task = dict(zip(projection.keys, row))
+    if projection.expand == "tags":
+        task["tags"] = [
+            dict(zip(TAG_KEYS, tag))
+            for tag in db.execute(
+                select(*TAG_COLUMNS)
+                .join(task_tags, task_tags.c.tag_id == Tag.id)
+                .where(task_tags.c.task_id == task["id"])
+                .order_by(Tag.id)
+            )
+        ]
+    elif projection.expand == "tag_ids":
+        task["tag_ids"] = tag_ids_by_task(db, [task["id"]])[task["id"]]
+    return task
+
+
+def tag_dicts(rows: Iterable[Sequence], keys: Sequence[str] = TAG_KEYS) -> List[dict]:
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def _orjson_safe(tasks: List[dict]) -> bool:
+    for task in tasks:
+        position = task.get("position")
+        if position is not None and not (math.isfinite(position) and abs(position) < _ORJSON_FLOAT_LIMIT):
+            return False
+    return True
+
+
+def dumps(value: Any, tasks: Optional[List[dict]] = None) -> bytes:
+    """Encode response dicts to the bytes pydantic would produce for the
+    equivalent response models. ``tasks`` are the task dicts inside
+    ``value``, checked for floats the fast encoder formats differently."""
+    if orjson is not None and (tasks is None or _orjson_safe(tasks)):
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return _ANY_ADAPTER.dump_json(value)
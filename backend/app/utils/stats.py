@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.changes import get_data_version, task_list_cache
+from app.models import Task, Tag, task_tags
+from app.schemas import PriorityCount, TagCount, TaskStats
+from app.utils.filters import TaskFilters
+
+
+def _write_counts(db: Session, user_id: int, filters: TaskFilters) -> dict:
+    """Counts that only change when the user's data changes: one GROUP BY
+    over (priority, completed), answered from its covering index, and one
+    over the tag links."""
+    clauses = filters.clauses(user_id)
+    groups = db.execute(
+        select(Task.priority, Task.completed, func.count())
+        .where(*clauses)
+        .group_by(Task.priority, Task.completed)
+        .order_by(Task.priority)
+    ).all()
+    by_priority: dict = {}
+    total = completed = 0
+    for priority, is_completed, count in groups:
+        by_priority[priority] = by_priority.get(priority, 0) + count
+        total += count
+        if is_completed:
+            completed += count
+
+    tag_counts = (
+        select(task_tags.c.tag_id, func.count())
+        .join(Task, Task.id == task_tags.c.task_id)
+        .where(*clauses)
+    )
+    counts = dict(db.execute(tag_counts.group_by(task_tags.c.tag_id)).all())
+    tags = db.execute(select(Tag.id, Tag.name).where(Tag.user_id == user_id).order_by(Tag.name, Tag.id)).all()
+
+    return {
+        "total": total,
+        "completed": completed,
+        "by_priority": [PriorityCount(priority=priority, count=count) for priority, count in by_priority.items()],
+        "by_tag": [TagCount(tag_id=tag_id, name=name, count=counts.get(tag_id, 0)) for tag_id, name in tags],
+    }
+
+
+def _clock_counts(db: Session, user_id: int, filters: TaskFilters, now: datetime) -> tuple:
+    """Overdue and due-today counts at ``now``, plus the time until which
+    they stay exact: the next pending due date or midnight, whichever comes
+    first, as no write can change them without bumping the data version."""
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    clauses = filters.clauses(user_id)
+    pending_due = (*clauses, Task.completed == False, Task.due_date != None)  # noqa: E711,E712
+    overdue = db.scalar(select(func.count()).where(*pending_due, Task.due_date < now))
+    due_today = db.scalar(
+        select(func.count()).where(*pending_due, Task.due_date >= today, Task.due_date < tomorrow)
+    )
+    next_due = db.scalar(
+        select(Task.due_date)
+        .where(*pending_due, Task.due_date >= now, Task.due_date < tomorrow)
+        .order_by(Task.due_date)
+        .limit(1)
+    )
+    return overdue, due_today, next_due or tomorrow
+
+
+def task_stats(db: Session, user_id: int, filters: TaskFilters, now: Optional[datetime] = None) -> TaskStats:
+    """Facet counts over the tasks matching ``filters``, cached per data
+    version like task lists. Overdue and due-today also move with the clock,
+    so they are cached separately until the moment they could next change."""
+    now = now or datetime.now()
+    if filters.overdue:
+        # The overdue filter itself reads the clock; nothing is cached.
+        counts = _write_counts(db, user_id, filters)
+        clock = _clock_counts(db, user_id, filters, now)
+    else:
+        version = get_data_version(db, user_id)
+        key = (user_id, "stats", version, filters.key())
+        counts = task_list_cache.get(key)
+        if counts is None:
+            counts = _write_counts(db, user_id, filters)
+            task_list_cache.set(key, counts)
+
+        clock_key = (user_id, "stats-clock", version, filters.key())
+        clock = task_list_cache.get(clock_key)
+        if clock is None or now >= clock[2] or now < clock[3]:
+            overdue, due_today, valid_until = _clock_counts(db, user_id, filters, now)
+            clock = (overdue, due_today, valid_until, now)
+            task_list_cache.set(clock_key, clock)
+
+    return TaskStats(
+        total=counts["total"],
+        pending=counts["total"] - counts["completed"],
+        completed=counts["completed"],
+        overdue=clock[0],
+        due_today=clock[1],
+        by_priority=counts["by_priority"],
+        by_tag=counts["by_tag"],
+    )
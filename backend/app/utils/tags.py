@@ -0,0 +1,95 @@
+from typing import Dict, List, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import String, cast, false, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Tag, Task, task_tags
+from app.schemas import TagCreate, TagRename
+from app.utils.serialization import TAG_COLUMNS, TAG_KEYS, tag_dicts
+
+TAG_USAGE_KEYS = TAG_KEYS + ("task_count", "pending_count")
+
+
+def tag_usage_query(user_id: int):
+    """The user's tags with the number of tasks carrying each and how many of
+    those are pending, as one grouped query over the tag's links."""
+    return (
+        select(
+            *TAG_COLUMNS,
+            func.count(task_tags.c.task_id),
+            func.count(Task.id).filter(Task.completed == false()),
+        )
+        .select_from(Tag)
+        .outerjoin(task_tags, task_tags.c.tag_id == Tag.id)
+        .outerjoin(Task, Task.id == task_tags.c.task_id)
+        .where(Tag.user_id == user_id)
+        .group_by(Tag.id)
+        .order_by(Tag.id)
+    )
+
+
+def get_or_create_tags(db: Session, user_id: int, tags: Sequence[TagCreate]) -> Tuple[Dict[str, dict], List[int]]:
+    """Tag dicts by name for ``tags``, creating the names the user does not
+    have yet; the first colour given for a new name is used. Returns them with
+    the ids created. INSERT OR IGNORE against uq_tags_user_id_name makes this
+    safe against concurrent callers creating the same name."""
+    wanted: Dict[str, TagCreate] = {}
+    for tag in tags:
+        wanted.setdefault(tag.name, tag)
+    found: Dict[str, dict] = {}
+    if not wanted:
+        return found, []
+    for tag in tag_dicts(db.execute(
+        insert(Tag).prefix_with("OR IGNORE").returning(*TAG_COLUMNS),
+        [{"name": tag.name, "color": tag.color, "user_id": user_id} for tag in wanted.values()],
+    )):
+        found[tag["name"]] = tag
+    created = [tag["id"] for tag in found.values()]
+    missing = wanted.keys() - found.keys()
+    if missing:
+        for tag in tag_dicts(db.execute(
+            select(*TAG_COLUMNS).where(Tag.user_id == user_id, Tag.name.in_(missing))
+        )):
+            found[tag["name"]] = tag
+    return found, created
+
+
+def rename_tags(db: Session, user_id: int, renames: Sequence[TagRename]) -> List[dict]:
+    """Rename (and optionally recolour) the user's tags in one transaction.
+    Names may move between the tags being renamed, e.g. a swap; a name held by
+    any other tag of the user is a 409. Returns the tags in request order."""
+    ids = [rename.id for rename in renames]
+    names = [rename.name for rename in renames]
+    rows = db.execute(
+        select(Tag.id, Tag.name, Tag.color)
+        .where(Tag.user_id == user_id, or_(Tag.id.in_(ids), Tag.name.in_(names)))
+    ).all()
+    current = {row.id: row for row in rows if row.id in set(ids)}
+    unknown = sorted(set(ids) - current.keys())
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Tags not found: {unknown}")
+    taken = sorted(row.name for row in rows if row.id not in current and row.name in set(names))
+    if taken:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Tag names already in use: {taken}")
+
+    try:
+        held = {row.name for row in current.values()}
+        if any(rename.name in held and current[rename.id].name != rename.name for rename in renames):
+            # The unique index is checked row by row, so names that move
+            # between these tags are first parked on placeholders.
+            db.execute(
+                update(Tag).where(Tag.id.in_(ids)).values(name="\x00" + cast(Tag.id, String))
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(update(Tag), [
+            {"id": rename.id, "name": rename.name, "color": rename.color or current[rename.id].color}
+            for rename in renames
+        ])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Tag names already in use")
+
+    by_id = {tag["id"]: tag for tag in tag_dicts(db.execute(select(*TAG_COLUMNS).where(Tag.id.in_(ids))))}
+    return [by_id[tag_id] for tag_id in ids]
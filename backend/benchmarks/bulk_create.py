@@ -0,0 +1,53 @@
+"""Throughput of POST /tasks/bulk against sequential POST /tasks.
+
+Usage::
+
+    python -m benchmarks.bulk_create --tasks 2000 --batch 500
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("TODO_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": "bulk@example.com", "password": "bench"})
+        token = client.post(
+            "/auth/login", data={"username": "bulk@example.com", "password": "bench"}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        tag_id = client.post("/tags", headers=headers, json={"name": "import"}).json()["id"]
+        items = [
+            {"title": f"Task {i}", "priority": i % 5 + 1, "tag_ids": [tag_id]}
+            for i in range(args.tasks)
+        ]
+
+        start = time.perf_counter()
+        for item in items:
+            client.post("/tasks", headers=headers, json=item)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for offset in range(0, len(items), args.batch):
+            client.post("/tasks/bulk", headers=headers, json={"tasks": items[offset:offset + args.batch]})
+        bulk = time.perf_counter() - start
+
+    print(f"sequential: {args.tasks / sequential:9.0f} tasks/s")
+    print(f"bulk:       {args.tasks / bulk:9.0f} tasks/s  (batch {args.batch})")
+    print(f"speedup:    {sequential / bulk:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Compare requests/sec and latency of the sync and async database modes.
+
+Usage::
+
+    python -m benchmarks.db_modes --clients 50 100 250 500 --requests 2000
+
+Each mode gets a fresh SQLite file seeded with one user and ``--tasks`` tasks,
+and is driven in-process through an ASGI client so the numbers reflect the
+application and database layers rather than the network.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def seed(db_url: str, tasks: int) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.auth import get_password_hash
+    from app.database import Base
+    from app.indexes import apply_indexes
+    from app.models import Task, Tag, User
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    apply_indexes(engine)
+    session = sessionmaker(bind=engine)()
+    user = User(email="bench@example.com", password=get_password_hash("bench"))
+    session.add(user)
+    session.flush()
+    tags = [Tag(name=f"tag {i}", user_id=user.id) for i in range(5)]
+    session.add_all(tags)
+    for i in range(tasks):
+        task = Task(title=f"Task {i}", user_id=user.id, position=float(i), priority=i % 5 + 1)
+        task.tags = [tags[i % len(tags)]]
+        session.add(task)
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+async def drive(app, clients: int, total: int, task_count: int) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/auth/login", data={"username": "bench@example.com", "password": "bench"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        latencies = []
+        errors = 0
+        counter = iter(range(total))
+
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                if i % 2:
+                    url = f"/tasks/{i % task_count + 1}"
+                else:
+                    url = "/tasks?limit=50"
+                start = time.perf_counter()
+                result = await client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                if result.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "clients": clients,
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run_mode(mode: str, clients_list, total: int, tasks: int) -> list:
+    # app.database reads its configuration at import time, so each mode runs
+    # in its own interpreter via ``--mode``.
+    import subprocess
+    import sys
+    import json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, TODO_DATABASE_URL=f"sqlite:///{tmp}/bench.db", TODO_DB_MODE=mode)
+        args = [sys.executable, "-m", "benchmarks.db_modes", "--mode", mode,
+                "--requests", str(total), "--tasks", str(tasks), "--clients", *map(str, clients_list)]
+        output = subprocess.run(args, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+        return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--mode", choices=["sync", "async"])
+    args = parser.parse_args()
+
+    if args.mode:
+        import json
+        from app.database import SQLALCHEMY_DATABASE_URL
+        seed(SQLALCHEMY_DATABASE_URL, args.tasks)
+        from app.main import create_app
+
+        app = create_app(args.mode)
+        results = [asyncio.run(drive(app, c, args.requests, args.tasks)) for c in args.clients]
+        print(json.dumps(results))
+        return
+
+    print(f"{'mode':<6} {'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for mode in ("sync", "async"):
+        for row in run_mode(mode, args.clients, args.requests, args.tasks):
+            print(f"{mode:<6} {row['clients']:>7} {row['rps']:>9.1f} "
+                  f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
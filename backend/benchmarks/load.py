@@ -0,0 +1,501 @@
+"""Load-test every API endpoint in-process and record latency and SQL counts.
+
+Usage::
+
+    python -m benchmarks.load --users 10 --tasks 2000 --tags 20 --tag-density 1.5 \\
+        --concurrency 1 16 --requests 200 --output results.json
+    python -m benchmarks.load --output new.json --compare results.json
+
+A fresh SQLite file is seeded with ``--users`` users, each owning ``--tasks``
+tasks and ``--tags`` tags, with on average ``--tag-density`` tags per task.
+Spare users seeded the same way are only used, and deleted, by
+``auth.delete_me``. Each scenario then sends ``--requests`` requests through an
+ASGI client at each ``--concurrency`` level. Reads run before writes, and
+deletes run last, so every scenario sees the seeded dataset. A delete scenario
+that runs out of seeded rows is skipped and reported rather than measured on
+fewer requests. The JSON results hold the dataset settings alongside each
+scenario's throughput, latency percentiles and SQL statements per request.
+``--compare`` diffs them against an earlier run and exits with status 1 on
+regressions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("TODO_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/load.db")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.auth import create_access_token, get_password_hash  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.db_modes import percentile  # noqa: E402
+
+PASSWORD = "load-test"
+DELETE_ME_REQUESTS = 10
+WORDS = "buy call email write review plan fix clean book pay send read draft order invoice report".split()
+
+
+@dataclass
+class UserData:
+    id: int
+    email: str
+    headers: dict
+    task_ids: List[int]
+    tag_ids: List[int]
+
+
+class DatasetExhausted(Exception):
+    """No seeded rows are left for a scenario that consumes them."""
+
+
+@dataclass
+class Dataset:
+    users: List[UserData]
+    spares: List[UserData]
+    rng: random.Random
+
+    def user(self) -> UserData:
+        return self.rng.choice(self.users)
+
+    def task_id(self, user: UserData) -> int:
+        return self.rng.choice(user.task_ids)
+
+    def owner_of(self, attr: str) -> UserData:
+        """A user with seeded rows of ``attr`` left to delete."""
+        owners = [user for user in self.users if getattr(user, attr)]
+        if not owners:
+            raise DatasetExhausted(f"no seeded {attr} left")
+        return self.rng.choice(owners)
+
+    def spare(self) -> UserData:
+        """A spare user to delete."""
+        if not self.spares:
+            raise DatasetExhausted("no spare users left")
+        return self.spares.pop()
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Returns (method, url, httpx request kwargs) for request number i.
+    build: Callable[[Dataset, int], tuple]
+    expected: tuple = (200,)
+    # Caps requests for endpoints dominated by bcrypt.
+    max_requests: Optional[int] = None
+    # Sends a built request instead of the shared client; returns the status.
+    send: Optional[Callable] = None
+
+
+def _seed_user(conn, email: str, password: str, tasks: int, tags: int, tag_density: float,
+               rng: random.Random, now: datetime) -> UserData:
+    user_id = conn.exec_driver_sql(
+        "INSERT INTO users (email, password) VALUES (?, ?) RETURNING id", (email, password)
+    ).scalar()
+    tag_ids = [
+        conn.exec_driver_sql(
+            "INSERT INTO tags (name, color, user_id) VALUES (?, '#6b7280', ?) RETURNING id",
+            (f"tag {t}", user_id),
+        ).scalar()
+        for t in range(tags)
+    ]
+    conn.exec_driver_sql(
+        "INSERT INTO tasks (user_id, title, description, completed, priority, due_date, position) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                user_id,
+                " ".join(rng.sample(WORDS, 3)),
+                " ".join(rng.sample(WORDS, 5)),
+                rng.random() < 0.3,
+                rng.choice([None, 1, 2, 3, 4, 5]),
+                (now + timedelta(days=rng.randint(-30, 30))).isoformat(" ") if rng.random() < 0.6 else None,
+                float(i),
+            )
+            for i in range(tasks)
+        ],
+    )
+    task_ids = [row[0] for row in conn.exec_driver_sql(
+        "SELECT id FROM tasks WHERE user_id = ? ORDER BY id", (user_id,)
+    )]
+    links = set()
+    if tag_ids:
+        for task_id in task_ids:
+            count = int(tag_density) + (rng.random() < tag_density % 1)
+            for tag_id in rng.sample(tag_ids, min(count, len(tag_ids))):
+                links.add((task_id, tag_id))
+    conn.exec_driver_sql("INSERT INTO task_tags (task_id, tag_id) VALUES (?, ?)", sorted(links))
+    token = create_access_token({"sub": user_id}, expires_delta=timedelta(hours=6))
+    return UserData(user_id, email, {"Authorization": f"Bearer {token}"}, task_ids, tag_ids)
+
+
+def seed(users: int, tasks: int, tags: int, tag_density: float, rng: random.Random, spares: int = 0) -> Dataset:
+    password = get_password_hash(PASSWORD)
+    now = datetime.now()
+    with engine.begin() as conn:
+        data = [
+            _seed_user(conn, f"load{u}@example.com", password, tasks, tags, tag_density, rng, now)
+            for u in range(users)
+        ]
+        spare = [
+            _seed_user(conn, f"spare{u}@example.com", password, tasks, tags, tag_density, rng, now)
+            for u in range(spares)
+        ]
+        conn.exec_driver_sql("ANALYZE")
+    return Dataset(data, spare, rng)
+
+
+def _as(method: str, url: Callable, body: Optional[Callable] = None, **kwargs):
+    def build(ds: Dataset, i: int):
+        user = ds.user()
+        request = dict(kwargs, headers=user.headers)
+        if body is not None:
+            request["json"] = body(ds, user, i)
+        return method, url(ds, user, i), request
+    return build
+
+
+def _import_file(ds: Dataset, user: UserData, i: int) -> bytes:
+    return "".join(
+        json.dumps({"title": f"Imported {i}-{n}", "tags": [f"import {n % 3}"]}) + "\n" for n in range(100)
+    ).encode()
+
+
+async def _stream_event(client, method: str, url: str, kwargs: dict) -> int:
+    """Open the event stream at ``url`` on the app itself, since the ASGI
+    client buffers whole responses, then create a task as the same user and
+    wait for its event. Returns the stream's status code."""
+    messages: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": url,
+        "raw_path": url.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in kwargs["headers"].items()],
+        "server": ("load", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    stream = asyncio.ensure_future(app(scope, receive, messages.put))
+    try:
+        status = (await messages.get())["status"]
+        if status == 200:
+            await messages.get()  # retry hint, sent once subscribed
+            created = await client.post("/tasks", headers=kwargs["headers"], json={"title": "Streamed"})
+            expected = f'"ids":[{created.json()["id"]}]'.encode()
+            while expected not in (await messages.get()).get("body", b""):
+                pass
+        return status
+    finally:
+        disconnected.set()
+        await stream
+
+
+def scenarios() -> List[Scenario]:
+    task_url = lambda ds, user, i: f"/tasks/{ds.task_id(user)}"  # noqa: E731
+    return [
+        # Reads.
+        Scenario("auth.me", _as("GET", lambda ds, user, i: "/auth/me")),
+        Scenario("tasks.list", _as("GET", lambda ds, user, i: "/tasks")),
+        Scenario("tasks.list_page", _as("GET", lambda ds, user, i: "/tasks", params={"limit": 50})),
+        Scenario("tasks.list_filtered", _as(
+            "GET", lambda ds, user, i: "/tasks", params={"status": "pending", "priority": 3, "sort_by": "due_date"}
+        )),
+        Scenario("tasks.list_sparse", _as(
+            "GET", lambda ds, user, i: "/tasks", params={"fields": "title,completed", "expand": "none", "limit": 100}
+        )),
+        Scenario("tasks.search", _as("GET", lambda ds, user, i: "/tasks", params={"q": "invoice", "limit": 50})),
+        Scenario("tasks.stats", _as("GET", lambda ds, user, i: "/tasks/stats")),
+        Scenario("tasks.export", _as("GET", lambda ds, user, i: "/tasks/export"), max_requests=20),
+        Scenario("tasks.get", _as("GET", task_url)),
+        Scenario("tags.list", _as("GET", lambda ds, user, i: "/tags")),
+        Scenario("tags.list_counts", _as("GET", lambda ds, user, i: "/tags", params={"counts": "true"})),
+        Scenario("sync.snapshot", _as("GET", lambda ds, user, i: "/sync", params={"limit": 500})),
+        # Writes.
+        Scenario("tasks.create", _as(
+            "POST", lambda ds, user, i: "/tasks",
+            lambda ds, user, i: {"title": f"Load {i}", "priority": 2, "tag_ids": user.tag_ids[:1]},
+        ), expected=(201,)),
+        Scenario("tasks.bulk_create", _as(
+            "POST", lambda ds, user, i: "/tasks/bulk",
+            lambda ds, user, i: {"tasks": [{"title": f"Bulk {i}-{n}"} for n in range(50)]},
+        )),
+        Scenario("tasks.update", _as(
+            "PATCH", task_url, lambda ds, user, i: {"title": f"Updated {i}", "priority": i % 5 + 1}
+        )),
+        Scenario("tasks.toggle", _as("PATCH", lambda ds, user, i: f"/tasks/{ds.task_id(user)}/toggle")),
+        Scenario("tasks.move", _as(
+            "PATCH", lambda ds, user, i: f"/tasks/{ds.task_id(user)}/move",
+            lambda ds, user, i: {"after_id": ds.task_id(user)},
+        )),
+        Scenario("tasks.reorder", _as(
+            "PUT", lambda ds, user, i: "/tasks/reorder",
+            lambda ds, user, i: {"tasks": [{"id": ds.task_id(user), "position": float(n)} for n in range(20)]},
+        ), expected=(204,)),
+        Scenario("tasks.bulk_toggle", _as(
+            "POST", lambda ds, user, i: "/tasks/bulk/toggle",
+            lambda ds, user, i: {"ids": [ds.task_id(user) for _ in range(20)]},
+        )),
+        Scenario("tasks.bulk_update", _as(
+            "PATCH", lambda ds, user, i: "/tasks/bulk",
+            lambda ds, user, i: {"filter": {"priority": i % 5 + 1}, "changes": {"priority": i % 5 + 1}},
+        )),
+        Scenario("tasks.bulk_tags", _as(
+            "POST", lambda ds, user, i: "/tasks/bulk/tags",
+            lambda ds, user, i: {"ids": [ds.task_id(user) for _ in range(20)], "add": user.tag_ids[:2]},
+        )),
+        Scenario("tasks.import", lambda ds, i: (
+            lambda user: ("POST", "/tasks/import", {
+                "headers": user.headers,
+                "files": {"file": ("tasks.ndjson", _import_file(ds, user, i))},
+            })
+        )(ds.user()), max_requests=20),
+        Scenario("tags.create", _as(
+            "POST", lambda ds, user, i: "/tags", lambda ds, user, i: {"name": f"load tag {i}-{time.time_ns()}"}
+        ), expected=(201,)),
+        Scenario("tags.bulk_create", _as(
+            "POST", lambda ds, user, i: "/tags/bulk",
+            lambda ds, user, i: {"tags": [{"name": f"tag {t}"} for t in range(0, 40, 2)]},
+        )),
+        Scenario("tags.bulk_rename", _as(
+            "PATCH", lambda ds, user, i: "/tags/bulk",
+            lambda ds, user, i: {"tags": [
+                {"id": tag_id, "name": f"renamed {i}-{n}-{time.time_ns()}"} for n, tag_id in enumerate(user.tag_ids[:5])
+            ]},
+        )),
+        # Opens a stream, creates a task and waits for its event.
+        Scenario("events.roundtrip", _as("GET", lambda ds, user, i: "/events"), send=_stream_event),
+        # Deletes consume seeded rows, so they run last.
+        Scenario("tasks.delete", lambda ds, i: (
+            lambda user: ("DELETE", f"/tasks/{user.task_ids.pop()}", {"headers": user.headers})
+        )(ds.owner_of("task_ids")), expected=(204,)),
+        Scenario("tasks.bulk_delete", lambda ds, i: (
+            lambda user: ("POST", "/tasks/bulk/delete", {
+                "headers": user.headers, "json": {"ids": [user.task_ids.pop() for _ in range(10) if user.task_ids]},
+            })
+        )(ds.owner_of("task_ids"))),
+        Scenario("tags.delete", lambda ds, i: (
+            lambda user: ("DELETE", f"/tags/{user.tag_ids.pop()}", {"headers": user.headers})
+        )(ds.owner_of("tag_ids")), expected=(204,), max_requests=5),
+        Scenario("auth.delete_me", lambda ds, i: (
+            lambda user: ("DELETE", "/auth/me", {"headers": user.headers})
+        )(ds.spare()), expected=(204,), max_requests=DELETE_ME_REQUESTS),
+        # bcrypt-bound.
+        Scenario("auth.login", lambda ds, i: (
+            "POST", "/auth/login", {"data": {"username": ds.user().email, "password": PASSWORD}}
+        ), max_requests=20),
+        Scenario("auth.register", lambda ds, i: (
+            "POST", "/auth/register", {"json": {"email": f"new{i}-{time.time_ns()}@example.com", "password": PASSWORD}}
+        ), expected=(200, 201), max_requests=20),
+    ]
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, *args):
+        self.count += 1
+
+
+async def run_scenario(client, scenario: Scenario, dataset: Dataset, requests: int, concurrency: int,
+                       statements: StatementCounter) -> dict:
+    total = min(requests, scenario.max_requests or requests)
+    # Build requests up front so that the rng and pops stay deterministic.
+    try:
+        prepared = [scenario.build(dataset, i) for i in range(total + 1)]
+    except DatasetExhausted as exc:
+        return {"scenario": scenario.name, "concurrency": concurrency, "skipped": str(exc)}
+
+    async def send(method, url, kwargs) -> int:
+        if scenario.send is not None:
+            return await scenario.send(client, method, url, kwargs)
+        return (await client.request(method, url, **kwargs)).status_code
+
+    # One unmeasured request warms the principal and response caches.
+    await send(*prepared.pop())
+    pending = iter(prepared)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for method, url, kwargs in pending:
+            start = time.perf_counter()
+            status_code = await send(method, url, kwargs)
+            latencies.append(time.perf_counter() - start)
+            if status_code not in scenario.expected:
+                errors += 1
+
+    before = statements.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 2),
+        "mean_ms": round(sum(latencies) / total * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "sql_per_request": round((statements.count - before) / total, 2),
+    }
+
+
+async def run(selected: List[Scenario], dataset: Dataset, requests: int, concurrency: List[int]) -> List[dict]:
+    import httpx
+
+    statements = StatementCounter()
+    results = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+        for scenario in selected:
+            for level in concurrency:
+                row = await run_scenario(client, scenario, dataset, requests, level, statements)
+                results.append(row)
+                if "skipped" in row:
+                    print(f"{row['scenario']:<22} {row['concurrency']:>4} skipped: {row['skipped']}", flush=True)
+                    continue
+                print(
+                    f"{row['scenario']:<22} {row['concurrency']:>4} {row['rps']:>9.1f} {row['p50_ms']:>9.2f} "
+                    f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['sql_per_request']:>6.1f} {row['errors']:>6}",
+                    flush=True,
+                )
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``: p95 latency or
+    throughput worse by more than ``threshold``, more SQL statements per
+    request, new errors, or a scenario that could no longer run."""
+    previous: Dict[tuple, dict] = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'scenario':<22} {'conc':>4} {'p95 ms':>17} {'req/s':>17} {'sql/req':>13}")
+    for row in results["results"]:
+        old = previous.get((row["scenario"], row["concurrency"]))
+        if old is None or "skipped" in old:
+            continue
+        name = f"{row['scenario']} @ {row['concurrency']}"
+        if "skipped" in row:
+            print(f"{row['scenario']:<22} {row['concurrency']:>4} skipped: {row['skipped']}")
+            regressions.append(f"{name}: skipped ({row['skipped']})")
+            continue
+        print(
+            f"{row['scenario']:<22} {row['concurrency']:>4} "
+            f"{old['p95_ms']:>8.2f}->{row['p95_ms']:<8.2f} {old['rps']:>8.1f}->{row['rps']:<8.1f} "
+            f"{old['sql_per_request']:>6.1f}->{row['sql_per_request']:<6.1f}"
+        )
+        if row["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {old['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms")
+        if row["rps"] < old["rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {old['rps']:.1f} -> {row['rps']:.1f} req/s")
+        if row["sql_per_request"] > old["sql_per_request"]:
+            regressions.append(f"{name}: SQL/request {old['sql_per_request']} -> {row['sql_per_request']}")
+        if row["errors"] > old["errors"]:
+            regressions.append(f"{name}: errors {old['errors']} -> {row['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=2000, help="tasks per user")
+    parser.add_argument("--tags", type=int, default=20, help="tags per user")
+    parser.add_argument("--tag-density", type=float, default=1.5, help="average tags per task")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--scenarios", nargs="+", help="run only these scenarios (prefixes such as 'tags.' match)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    selected = [
+        s for s in scenarios()
+        if not args.scenarios or any(s.name == name or s.name.startswith(name) for name in args.scenarios)
+    ]
+    rng = random.Random(args.seed)
+    # One spare user per auth.delete_me request, warm-up included.
+    spares = 0
+    if any(s.name == "auth.delete_me" for s in selected):
+        spares = (min(args.requests, DELETE_ME_REQUESTS) + 1) * len(args.concurrency)
+    dataset = seed(args.users, args.tasks, args.tags, args.tag_density, rng, spares)
+
+    print(f"{'scenario':<22} {'conc':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql':>6} {'errors':>6}")
+    rows = asyncio.run(run(selected, dataset, args.requests, args.concurrency))
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "dataset": {
+                "users": args.users,
+                "tasks_per_user": args.tasks,
+                "tags_per_user": args.tags,
+                "tag_density": args.tag_density,
+                "spare_users": spares,
+                "seed": args.seed,
+            },
+            "requests": args.requests,
+        },
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+            print("warning: baseline was recorded with a different dataset", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
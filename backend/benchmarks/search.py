@@ -0,0 +1,107 @@
+"""Latency of GET /tasks?q= (FTS5) against a LIKE scan as the task table grows.
+
+Usage::
+
+    python -m benchmarks.search --sizes 10000 100000 1000000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("TODO_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.changes import task_list_cache  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+WORDS = (
+    "buy call email write review plan fix clean book pay send read draft check "
+    "order update prepare schedule renew cancel report invoice meeting groceries "
+    "garden car dentist taxes budget slides ticket laundry project client"
+).split()
+# One task in RARE_EVERY carries the rare word, so rare-term matches grow with
+# the table while the index lookup should not.
+RARE_WORD = "zeppelin"
+RARE_EVERY = 1000
+SEED_BATCH = 10_000
+
+
+def seed(user_id: int, start: int, stop: int, rng: random.Random) -> None:
+    for offset in range(start, stop, SEED_BATCH):
+        rows = []
+        for i in range(offset, min(offset + SEED_BATCH, stop)):
+            words = rng.sample(WORDS, 4)
+            if i % RARE_EVERY == 0:
+                words.append(RARE_WORD)
+            rows.append((user_id, " ".join(words[:3]), " ".join(words[3:]), float(i)))
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO tasks (user_id, title, description, position, completed) "
+                "VALUES (?, ?, ?, ?, 0)",
+                rows,
+            )
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def like_scan(term: str, user_id: int, limit: int):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(
+            "SELECT id FROM tasks WHERE user_id = ? AND (title LIKE ? OR description LIKE ?) "
+            "ORDER BY position, id LIMIT ?",
+            (user_id, f"%{term}%", f"%{term}%", limit),
+        ).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": "search@example.com", "password": "bench"})
+        token = client.post(
+            "/auth/login", data={"username": "search@example.com", "password": "bench"}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+        print(f"{'tasks':>9} {'rare fts ms':>12} {'rare like ms':>13} {'common fts ms':>14} {'common like ms':>15}")
+        seeded = 0
+        for size in sorted(args.sizes):
+            seed(user_id, seeded, size, rng)
+            seeded = size
+            with engine.begin() as conn:
+                conn.exec_driver_sql("ANALYZE")
+
+            results = []
+            for term in (RARE_WORD, "invoice"):
+                url = f"/tasks?q={term}&limit={args.limit}"
+
+                def search():
+                    # Skip the response cache so every sample runs the query.
+                    task_list_cache.clear()
+                    client.get(url, headers=headers)
+
+                results.append(timed(search, args.repeat))
+                results.append(timed(lambda: like_scan(term, user_id, args.limit), args.repeat))
+            print(f"{size:>9} {results[0]:>12.2f} {results[1]:>13.2f} {results[2]:>14.2f} {results[3]:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Cost of serializing GET /tasks bodies per 1k tasks: ORM objects validated
+through TaskResponse against the column-tuple path used by the routers.
+
+Usage::
+
+    python -m benchmarks.serialization --tasks 1000 5000 --tags 3 --repeat 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("TODO_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import delete, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+import app.main  # noqa: E402,F401  (creates the schema)
+from app.database import SessionLocal  # noqa: E402
+from app.models import Tag, Task, User, task_tags  # noqa: E402
+from app.schemas import TaskResponse  # noqa: E402
+from app.utils import serialization  # noqa: E402
+
+TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+def seed(db, count: int, tags_per_task: int) -> int:
+    db.execute(delete(task_tags))
+    db.execute(delete(Task))
+    db.execute(delete(Tag))
+    db.execute(delete(User))
+    user = User(email="serialize@example.com", password="x")
+    db.add(user)
+    db.flush()
+    tags = [Tag(name=f"tag {i}", user_id=user.id) for i in range(10)]
+    db.add_all(tags)
+    db.flush()
+    for i in range(count):
+        db.add(Task(
+            title=f"Task {i}",
+            description="Something to do before the end of the week",
+            priority=i % 5 + 1,
+            position=float(i),
+            user_id=user.id,
+            tags=[tags[(i + j) % len(tags)] for j in range(tags_per_task)],
+        ))
+    db.commit()
+    return user.id
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--tags", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    encoder = "orjson" if serialization.orjson is not None else "pydantic"
+
+    print(f"{'tasks':>7} {'orm ms/1k':>10} {'fast ms/1k':>11} {'encode ms/1k':>13} {'speedup':>8}  ({encoder})")
+    with SessionLocal() as db:
+        for count in args.tasks:
+            user_id = seed(db, count, args.tags)
+            stmt = select(*serialization.TASK_COLUMNS).where(Task.user_id == user_id).order_by(Task.position, Task.id)
+
+            def orm_path():
+                db.expire_all()
+                tasks = (
+                    db.query(Task).options(selectinload(Task.tags))
+                    .filter(Task.user_id == user_id).order_by(Task.position, Task.id).all()
+                )
+                return TASK_LIST.dump_json(TASK_LIST.validate_python(tasks, from_attributes=True))
+
+            def fast_path():
+                tasks = serialization.task_dicts(db, db.execute(stmt))
+                return serialization.dumps(tasks, tasks)
+
+            assert orm_path() == fast_path(), "fast path output differs from TaskResponse"
+            tasks = serialization.task_dicts(db, db.execute(stmt))
+            per_k = 1000 / count
+            orm = timed(orm_path, args.repeat) * per_k
+            fast = timed(fast_path, args.repeat) * per_k
+            encode = timed(lambda: serialization.dumps(tasks, tasks), args.repeat) * per_k
+            print(f"{count:>7} {orm:>10.2f} {fast:>11.2f} {encode:>13.2f} {orm / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Mixed read/write throughput of the default and tuned SQLite profiles.
+
+Usage::
+
+    python -m benchmarks.sqlite_profile --threads 8 32 --seconds 5 --write-ratio 0.2
+
+Each thread runs its own session against a shared database file: reads list a
+user's pending tasks, writes toggle a task and commit. Lock errors that
+outlast the busy timeout are counted rather than retried.
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, build_engine
+from app.indexes import apply_indexes
+from app.models import Task, User
+
+
+def seed(engine, users: int, tasks_per_user: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    apply_indexes(engine)
+    session = sessionmaker(bind=engine)()
+    for u in range(users):
+        user = User(email=f"user{u}@example.com", password="x")
+        session.add(user)
+        session.flush()
+        session.add_all(
+            Task(title=f"Task {i}", user_id=user.id, position=float(i), completed=i % 2 == 0)
+            for i in range(tasks_per_user)
+        )
+    session.commit()
+    session.close()
+
+
+def run(profile: str, threads: int, seconds: float, write_ratio: float, users: int, tasks: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        engine = build_engine(url, profile=profile)
+        seed(engine, users, tasks)
+        Session = sessionmaker(bind=engine)
+        deadline = time.perf_counter() + seconds
+        lock = threading.Lock()
+        totals = {"reads": 0, "writes": 0, "errors": 0}
+        latencies = []
+
+        def worker(seed_value):
+            rng = random.Random(seed_value)
+            local = {"reads": 0, "writes": 0, "errors": 0}
+            samples = []
+            while time.perf_counter() < deadline:
+                user_id = rng.randint(1, users)
+                session = Session()
+                start = time.perf_counter()
+                try:
+                    if rng.random() < write_ratio:
+                        task_id = (user_id - 1) * tasks + rng.randint(1, tasks)
+                        session.execute(
+                            update(Task).where(Task.id == task_id).values(completed=~Task.completed)
+                        )
+                        session.commit()
+                        local["writes"] += 1
+                    else:
+                        session.execute(
+                            select(Task).where(Task.user_id == user_id, Task.completed == False)
+                            .order_by(Task.position).limit(50)
+                        ).all()
+                        local["reads"] += 1
+                    samples.append(time.perf_counter() - start)
+                except OperationalError:
+                    session.rollback()
+                    local["errors"] += 1
+                finally:
+                    session.close()
+            with lock:
+                for key, value in local.items():
+                    totals[key] += value
+                latencies.extend(samples)
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": profile,
+        "threads": threads,
+        "ops_per_sec": (totals["reads"] + totals["writes"]) / elapsed,
+        "reads": totals["reads"],
+        "writes": totals["writes"],
+        "errors": totals["errors"],
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[4, 16, 32])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'profile':<8} {'threads':>7} {'ops/s':>9} {'reads':>7} {'writes':>7} "
+          f"{'errors':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for threads in args.threads:
+        for profile in ("default", "tuned"):
+            r = run(profile, threads, args.seconds, args.write_ratio, args.users, args.tasks)
+            print(f"{r['profile']:<8} {r['threads']:>7} {r['ops_per_sec']:>9.0f} {r['reads']:>7} "
+                  f"{r['writes']:>7} {r['errors']:>6} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
+import re
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import get_db, Base
-from app.auth import get_password_hash
+from app.database import get_db, Base, configure_engine
+from app.auth import get_password_hash, principal_cache
+from app.changes import task_list_cache
+from app.profiling import instrument_engine
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -16,11 +20,81 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+configure_engine(engine, SQLALCHEMY_DATABASE_URL, profile="default")
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.executions = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.executions.append((statement, parameters))
+
+    def __enter__(self):
+        self.executions = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def statements(self):
+        return [statement for statement, _ in self.executions]
+
+    @property
+    def count(self):
+        return len(self.executions)
+
+
+@pytest.fixture
+def count_queries():
+    return lambda: QueryCounter(engine)
+
+
+@pytest.fixture
+def assert_constant_queries(count_queries):
+    """Run ``request()`` after ``grow(n)`` for increasing ``n`` and fail if the
+    number of SQL statements changes with the size of the result."""
+    def check(grow, request, sizes=(1, 5, 20)):
+        request()  # warm per-process caches such as the principal cache
+        counts = []
+        for size in sizes:
+            grow(size)
+            with count_queries() as counter:
+                request()
+            counts.append(counter.count)
+        assert len(set(counts)) == 1, f"query count grows with result size: {counts}"
+        return counts[0]
+    return check
+
+
+def server_timing_queries(response) -> int:
+    """Statement count reported in a response's Server-Timing header."""
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+@pytest.fixture
+def assert_query_budget(client):
+    """Send a request and fail if it ran more SQL statements than ``budget``,
+    as reported by the profiling middleware."""
+    def check(method, url, budget, **kwargs):
+        response = client.request(method, url, **kwargs)
+        assert response.status_code < 400, response.text
+        count = server_timing_queries(response)
+        assert count <= budget, f"{method} {url} ran {count} queries, budget is {budget}"
+        return response
+    return check
+
+
 @pytest.fixture(scope="function")
 def db():
+    principal_cache.clear()
+    task_list_cache.clear()
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     yield db
@@ -0,0 +1,157 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from app.auth import get_password_hash, principal_cache
+from app.database import Base, configure_engine, get_async_db
+
+
+@pytest.fixture
+def async_db_url(tmp_path):
+    path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    principal_cache.clear()
+    return f"sqlite+aiosqlite:///{path}"
+
+
+@pytest.fixture
+def seed_db(async_db_url):
+    engine = create_engine(async_db_url.replace("+aiosqlite", ""))
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def async_client(async_db_url):
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.main import create_app
+
+    engine = create_async_engine(async_db_url, poolclass=NullPool)
+    configure_engine(engine.sync_engine, async_db_url, profile="default")
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = create_app("async")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def async_auth_headers(async_client, seed_db):
+    from app.models import User
+
+    seed_db.add(User(email="async@example.com", password=get_password_hash("password123")))
+    seed_db.commit()
+    response = async_client.post(
+        "/auth/login",
+        data={"username": "async@example.com", "password": "password123"}
+    )
+    token = response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestAsyncMode:
+    def test_register_and_me(self, async_client):
+        response = async_client.post(
+            "/auth/register",
+            json={"email": "new@example.com", "password": "password123"}
+        )
+        assert response.status_code == 201
+        login = async_client.post(
+            "/auth/login",
+            data={"username": "new@example.com", "password": "password123"}
+        )
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        assert async_client.get("/auth/me", headers=headers).json()["email"] == "new@example.com"
+
+    def test_requires_auth(self, async_client):
+        assert async_client.get("/tasks").status_code == 401
+
+    def test_task_lifecycle(self, async_client, async_auth_headers):
+        tag = async_client.post("/tags", headers=async_auth_headers, json={"name": "work"}).json()
+
+        created = async_client.post(
+            "/tasks",
+            headers=async_auth_headers,
+            json={"title": "Async task", "priority": 2, "tag_ids": [tag["id"]]}
+        )
+        assert created.status_code == 201
+        task = created.json()
+        assert [t["name"] for t in task["tags"]] == ["work"]
+
+        updated = async_client.patch(
+            f"/tasks/{task['id']}", headers=async_auth_headers, json={"title": "Renamed", "tag_ids": []}
+        )
+        assert updated.json()["title"] == "Renamed"
+        assert updated.json()["tags"] == []
+
+        toggled = async_client.patch(f"/tasks/{task['id']}/toggle", headers=async_auth_headers)
+        assert toggled.json()["completed"] is True
+
+        listed = async_client.get("/tasks?status=completed", headers=async_auth_headers).json()
+        assert [t["title"] for t in listed] == ["Renamed"]
+
+        assert async_client.delete(f"/tasks/{task['id']}", headers=async_auth_headers).status_code == 204
+        assert async_client.get(f"/tasks/{task['id']}", headers=async_auth_headers).status_code == 404
+
+    def test_pagination_and_reorder(self, async_client, async_auth_headers):
+        ids = [
+            async_client.post("/tasks", headers=async_auth_headers, json={"title": f"Task {i}"}).json()["id"]
+            for i in range(3)
+        ]
+        response = async_client.put(
+            "/tasks/reorder",
+            headers=async_auth_headers,
+            json={"tasks": [{"id": task_id, "position": float(3 - i)} for i, task_id in enumerate(ids)]}
+        )
+        assert response.status_code == 204
+
+        page = async_client.get("/tasks?limit=2", headers=async_auth_headers).json()
+        assert [t["title"] for t in page["items"]] == ["Task 2", "Task 1"]
+        rest = async_client.get(
+            "/tasks", headers=async_auth_headers, params={"limit": 2, "cursor": page["next_cursor"]}
+        ).json()
+        assert [t["title"] for t in rest["items"]] == ["Task 0"]
+        assert rest["next_cursor"] is None
+
+    def test_delete_tag(self, async_client, async_auth_headers):
+        tag = async_client.post("/tags", headers=async_auth_headers, json={"name": "old"}).json()
+        async_client.post("/tasks", headers=async_auth_headers, json={"title": "T", "tag_ids": [tag["id"]]})
+
+        assert async_client.delete(f"/tags/{tag['id']}", headers=async_auth_headers).status_code == 204
+        assert async_client.get("/tags", headers=async_auth_headers).json() == []
+        assert async_client.get("/tasks", headers=async_auth_headers).json()[0]["tags"] == []
+
+    def test_delete_account(self, async_client, async_auth_headers):
+        tag = async_client.post("/tags", headers=async_auth_headers, json={"name": "gone"}).json()
+        async_client.post("/tasks", headers=async_auth_headers, json={"title": "T", "tag_ids": [tag["id"]]})
+
+        assert async_client.delete("/auth/me", headers=async_auth_headers).status_code == 204
+        assert async_client.get("/auth/me", headers=async_auth_headers).status_code == 401
+
+    def test_sync_only_routes_answer_501(self, async_client, async_auth_headers):
+        assert async_client.get("/tasks/stats", headers=async_auth_headers).status_code == 501
+        assert async_client.post("/tasks/bulk", headers=async_auth_headers, json={"tasks": []}).status_code == 501
+        assert async_client.get("/sync", headers=async_auth_headers).status_code == 501
+        assert async_client.get("/tasks/1", headers=async_auth_headers).status_code == 404
+
+    def test_logs_unavailable_features(self, caplog):
+        from app.main import create_app
+
+        with caplog.at_level("WARNING", logger="app.main"):
+            create_app("async")
+        assert "GET /events" in caplog.text
+        assert "ETag/304 responses" in caplog.text
@@ -57,10 +57,10 @@ class TestTaskOwnership:
         assert response.status_code == 200
         assert response.json()["title"] == "My Private Task"
 
-    def test_anonymous_cannot_access_task(self, client, db):
+    def test_anonymous_cannot_access_task(self, client, db, user):
         from app.models import Task
 
-        task = Task(title="Private Task", user_id=1)
+        task = Task(title="Private Task", user_id=user[1].id)
         db.add(task)
         db.commit()
         db.refresh(task)
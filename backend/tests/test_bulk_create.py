@@ -0,0 +1,92 @@
+import pytest
+
+
+class TestBulkCreate:
+    def test_bulk_create_without_auth(self, client):
+        response = client.post("/tasks/bulk", json={"tasks": [{"title": "Task"}]})
+        assert response.status_code == 401
+
+    def test_bulk_create_in_input_order(self, client, auth_headers):
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [{"title": f"Task {i}", "priority": i % 5 + 1} for i in range(5)]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 5
+        assert data["failed"] == 0
+        assert [r["task"]["title"] for r in data["results"]] == [f"Task {i}" for i in range(5)]
+        assert [r["index"] for r in data["results"]] == list(range(5))
+
+        listed = client.get("/tasks", headers=auth_headers).json()
+        assert len(listed) == 5
+        assert all(t["user_id"] == 1 and t["completed"] is False for t in listed)
+
+    def test_bulk_create_with_tags(self, client, auth_headers, tag):
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [
+                {"title": "Tagged", "tag_ids": [tag.id, tag.id]},
+                {"title": "Untagged"},
+            ]}
+        )
+        results = response.json()["results"]
+        assert [t["name"] for t in results[0]["task"]["tags"]] == ["work"]
+        assert results[1]["task"]["tags"] == []
+
+    def test_bulk_create_reports_per_item_errors(self, client, auth_headers):
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [
+                {"title": "Good"},
+                {"priority": 3},
+                {"title": "Bad priority", "priority": 9},
+                {"title": "Also good"},
+            ]}
+        )
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 2
+        results = data["results"]
+        assert results[0]["task"]["title"] == "Good"
+        assert results[1]["task"] is None and "title" in results[1]["error"]
+        assert results[2]["task"] is None and "priority" in results[2]["error"]
+        assert results[3]["task"]["title"] == "Also good"
+
+    def test_bulk_create_rejects_other_users_tags(self, client, auth_headers_user2, tag):
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers_user2,
+            json={"tasks": [{"title": "Steal tag", "tag_ids": [tag.id]}]}
+        )
+        data = response.json()
+        assert data["created"] == 0
+        assert "unknown tags" in data["results"][0]["error"]
+
+    def test_bulk_create_limits(self, client, auth_headers):
+        from app.schemas import MAX_BULK_ITEMS
+
+        assert client.post("/tasks/bulk", headers=auth_headers, json={"tasks": []}).status_code == 422
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [{"title": "T"}] * (MAX_BULK_ITEMS + 1)}
+        )
+        assert response.status_code == 422
+
+    def test_bulk_create_constant_queries(self, client, auth_headers, tag, count_queries):
+        client.get("/auth/me", headers=auth_headers)
+        counts = []
+        for size in (2, 50):
+            with count_queries() as counter:
+                response = client.post(
+                    "/tasks/bulk",
+                    headers=auth_headers,
+                    json={"tasks": [{"title": f"T{i}", "tag_ids": [tag.id]} for i in range(size)]}
+                )
+            assert response.json()["created"] == size
+            counts.append(counter.count)
+        assert counts[0] == counts[1]
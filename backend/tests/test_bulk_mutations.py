@@ -0,0 +1,152 @@
+import pytest
+
+
+@pytest.fixture
+def tasks(db, user):
+    from app.models import Task
+
+    items = [
+        Task(title=f"Task {i}", user_id=1, priority=i % 3 + 1, completed=i % 2 == 0)
+        for i in range(6)
+    ]
+    db.add_all(items)
+    db.commit()
+    return [t.id for t in items]
+
+
+class TestBulkToggle:
+    def test_toggle_by_ids_flips_each(self, client, auth_headers, tasks):
+        response = client.post(
+            "/tasks/bulk/toggle", headers=auth_headers, json={"ids": tasks[:2]}
+        )
+        assert response.json() == {"affected": 2}
+        first, second = (client.get(f"/tasks/{i}", headers=auth_headers).json() for i in tasks[:2])
+        assert first["completed"] is False
+        assert second["completed"] is True
+
+    def test_complete_by_filter(self, client, auth_headers, tasks):
+        response = client.post(
+            "/tasks/bulk/toggle",
+            headers=auth_headers,
+            json={"filter": {"status": "pending"}, "completed": True},
+        )
+        assert response.json()["affected"] == 3
+        assert client.get("/tasks?status=pending", headers=auth_headers).json() == []
+
+    def test_requires_exactly_one_selector(self, client, auth_headers):
+        assert client.post("/tasks/bulk/toggle", headers=auth_headers, json={}).status_code == 422
+        response = client.post(
+            "/tasks/bulk/toggle", headers=auth_headers, json={"ids": [1], "filter": {}}
+        )
+        assert response.status_code == 422
+
+    def test_other_users_tasks_untouched(self, client, auth_headers_user2, tasks):
+        response = client.post(
+            "/tasks/bulk/toggle", headers=auth_headers_user2, json={"ids": tasks}
+        )
+        assert response.json()["affected"] == 0
+        response = client.post(
+            "/tasks/bulk/toggle", headers=auth_headers_user2, json={"filter": {}}
+        )
+        assert response.json()["affected"] == 0
+
+
+class TestBulkUpdate:
+    def test_update_by_filter(self, client, auth_headers, tasks):
+        response = client.patch(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"filter": {"priority": 1}, "changes": {"priority": 5, "description": "bumped"}},
+        )
+        assert response.json()["affected"] == 2
+        bumped = client.get("/tasks?priority=5", headers=auth_headers).json()
+        assert {t["description"] for t in bumped} == {"bumped"}
+
+    def test_update_requires_changes(self, client, auth_headers, tasks):
+        response = client.patch(
+            "/tasks/bulk", headers=auth_headers, json={"ids": tasks, "changes": {}}
+        )
+        assert response.status_code == 400
+
+    def test_update_validates_changes(self, client, auth_headers, tasks):
+        response = client.patch(
+            "/tasks/bulk", headers=auth_headers, json={"ids": tasks, "changes": {"priority": 9}}
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("field", ["title", "completed", "position"])
+    def test_update_rejects_null_for_required_columns(self, client, auth_headers, tasks, field):
+        response = client.patch(
+            "/tasks/bulk", headers=auth_headers, json={"ids": tasks, "changes": {field: None}}
+        )
+        assert response.status_code == 422
+
+    def test_update_clears_nullable_columns(self, client, auth_headers, tasks):
+        response = client.patch(
+            "/tasks/bulk", headers=auth_headers, json={"ids": tasks, "changes": {"priority": None}}
+        )
+        assert response.json()["affected"] == len(tasks)
+        assert {t["priority"] for t in client.get("/tasks", headers=auth_headers).json()} == {None}
+
+
+class TestBulkDelete:
+    def test_delete_by_ids(self, client, auth_headers, tasks):
+        response = client.post("/tasks/bulk/delete", headers=auth_headers, json={"ids": tasks[:3]})
+        assert response.json()["affected"] == 3
+        assert len(client.get("/tasks", headers=auth_headers).json()) == 3
+
+    def test_delete_by_tag_filter_removes_links(self, client, auth_headers, db, tasks, tag):
+        from app.models import task_tags
+
+        client.post("/tasks/bulk/tags", headers=auth_headers, json={"ids": tasks[:2], "add": [tag.id]})
+        response = client.post(
+            "/tasks/bulk/delete", headers=auth_headers, json={"filter": {"tag_id": tag.id}}
+        )
+        assert response.json()["affected"] == 2
+        assert db.execute(task_tags.select()).all() == []
+
+    def test_delete_other_users_tasks(self, client, auth_headers_user2, tasks):
+        response = client.post("/tasks/bulk/delete", headers=auth_headers_user2, json={"ids": tasks})
+        assert response.json()["affected"] == 0
+
+
+class TestBulkTags:
+    def test_add_and_remove_tags(self, client, auth_headers, tasks, tag):
+        response = client.post(
+            "/tasks/bulk/tags", headers=auth_headers, json={"filter": {"status": "completed"}, "add": [tag.id]}
+        )
+        assert response.json() == {"added": 3, "removed": 0}
+
+        again = client.post(
+            "/tasks/bulk/tags", headers=auth_headers, json={"ids": tasks, "add": [tag.id]}
+        )
+        assert again.json()["added"] == 3
+
+        tagged = client.get(f"/tasks?tag_id={tag.id}", headers=auth_headers).json()
+        assert len(tagged) == 6
+
+        removed = client.post(
+            "/tasks/bulk/tags", headers=auth_headers, json={"ids": tasks[:4], "remove": [tag.id]}
+        )
+        assert removed.json() == {"added": 0, "removed": 4}
+
+    def test_foreign_tags_rejected(self, client, auth_headers_user2, tag):
+        response = client.post(
+            "/tasks/bulk/tags", headers=auth_headers_user2, json={"filter": {}, "add": [tag.id]}
+        )
+        assert response.status_code == 404
+
+    def test_bulk_operations_constant_queries(self, client, auth_headers, db, tag, count_queries):
+        from app.models import Task
+
+        client.get("/auth/me", headers=auth_headers)
+        counts = []
+        for size in (2, 40):
+            db.add_all([Task(title="T", user_id=1) for _ in range(size)])
+            db.commit()
+            with count_queries() as counter:
+                client.post("/tasks/bulk/tags", headers=auth_headers, json={"filter": {}, "add": [tag.id]})
+                client.post("/tasks/bulk/toggle", headers=auth_headers, json={"filter": {}})
+                client.post("/tasks/bulk/delete", headers=auth_headers, json={"filter": {}})
+            counts.append(counter.count)
+        assert counts[0] == counts[1]
@@ -0,0 +1,220 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import principal_cache
+from app.cascades import apply_autoincrement, apply_cascades, has_autoincrement, has_cascades
+from app.database import Base, build_engine, get_db
+from app.events import event_broker
+from app.main import app
+from app.models import Tag, Task, User, sync_log, task_tags, user_versions
+from tests.test_events import stream_while
+
+
+def add_tagged_tasks(db, user, tag, count):
+    tasks = [Task(title=f"Task {i}", user_id=user.id, tags=[tag]) for i in range(count)]
+    db.add_all(tasks)
+    db.commit()
+    return [task.id for task in tasks]
+
+
+def link_count(db, **where):
+    query = select(func.count()).select_from(task_tags)
+    for column, value in where.items():
+        query = query.where(task_tags.c[column] == value)
+    return db.scalar(query)
+
+
+class TestCascadingDeletes:
+    def test_foreign_keys_are_enforced(self, db):
+        assert db.connection().exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+    def test_delete_tag_removes_links_in_one_statement(
+        self, client, auth_headers, user, db, count_queries, monkeypatch
+    ):
+        # Keep the throttled tombstone compaction out of the counts.
+        monkeypatch.setattr("app.routers.tags.compact_tombstones_in_background", lambda bind: None)
+        client.get("/auth/me", headers=auth_headers)  # warm the principal cache
+        counts = []
+        for size in (1, 20):
+            tag = Tag(name=f"busy {size}", user_id=user[1].id)
+            db.add(tag)
+            db.commit()
+            tag_id = tag.id
+            add_tagged_tasks(db, user[1], tag, size)
+            with count_queries() as counter:
+                assert client.delete(f"/tags/{tag_id}", headers=auth_headers).status_code == 204
+            counts.append(counter.count)
+            assert link_count(db, tag_id=tag_id) == 0
+        assert counts[0] == counts[1]
+        assert db.scalar(select(func.count()).select_from(Task)) == 21
+
+    def test_delete_task_removes_its_links(self, client, auth_headers, user, tag, db):
+        task_id, other_id = add_tagged_tasks(db, user[1], tag, 2)
+        assert client.delete(f"/tasks/{task_id}", headers=auth_headers).status_code == 204
+        assert link_count(db, task_id=task_id) == 0
+        assert link_count(db, task_id=other_id) == 1
+
+    def test_bulk_delete_removes_links(self, client, auth_headers, user, tag, db):
+        task_ids = add_tagged_tasks(db, user[1], tag, 3)
+        client.post("/tasks/bulk/delete", json={"ids": task_ids}, headers=auth_headers)
+        assert link_count(db) == 0
+
+    def test_cannot_delete_other_users_rows(self, client, auth_headers_user2, user, tag, db):
+        [task_id] = add_tagged_tasks(db, user[1], tag, 1)
+        assert client.delete(f"/tasks/{task_id}", headers=auth_headers_user2).status_code == 404
+        assert client.delete(f"/tags/{tag.id}", headers=auth_headers_user2).status_code == 404
+        assert link_count(db, task_id=task_id) == 1
+
+
+class TestDeleteAccount:
+    def test_deletes_user_and_all_data(self, client, auth_headers, auth_headers_user2, user, user2, tag, db):
+        add_tagged_tasks(db, user[1], tag, 3)
+        client.post("/tasks", json={"title": "Not mine"}, headers=auth_headers_user2)
+        user_id = user[1].id
+
+        assert client.delete("/auth/me", headers=auth_headers).status_code == 204
+
+        assert db.scalar(select(func.count()).select_from(User).where(User.id == user_id)) == 0
+        for table, column in ((Task, Task.user_id), (Tag, Tag.user_id), (sync_log, sync_log.c.user_id),
+                              (user_versions, user_versions.c.user_id)):
+            assert db.scalar(select(func.count()).select_from(table).where(column == user_id)) == 0
+        assert link_count(db) == 0
+        assert [t["title"] for t in client.get("/tasks", headers=auth_headers_user2).json()] == ["Not mine"]
+
+    def test_tokens_stop_working(self, client, auth_headers, user):
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+        client.delete("/auth/me", headers=auth_headers)
+        assert client.get("/auth/me", headers=auth_headers).status_code == 401
+
+    def test_ids_are_not_reused(self, client, auth_headers, user):
+        user_id = user[1].id
+        client.delete("/auth/me", headers=auth_headers)
+        response = client.post("/auth/register", json={"email": "again@example.com", "password": "password123"})
+        assert response.json()["id"] > user_id
+
+    def test_statement_count_does_not_grow_with_data(self, client, user, db, count_queries):
+        from app.auth import create_access_token
+
+        counts = []
+        for size in (1, 30):
+            account = User(email=f"bulk{size}@example.com", password="x")
+            db.add(account)
+            db.commit()
+            tag = Tag(name="t", user_id=account.id)
+            add_tagged_tasks(db, account, tag, size)
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': account.id})}"}
+            client.get("/auth/me", headers=headers)
+            with count_queries() as counter:
+                assert client.delete("/auth/me", headers=headers).status_code == 204
+            counts.append(counter.count)
+        assert counts[0] == counts[1]
+
+    def test_ends_open_event_streams(self, client, auth_headers, user):
+        user_id = user[1].id
+        response = stream_while(client, user_id, lambda: client.delete("/auth/me", headers=auth_headers),
+                                headers=auth_headers)
+        assert response.status_code == 200
+        assert event_broker.subscriber_count(user_id) == 0
+
+
+class TestApplyCascades:
+    @pytest.fixture
+    def old_engine(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'old.db'}"
+        legacy = create_engine(url)
+        Base.metadata.create_all(bind=legacy)
+        with legacy.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE task_tags")
+            conn.exec_driver_sql(
+                "CREATE TABLE task_tags (task_id INTEGER REFERENCES tasks (id), "
+                "tag_id INTEGER REFERENCES tags (id), PRIMARY KEY (task_id, tag_id))"
+            )
+            conn.exec_driver_sql("INSERT INTO tasks (id, title) VALUES (1, 'a'), (2, 'b')")
+            conn.exec_driver_sql("INSERT INTO tags (id, name) VALUES (1, 'x')")
+            # (3, 1) points at a task that no longer exists.
+            conn.exec_driver_sql("INSERT INTO task_tags VALUES (1, 1), (2, 1), (3, 1)")
+        legacy.dispose()
+        engine = build_engine(url, profile="default")
+        yield engine
+        engine.dispose()
+
+    def test_rebuilds_task_tags_with_cascades(self, old_engine):
+        assert apply_cascades(old_engine) is True
+        assert apply_cascades(old_engine) is False
+        with old_engine.begin() as conn:
+            assert has_cascades(conn)
+            assert conn.exec_driver_sql("SELECT task_id FROM task_tags ORDER BY task_id").scalars().all() == [1, 2]
+            triggers = conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'task_tags'"
+            ).scalars().all()
+            assert "trg_task_tags_sync_delete" in triggers
+            conn.exec_driver_sql("DELETE FROM tags WHERE id = 1")
+            assert conn.exec_driver_sql("SELECT count(*) FROM task_tags").scalar() == 0
+
+
+class TestApplyAutoincrement:
+    @pytest.fixture
+    def old_engine(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'old.db'}"
+        legacy = create_engine(url)
+        with legacy.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR NOT NULL, "
+                "password VARCHAR NOT NULL, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP))"
+            )
+        Base.metadata.create_all(bind=legacy)
+        legacy.dispose()
+        engine = build_engine(url, profile="default")
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def old_client(self, old_engine):
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=old_engine)
+
+        def override_get_db():
+            db = sessions()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        principal_cache.clear()
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as c:
+            yield c
+        app.dependency_overrides.clear()
+        principal_cache.clear()
+
+    def register(self, client, email):
+        credentials = {"email": email, "password": "password123"}
+        user_id = client.post("/auth/register", json=credentials).json()["id"]
+        token = client.post(
+            "/auth/login", data={"username": email, "password": "password123"}
+        ).json()["access_token"]
+        return user_id, {"Authorization": f"Bearer {token}"}
+
+    def test_rebuilds_users_with_autoincrement(self, old_engine):
+        with old_engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO users (id, email, password) VALUES (1, 'a@example.com', 'x')")
+            conn.exec_driver_sql("INSERT INTO tasks (title, user_id) VALUES ('a', 1)")
+        assert apply_autoincrement(old_engine) is True
+        assert apply_autoincrement(old_engine) is False
+        with old_engine.begin() as conn:
+            assert has_autoincrement(conn)
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+            assert conn.exec_driver_sql("SELECT email FROM users").scalars().all() == ["a@example.com"]
+            assert "REFERENCES users" in conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'tasks'"
+            ).scalar()
+            assert conn.exec_driver_sql("PRAGMA foreign_key_check").all() == []
+
+    def test_deleted_accounts_tokens_stay_dead(self, old_engine, old_client):
+        apply_autoincrement(old_engine)
+        old_id, old_headers = self.register(old_client, "old@example.com")
+        assert old_client.delete("/auth/me", headers=old_headers).status_code == 204
+        new_id, _ = self.register(old_client, "new@example.com")
+        assert new_id > old_id
+        assert old_client.get("/auth/me", headers=old_headers).status_code == 401
@@ -0,0 +1,42 @@
+import pytest
+
+
+class TestSQLiteProfile:
+    def test_tuned_profile_applies_pragmas(self, tmp_path):
+        from app.database import build_engine, describe_engine
+
+        engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}", profile="tuned")
+        config = describe_engine(engine)
+        assert config["pragmas"]["journal_mode"] == "wal"
+        assert config["pragmas"]["synchronous"] == 1
+        assert config["pragmas"]["busy_timeout"] == 5000
+        assert config["pragmas"]["temp_store"] == 2
+        assert config["pragmas"]["cache_size"] == -65536
+        assert config["pool"]["size"] == 20
+        engine.dispose()
+
+    def test_default_profile_leaves_sqlite_defaults(self, tmp_path):
+        from app.database import build_engine, describe_engine
+
+        engine = build_engine(f"sqlite:///{tmp_path / 'default.db'}", profile="default")
+        config = describe_engine(engine)
+        assert config["pragmas"]["journal_mode"] == "delete"
+        assert config["pragmas"]["synchronous"] == 2
+        engine.dispose()
+
+    def test_memory_database_skips_wal(self):
+        from app.database import build_engine, describe_engine
+
+        engine = build_engine("sqlite://", profile="tuned")
+        config = describe_engine(engine)
+        assert config["pragmas"]["journal_mode"] == "memory"
+        assert config["pragmas"]["busy_timeout"] == 5000
+        engine.dispose()
+
+    def test_health_db_reports_configuration(self, client):
+        response = client.get("/health/db")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["pragmas"]) >= {"journal_mode", "synchronous", "busy_timeout"}
+        assert "pool" in data
+        assert "url" not in data
@@ -0,0 +1,121 @@
+import pytest
+
+
+class TestConditionalGet:
+    def test_tasks_has_etag(self, client, auth_headers):
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.headers["ETag"].startswith('W/"')
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+    def test_not_modified_skips_row_loading(self, client, auth_headers, db, count_queries):
+        from app.models import Task
+
+        db.add(Task(title="Task", user_id=1))
+        db.commit()
+        etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+
+        with count_queries() as counter:
+            response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert not any("FROM tasks" in s for s in counter.statements)
+
+    @pytest.mark.parametrize("change", ["create", "update", "toggle", "delete", "tag", "bulk"])
+    def test_writes_change_etag(self, client, auth_headers, db, tag, change):
+        from app.models import Task
+
+        task = Task(title="Task", user_id=1)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+
+        if change == "create":
+            client.post("/tasks", headers=auth_headers, json={"title": "New"})
+        elif change == "update":
+            client.patch(f"/tasks/{task_id}", headers=auth_headers, json={"title": "Renamed"})
+        elif change == "toggle":
+            client.patch(f"/tasks/{task_id}/toggle", headers=auth_headers)
+        elif change == "delete":
+            client.delete(f"/tasks/{task_id}", headers=auth_headers)
+        elif change == "tag":
+            client.delete(f"/tags/{tag.id}", headers=auth_headers)
+        elif change == "bulk":
+            client.post("/tasks/bulk/tags", headers=auth_headers, json={"ids": [task_id], "add": [tag.id]})
+
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_etag_depends_on_query(self, client, auth_headers):
+        first = client.get("/tasks?status=pending", headers=auth_headers).headers["ETag"]
+        second = client.get("/tasks?status=completed", headers=auth_headers).headers["ETag"]
+        assert first != second
+        response = client.get(
+            "/tasks?status=completed", headers={**auth_headers, "If-None-Match": first}
+        )
+        assert response.status_code == 200
+
+    def test_other_users_writes_do_not_change_etag(self, client, auth_headers, auth_headers_user2):
+        etag = client.get("/tasks", headers=auth_headers).headers["ETag"]
+        client.post("/tasks", headers=auth_headers_user2, json={"title": "Theirs"})
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_overdue_lists_are_never_not_modified(self, client, auth_headers):
+        response = client.get("/tasks?overdue=true", headers=auth_headers)
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "no-store"
+        response = client.get("/tasks?overdue=true", headers={**auth_headers, "If-None-Match": "*"})
+        assert response.status_code == 200
+
+    def test_single_task_and_tags(self, client, auth_headers, db, tag):
+        from app.models import Task
+
+        task = Task(title="Task", user_id=1)
+        db.add(task)
+        db.commit()
+
+        for path in (f"/tasks/{task.id}", "/tags"):
+            etag = client.get(path, headers=auth_headers).headers["ETag"]
+            response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+            assert response.status_code == 304
+
+        etag = client.get("/tags", headers=auth_headers).headers["ETag"]
+        client.post("/tags", headers=auth_headers, json={"name": "new"})
+        assert client.get("/tags", headers={**auth_headers, "If-None-Match": etag}).status_code == 200
+
+    def test_missing_task_is_not_found_for_any_etag(self, client, auth_headers, db, auth_headers_user2):
+        from app.models import Task
+
+        task = Task(title="Theirs", user_id=2)
+        db.add(task)
+        db.commit()
+
+        for task_id in (999, task.id):
+            response = client.get(f"/tasks/{task_id}", headers={**auth_headers, "If-None-Match": "*"})
+            assert response.status_code == 404
+
+    def test_weak_comparison_and_lists(self):
+        from app.changes import etag_matches
+
+        assert etag_matches('"1-abc"', 'W/"1-abc"')
+        assert etag_matches('W/"0-x", W/"1-abc"', 'W/"1-abc"')
+        assert etag_matches("*", 'W/"1-abc"')
+        assert not etag_matches('W/"2-abc"', 'W/"1-abc"')
+        assert not etag_matches(None, 'W/"1-abc"')
+
+
+class TestChangeTriggers:
+    def test_apply_triggers_is_idempotent(self, db):
+        from app.changes import apply_triggers
+
+        apply_triggers(db.get_bind())
+        apply_triggers(db.get_bind())
+        names = {
+            row[0] for row in db.connection().exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+            )
+        }
+        assert "trg_tasks_version_insert" in names
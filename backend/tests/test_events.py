@@ -0,0 +1,186 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from app.events import HEARTBEAT, RESYNC, EventBroker, TooManyStreams, event_broker
+
+
+def parse_events(body):
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def stream_while(client, user_id, action, url="/events", **kwargs):
+    """GET the event stream of ``user_id`` while ``action`` runs on another
+    thread, then end the stream and return the response."""
+    errors = []
+
+    def run():
+        try:
+            deadline = time.monotonic() + 5
+            while event_broker.subscriber_count(user_id) == 0:
+                assert time.monotonic() < deadline, "stream did not subscribe"
+                time.sleep(0.01)
+            action()
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+        finally:
+            event_broker.disconnect(user_id)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    response = client.get(url, **kwargs)
+    thread.join()
+    if errors:
+        raise errors[0]
+    return response
+
+
+class TestEventStream:
+    def test_streams_task_and_tag_changes(self, client, auth_headers, user):
+        ids = {}
+
+        def write():
+            task = client.post("/tasks", json={"title": "Pushed"}, headers=auth_headers).json()
+            ids["task"] = task["id"]
+            client.patch(f"/tasks/{task['id']}", json={"title": "Renamed"}, headers=auth_headers)
+            client.patch(f"/tasks/{task['id']}/toggle", headers=auth_headers)
+            client.put("/tasks/reorder", json={"tasks": [{"id": task["id"], "position": 2.0}]}, headers=auth_headers)
+            tag = client.post("/tags", json={"name": "pushed"}, headers=auth_headers).json()
+            ids["tag"] = tag["id"]
+            client.delete(f"/tags/{tag['id']}", headers=auth_headers)
+            client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+
+        response = stream_while(client, user[1].id, write, headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        task_id, tag_id = ids["task"], ids["tag"]
+        assert parse_events(response.text) == [
+            ("task.created", {"type": "task.created", "ids": [task_id]}),
+            ("task.updated", {"type": "task.updated", "ids": [task_id]}),
+            ("task.toggled", {"type": "task.toggled", "ids": [task_id]}),
+            ("task.reordered", {"type": "task.reordered", "ids": [task_id]}),
+            ("tag.created", {"type": "tag.created", "ids": [tag_id]}),
+            ("tag.deleted", {"type": "tag.deleted", "ids": [tag_id]}),
+            ("task.deleted", {"type": "task.deleted", "ids": [task_id]}),
+        ]
+        assert event_broker.subscriber_count(user[1].id) == 0
+
+    def test_bulk_operations_report_affected_ids(self, client, auth_headers, user):
+        created = client.post(
+            "/tasks/bulk", json={"tasks": [{"title": "A"}, {"title": "B"}]}, headers=auth_headers
+        ).json()
+        task_ids = [result["task"]["id"] for result in created["results"]]
+
+        def write():
+            client.post("/tasks/bulk/toggle", json={"ids": task_ids}, headers=auth_headers)
+            client.patch("/tasks/bulk", json={"filter": {}, "changes": {"priority": 2}}, headers=auth_headers)
+            client.post("/tasks/bulk/delete", json={"ids": task_ids[:1]}, headers=auth_headers)
+
+        events = parse_events(stream_while(client, user[1].id, write, headers=auth_headers).text)
+        assert [(name, sorted(data["ids"])) for name, data in events] == [
+            ("task.toggled", task_ids),
+            ("task.updated", task_ids),
+            ("task.deleted", task_ids[:1]),
+        ]
+
+    def test_bulk_tagging_by_filter_reports_affected_ids(self, client, auth_headers, user, tag):
+        created = client.post(
+            "/tasks/bulk", json={"tasks": [{"title": "A"}, {"title": "B"}]}, headers=auth_headers
+        ).json()
+        task_ids = [result["task"]["id"] for result in created["results"]]
+
+        def write():
+            client.post("/tasks/bulk/tags", json={"filter": {}, "add": [tag.id]}, headers=auth_headers)
+            client.post("/tasks/bulk/tags", json={"filter": {}, "add": [tag.id]}, headers=auth_headers)
+            client.post("/tasks/bulk/tags", json={"filter": {}, "remove": [tag.id]}, headers=auth_headers)
+
+        events = parse_events(stream_while(client, user[1].id, write, headers=auth_headers).text)
+        assert [(name, sorted(data["ids"])) for name, data in events] == [
+            ("task.updated", task_ids),
+            ("task.updated", task_ids),
+        ]
+
+    def test_only_streams_own_events(self, client, auth_headers, auth_headers_user2, user):
+        def write():
+            client.post("/tasks", json={"title": "Someone else's"}, headers=auth_headers_user2)
+
+        response = stream_while(client, user[1].id, write, headers=auth_headers)
+        assert parse_events(response.text) == []
+
+    def test_accepts_token_in_query(self, client, auth_headers, user):
+        token = auth_headers["Authorization"].split(" ", 1)[1]
+        response = stream_while(client, user[1].id, lambda: None, url=f"/events?access_token={token}")
+        assert response.status_code == 200
+        assert response.text.startswith("retry: ")
+
+    def test_requires_auth(self, client):
+        assert client.get("/events").status_code == 401
+        assert client.get("/events?access_token=bogus").status_code == 401
+
+    def test_limits_streams_per_user(self, client, auth_headers, user, monkeypatch):
+        monkeypatch.setattr(event_broker, "max_streams_per_user", 0)
+        assert client.get("/events", headers=auth_headers).status_code == 429
+
+
+class TestEventBroker:
+    def test_delivers_to_every_stream_of_the_user(self):
+        async def scenario():
+            broker = EventBroker()
+            first, second, other = broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)
+            broker.publish(1, "task.created", [7])
+            await asyncio.sleep(0)
+            assert first.queue.get_nowait() == second.queue.get_nowait()
+            assert other.queue.empty()
+
+        asyncio.run(scenario())
+
+    def test_large_id_lists_are_omitted(self):
+        async def scenario():
+            broker = EventBroker()
+            subscription = broker.subscribe(1)
+            broker.publish(1, "task.updated", range(1000))
+            await asyncio.sleep(0)
+            return subscription.queue.get_nowait()
+
+        assert b'data: {"type":"task.updated","ids":null}' in asyncio.run(scenario())
+
+    def test_full_queue_collapses_into_resync(self):
+        async def scenario():
+            broker = EventBroker(queue_size=2)
+            subscription = broker.subscribe(1)
+            for i in range(5):
+                broker.publish(1, "task.updated", [i])
+            await asyncio.sleep(0)
+            return [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+
+        assert asyncio.run(scenario()) == [RESYNC]
+
+    def test_sends_heartbeats_while_idle(self):
+        async def scenario():
+            broker = EventBroker()
+            stream = broker.subscribe(1).stream(heartbeat=0.01)
+            return [await stream.__anext__() for _ in range(3)]
+
+        retry, first, second = asyncio.run(scenario())
+        assert retry.startswith(b"retry: ")
+        assert first == second == HEARTBEAT
+
+    def test_limits_streams_per_user(self):
+        async def scenario():
+            broker = EventBroker(max_streams_per_user=1)
+            subscription = broker.subscribe(1)
+            with pytest.raises(TooManyStreams):
+                broker.subscribe(1)
+            broker.unsubscribe(subscription)
+            broker.subscribe(1)
+            assert broker.subscriber_count() == 1
+
+        asyncio.run(scenario())
@@ -0,0 +1,110 @@
+import re
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.metrics import Counter, Histogram, instrument_pool
+
+
+def sample(text_body, name, **labels):
+    """Value of one series in a /metrics body, or 0 when it is absent."""
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(name + (f"{{{wanted}}}" if wanted else "")) + r" (\S+)$"
+    match = re.search(pattern, text_body, re.MULTILINE)
+    return float(match.group(1)) if match else 0
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+class TestMetricsEndpoint:
+    def test_counts_requests_per_route_template(self, client, auth_headers):
+        task = client.post("/tasks", json={"title": "Measured"}, headers=auth_headers).json()
+        before = scrape(client)
+        client.get(f"/tasks/{task['id']}", headers=auth_headers)
+        client.get("/tasks/999999", headers=auth_headers)
+        after = scrape(client)
+
+        labels = {"method": "GET", "route": "/tasks/{task_id}"}
+        for status in ("200", "404"):
+            assert sample(after, "http_requests_total", **labels, status=status) == \
+                sample(before, "http_requests_total", **labels, status=status) + 1
+        assert sample(after, "http_request_duration_seconds_count", **labels) == \
+            sample(before, "http_request_duration_seconds_count", **labels) + 2
+
+    def test_unmatched_paths_share_one_series(self, client):
+        before = scrape(client)
+        client.get("/no-such-page")
+        client.get("/another/missing/page")
+        after = scrape(client)
+
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        assert sample(after, "http_requests_total", **labels) == sample(before, "http_requests_total", **labels) + 2
+        assert "/no-such-page" not in after
+
+    def test_reports_in_flight_requests(self, client):
+        # The scrape itself is in flight while the body is rendered.
+        assert sample(scrape(client), "http_requests_in_flight") == 1
+
+    def test_records_bcrypt_timings(self, client, user):
+        before = scrape(client)
+        client.post("/auth/login", data={"username": user[0]["email"], "password": user[0]["password"]})
+        after = scrape(client)
+
+        labels = {"operation": "verify_password"}
+        assert sample(after, "password_hash_duration_seconds_count", **labels) == \
+            sample(before, "password_hash_duration_seconds_count", **labels) + 1
+        assert sample(after, "password_hash_duration_seconds_sum", **labels) > \
+            sample(before, "password_hash_duration_seconds_sum", **labels)
+
+    def test_counts_rejected_bcrypt_calls(self, client, user, monkeypatch):
+        from app import auth
+
+        pool = auth.PasswordHashPool(max_workers=1, max_queued=0)
+        pool._pending = pool.max_pending
+        monkeypatch.setattr(auth, "password_pool", pool)
+        before = scrape(client)
+        client.post("/auth/login", data={"username": user[0]["email"], "password": user[0]["password"]})
+        after = scrape(client)
+        assert sample(after, "password_hash_rejected_total") == sample(before, "password_hash_rejected_total") + 1
+
+
+class TestPoolInstrumentation:
+    def test_counts_checkouts_and_reports_pool_state(self, client):
+        engine = instrument_pool(create_engine("sqlite://", poolclass=QueuePool), "test")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            during = scrape(client)
+        after = scrape(client)
+
+        assert sample(during, "db_pool_connections", pool="test", state="checkedout") == 1
+        assert sample(after, "db_pool_connections", pool="test", state="checkedout") == 0
+        assert sample(after, "db_pool_checkouts_total", pool="test") == 1
+        assert sample(after, "db_pool_connects_total", pool="test") == 1
+        assert sample(after, "db_pool_checkout_duration_seconds_count", pool="test") == 1
+
+
+class TestMetricTypes:
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.25, 1.0))
+        for value in (0.125, 0.25, 0.5, 3.0):
+            histogram.observe(value, ("/a",))
+
+        assert histogram.render().splitlines() == [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/a",le="0.25"} 2',
+            'latency_seconds_bucket{route="/a",le="1.0"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 3.875',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("events_total", "Events.", ("name",))
+        counter.inc(('say "hi"\\\n',))
+        assert counter.render().splitlines()[-1] == 'events_total{name="say \\"hi\\"\\\\\\n"} 1'
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.fixture
+def saturated_pool(monkeypatch):
+    from app import auth
+
+    pool = auth.PasswordHashPool(max_workers=1, max_queued=0)
+    pool._pending = pool.max_pending
+    monkeypatch.setattr(auth, "password_pool", pool)
+    return pool
+
+
+class TestPasswordHashPool:
+    def test_login_rejected_when_pool_full(self, client, user, saturated_pool):
+        response = client.post(
+            "/auth/login",
+            data={"username": user[0]["email"], "password": user[0]["password"]}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_register_rejected_when_pool_full(self, client, saturated_pool):
+        response = client.post(
+            "/auth/register",
+            json={"email": "new@example.com", "password": "password123"}
+        )
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    def test_task_endpoints_unaffected_when_pool_full(self, client, auth_headers, saturated_pool):
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == 200
+
+    def test_pool_limits_in_flight_calls(self):
+        from app.auth import PasswordHashPool
+
+        pool = PasswordHashPool(max_workers=1, max_queued=1)
+        release = threading.Event()
+
+        async def scenario():
+            first = asyncio.ensure_future(pool.run(release.wait))
+            second = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0)
+            assert pool.pending == 2
+            with pytest.raises(HTTPException) as exc_info:
+                await pool.run(release.wait)
+            assert exc_info.value.status_code == 503
+            release.set()
+            await asyncio.gather(first, second)
+            assert pool.pending == 0
+
+        asyncio.run(scenario())
+
+    def test_async_helpers_round_trip(self):
+        from app.auth import get_password_hash_async, verify_password_async
+
+        async def scenario():
+            hashed = await get_password_hash_async("secret")
+            assert await verify_password_async("secret", hashed)
+            assert not await verify_password_async("wrong", hashed)
+
+        asyncio.run(scenario())
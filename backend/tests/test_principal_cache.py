@@ -0,0 +1,84 @@
+import pytest
+
+
+def user_queries(counter):
+    return [s for s in counter.statements if "FROM users" in s]
+
+
+class TestPrincipalCache:
+    def test_repeated_requests_skip_user_lookup(self, client, auth_headers, count_queries):
+        client.get("/tasks", headers=auth_headers)
+        with count_queries() as counter:
+            response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == 200
+        assert user_queries(counter) == []
+
+    def test_cached_principal_has_no_password(self, client, auth_headers, user):
+        from app.auth import principal_cache
+
+        client.get("/auth/me", headers=auth_headers)
+        principal = principal_cache.get(user[1].id)
+        assert principal.email == user[0]["email"]
+        assert principal.password is None
+
+    def test_user_update_invalidates_cache(self, client, auth_headers, db, user):
+        client.get("/auth/me", headers=auth_headers)
+
+        db_user = user[1]
+        db_user.email = "renamed@example.com"
+        db.commit()
+
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.json()["email"] == "renamed@example.com"
+
+    def test_user_delete_invalidates_cache(self, client, auth_headers, db, user):
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+        db.delete(user[1])
+        db.commit()
+
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 401
+
+    def test_invalid_token_not_cached(self, client):
+        from app.auth import principal_cache
+
+        response = client.get("/auth/me", headers={"Authorization": "Bearer invalid"})
+        assert response.status_code == 401
+        assert len(principal_cache) == 0
+
+
+class TestTTLCache:
+    def test_entries_expire(self):
+        from app.utils.cache import TTLCache
+
+        now = [0.0]
+        cache = TTLCache(maxsize=10, ttl=5, timer=lambda: now[0])
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        now[0] = 6
+        assert cache.get("a") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_least_recently_used_evicted(self):
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_hit_and_miss_counters(self):
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+
+from app import profiling
+from app.profiling import QueryProfile, redact, server_timing
+
+# Statements per request once the principal cache is warm. Raise a budget only
+# together with the change that needs the extra query.
+QUERY_BUDGETS = [
+    ("GET", "/tasks", None, 4),
+    ("GET", "/tasks?limit=50", None, 4),
+    ("GET", "/tasks?q=milk", None, 4),
+    ("GET", "/tasks?fields=title&expand=none", None, 2),
+    ("GET", "/tasks/stats", None, 7),
+    ("GET", "/tasks/{task_id}", None, 3),
+    ("GET", "/tags", None, 2),
+    ("GET", "/tags?counts=true", None, 2),
+    ("GET", "/sync", None, 6),
+    ("POST", "/tasks", {"title": "New", "tag_ids": ["{tag_id}"]}, 5),
+    ("PATCH", "/tasks/{task_id}", {"title": "Renamed"}, 4),
+    ("PATCH", "/tasks/{task_id}/toggle", None, 4),
+    ("PATCH", "/tasks/{task_id}/move", {"after_id": None}, 4),
+    ("POST", "/tasks/bulk/toggle", {"ids": ["{task_id}"]}, 1),
+    ("POST", "/tasks/bulk/tags", {"ids": ["{task_id}"], "add": ["{tag_id}"]}, 2),
+    ("POST", "/tags", {"name": "new"}, 2),
+    ("POST", "/tags/bulk", {"tags": [{"name": "work"}, {"name": "new"}]}, 2),
+    ("PATCH", "/tags/bulk", {"tags": [{"id": "{tag_id}", "name": "renamed"}]}, 3),
+    ("DELETE", "/tasks/{task_id}", None, 1),
+    ("DELETE", "/tags/{tag_id}", None, 1),
+    ("DELETE", "/auth/me", None, 5),
+]
+
+
+def _fill(value, ids):
+    if isinstance(value, str):
+        return int(value.format(**ids)) if value.startswith("{") and value.endswith("}") else value.format(**ids)
+    if isinstance(value, list):
+        return [_fill(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, ids) for key, item in value.items()}
+    return value
+
+
+class TestQueryBudgets:
+    @pytest.mark.parametrize("method,url,body,budget", QUERY_BUDGETS)
+    def test_endpoint_within_budget(self, client, auth_headers, tag, assert_query_budget, method, url, body, budget):
+        task = client.post(
+            "/tasks", json={"title": "Buy milk", "tag_ids": [tag.id]}, headers=auth_headers
+        ).json()
+        ids = {"task_id": task["id"], "tag_id": tag.id}
+        assert_query_budget(method, _fill(url, ids), budget, json=_fill(body, ids), headers=auth_headers)
+
+
+class TestServerTiming:
+    def test_reports_queries_and_timings(self, client, auth_headers):
+        response = client.get("/tasks", headers=auth_headers)
+        db, slowest, app = response.headers["server-timing"].split(", ")
+        assert db.startswith("db;dur=") and db.endswith('queries"')
+        assert slowest.startswith("db-slowest;dur=")
+        assert app.startswith("app;dur=")
+
+    def test_requests_without_sql_report_zero(self, client):
+        response = client.get("/health")
+        assert response.headers["server-timing"].startswith('db;dur=0.00;desc="0 queries"')
+
+    def test_header_can_be_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(profiling, "SERVER_TIMING", False)
+        assert "server-timing" not in client.get("/health").headers
+
+    def test_profile_keeps_slowest_statement(self):
+        profile = QueryProfile()
+        profile.record("SELECT 1", 0.001)
+        profile.record("SELECT * FROM tasks WHERE title = 'secret'", 0.004)
+        profile.record("SELECT 2", 0.002)
+        assert profile.count == 3
+        assert profile.slowest == "SELECT * FROM tasks WHERE title = ?"
+        assert server_timing(profile, 0.01) == 'db;dur=7.00;desc="3 queries", db-slowest;dur=4.00, app;dur=10.00'
+
+
+class TestSlowQueryLog:
+    def test_logs_slowest_statement_of_slow_requests(self, client, auth_headers, monkeypatch, caplog):
+        monkeypatch.setattr(profiling, "SLOW_QUERY_MS", 0)
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            client.get("/tasks?q=secret", headers=auth_headers)
+
+        [record] = caplog.records
+        assert "GET /tasks" in record.getMessage()
+        assert "secret" not in record.getMessage()
+
+    def test_fast_requests_are_not_logged(self, client, auth_headers, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            client.get("/tasks", headers=auth_headers)
+        assert caplog.records == []
+
+
+class TestRedact:
+    def test_replaces_literals(self):
+        assert redact("SELECT * FROM tasks WHERE title = 'it''s' AND priority = 3 LIMIT 10") == \
+            "SELECT * FROM tasks WHERE title = ? AND priority = ? LIMIT ?"
+
+    def test_keeps_identifiers_with_digits(self):
+        assert redact("SELECT rank FROM tasks_fts5 WHERE x = ?") == "SELECT rank FROM tasks_fts5 WHERE x = ?"
+
+    def test_collapses_placeholder_lists(self):
+        assert redact("SELECT id FROM tasks\n  WHERE id IN (?, ?, ?, ?)") == "SELECT id FROM tasks WHERE id IN (?, ...)"
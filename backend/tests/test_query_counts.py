@@ -0,0 +1,103 @@
+import pytest
+
+
+@pytest.fixture
+def seed_tasks(db, user):
+    from app.models import Task, Tag
+
+    tags = [Tag(name=f"tag {i}", user_id=1) for i in range(3)]
+    db.add_all(tags)
+    db.commit()
+    tasks = []
+
+    def grow(size):
+        while len(tasks) < size:
+            task = Task(title=f"Task {len(tasks)}", user_id=1, position=float(len(tasks)))
+            task.tags = list(tags)
+            tasks.append(task)
+            db.add(task)
+        db.commit()
+        db.expire_all()
+        return tasks
+
+    return grow
+
+
+class TestTaskQueryCounts:
+    def test_get_tasks_constant_queries(self, client, auth_headers, seed_tasks, assert_constant_queries):
+        def request():
+            response = client.get("/tasks", headers=auth_headers)
+            assert response.status_code == 200
+            assert all(len(task["tags"]) == 3 for task in response.json())
+
+        assert_constant_queries(seed_tasks, request)
+
+    def test_get_tasks_page_constant_queries(self, client, auth_headers, seed_tasks, assert_constant_queries):
+        def request():
+            response = client.get("/tasks?limit=50", headers=auth_headers)
+            assert response.status_code == 200
+
+        assert_constant_queries(seed_tasks, request)
+
+    def test_get_tasks_tag_filter_constant_queries(
+        self, client, auth_headers, seed_tasks, assert_constant_queries
+    ):
+        def request():
+            response = client.get("/tasks?tag_id=1", headers=auth_headers)
+            assert response.status_code == 200
+
+        assert_constant_queries(seed_tasks, request)
+
+    def test_get_task_query_count(self, client, auth_headers, seed_tasks, count_queries):
+        task_id = seed_tasks(1)[0].id
+        client.get("/auth/me", headers=auth_headers)
+        with count_queries() as counter:
+            response = client.get(f"/tasks/{task_id}", headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()["tags"]) == 3
+        assert counter.count <= 3
+
+    def test_create_task_constant_queries(self, client, auth_headers, db, count_queries):
+        from app.models import Tag
+
+        tags = [Tag(name=f"tag {i}", user_id=1) for i in range(10)]
+        db.add_all(tags)
+        db.commit()
+        tag_ids = [t.id for t in tags]
+        client.get("/auth/me", headers=auth_headers)
+
+        counts = []
+        for size in (1, 10):
+            with count_queries() as counter:
+                response = client.post(
+                    "/tasks",
+                    headers=auth_headers,
+                    json={"title": "Task", "tag_ids": tag_ids[:size]},
+                )
+            assert response.status_code == 201
+            assert len(response.json()["tags"]) == size
+            counts.append(counter.count)
+        assert counts[0] == counts[1]
+
+    def test_update_and_toggle_constant_queries(self, client, auth_headers, db, count_queries):
+        from app.models import Task, Tag
+
+        tags = [Tag(name=f"tag {i}", user_id=1) for i in range(10)]
+        db.add_all(tags)
+        db.commit()
+        client.get("/auth/me", headers=auth_headers)
+
+        counts = []
+        for size in (1, 10):
+            task = Task(title="Task", user_id=1)
+            task.tags = tags[:size]
+            db.add(task)
+            db.commit()
+            task_id = task.id
+            db.expire_all()
+            with count_queries() as counter:
+                client.patch(f"/tasks/{task_id}", headers=auth_headers, json={"title": "Updated"})
+                response = client.patch(f"/tasks/{task_id}/toggle", headers=auth_headers)
+            assert len(response.json()["tags"]) == size
+            counts.append(counter.count)
+        assert counts[0] == counts[1]
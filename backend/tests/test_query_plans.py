@@ -0,0 +1,154 @@
+import re
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+
+
+FILTERS = [
+    {},
+    {"status": "completed"},
+    {"status": "pending"},
+    {"priority": 3},
+    {"tag_id": 1},
+    {"due_before": datetime(2030, 1, 1).isoformat()},
+    {"due_after": datetime(2020, 1, 1).isoformat()},
+    {"overdue": "true"},
+    {"no_due_date": "true"},
+    {"status": "pending", "priority": 2, "due_before": datetime(2030, 1, 1).isoformat()},
+]
+SORTS = ["position", "due_date", "priority", "created_at"]
+FULL_SCAN = re.compile(r"\bSCAN (TABLE )?(tasks|task_tags|tags)\b")
+
+
+def query_plans(db, executions):
+    conn = db.connection()
+    plans = []
+    for statement, parameters in executions:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+def assert_no_full_scans(db, executions):
+    for statement, plan in query_plans(db, executions):
+        scans = [line for line in plan if FULL_SCAN.search(line)]
+        assert not scans, f"full scan {scans} for:\n{statement}"
+
+
+class TestTaskQueryPlans:
+    @pytest.mark.parametrize("filters", FILTERS)
+    @pytest.mark.parametrize("paginate", [False, True])
+    def test_get_tasks_uses_indexes(self, client, auth_headers, db, count_queries, filters, paginate):
+        for sort_by in SORTS:
+            for sort_order in ("asc", "desc"):
+                params = {**filters, "sort_by": sort_by, "sort_order": sort_order}
+                if paginate:
+                    params["limit"] = 10
+                with count_queries() as counter:
+                    response = client.get("/tasks", headers=auth_headers, params=params)
+                assert response.status_code == 200
+                assert_no_full_scans(db, counter.executions)
+
+    @pytest.mark.parametrize("sort_by", SORTS)
+    def test_cursor_page_seeks_sort_index(self, client, auth_headers, db, count_queries, sort_by):
+        from app.models import Task
+
+        db.add_all([
+            Task(title="Task", user_id=1, position=float(i), priority=i % 5 + 1, due_date=datetime(2030, 1, i + 1))
+            for i in range(20)
+        ])
+        db.commit()
+        params = {"sort_by": sort_by, "limit": 5}
+        cursor = client.get("/tasks", headers=auth_headers, params=params).json()["next_cursor"]
+        with count_queries() as counter:
+            client.get("/tasks", headers=auth_headers, params={**params, "cursor": cursor})
+        seek = f"USING INDEX ix_tasks_user_id_{sort_by} (user_id=? AND {sort_by}>?)"
+        assert any(seek in line for _, plan in query_plans(db, counter.executions) for line in plan)
+
+    def test_tag_filter_uses_reverse_index(self, db):
+        plan = [
+            row[-1] for row in db.connection().exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT task_id FROM task_tags WHERE tag_id = ?", (1,)
+            )
+        ]
+        assert any("ix_task_tags_tag_id_task_id" in line for line in plan)
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_stats_use_indexes(self, client, auth_headers, db, count_queries, filters):
+        with count_queries() as counter:
+            response = client.get("/tasks/stats", headers=auth_headers, params=filters)
+        assert response.status_code == 200
+        assert_no_full_scans(db, counter.executions)
+
+    def test_overdue_uses_partial_index(self, client, auth_headers, db, count_queries):
+        from app.models import Task
+
+        # Without statistics the two (user_id, due_date) indexes cost the same
+        # and the pick depends on creation order.
+        db.add_all([
+            Task(
+                title="Task",
+                user_id=1,
+                completed=i % 2 == 0,
+                due_date=None if i % 4 == 0 else datetime(2020, 1, 1),
+            )
+            for i in range(20)
+        ])
+        db.commit()
+        db.execute(text("ANALYZE"))
+        with count_queries() as counter:
+            client.get("/tasks?overdue=true&sort_by=due_date", headers=auth_headers)
+        plans = query_plans(db, counter.executions)
+        assert any(
+            "ix_tasks_pending_due_date" in line for _, plan in plans for line in plan
+        )
+
+
+class TestApplyIndexes:
+    def test_apply_indexes_upgrades_existing_database(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from app.database import Base
+        from app.indexes import apply_indexes
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, "
+                "description VARCHAR, completed BOOLEAN, priority INTEGER, due_date DATETIME, "
+                "position FLOAT, user_id INTEGER, created_at DATETIME, updated_at DATETIME)"
+            )
+        Base.metadata.create_all(bind=engine)
+        assert "ix_tasks_user_id_position" not in {
+            ix["name"] for ix in inspect(engine).get_indexes("tasks")
+        }
+
+        created = apply_indexes(engine)
+        assert "ix_tasks_user_id_position" in created
+        assert "ix_tasks_pending_due_date" in created
+        assert apply_indexes(engine) == []
+        engine.dispose()
+
+
+class TestSyncQueryPlans:
+    def test_sync_reads_log_through_user_index(self, client, auth_headers, db, count_queries):
+        client.post("/tasks", json={"title": "Synced"}, headers=auth_headers)
+        token = client.get("/sync", headers=auth_headers).json()["token"]
+        for since in (None, token):
+            with count_queries() as counter:
+                client.get("/sync", params={"since": since} if since else {}, headers=auth_headers)
+            plans = query_plans(db, counter.executions)
+            log_reads = [plan for statement, plan in plans if "FROM sync_log" in statement]
+            assert log_reads and all(
+                any("ix_sync_log_user_id_seq" in line for line in plan) for plan in log_reads
+            )
+            assert_no_full_scans(db, counter.executions)
+
+
+class TestTagQueryPlans:
+    def test_tag_counts_use_indexes(self, client, auth_headers, tag, db, count_queries):
+        client.post("/tasks", json={"title": "Tagged", "tag_ids": [tag.id]}, headers=auth_headers)
+        with count_queries() as counter:
+            assert client.get("/tags?counts=true", headers=auth_headers).status_code == 200
+        assert_no_full_scans(db, counter.executions)
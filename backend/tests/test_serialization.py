@@ -0,0 +1,65 @@
+import pytest
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+
+from app.schemas import TagResponse, TaskPage, TaskResponse
+from app.utils import serialization
+
+TASK_LIST = TypeAdapter(List[TaskResponse])
+TAG_LIST = TypeAdapter(List[TagResponse])
+
+
+@pytest.fixture
+def tasks(db, user, tag):
+    from app.models import Tag, Task
+
+    other = Tag(name="ünïcode ✓", color="#000000", user_id=user[1].id)
+    db.add(other)
+    db.add_all([
+        Task(title="Plain", user_id=user[1].id, position=1.0),
+        Task(title="Tagged", description="line\nbreak \"quoted\"", priority=3, user_id=user[1].id,
+             position=2.5, tags=[tag, other]),
+        Task(title="Tiny", user_id=user[1].id, position=1e-7, completed=True),
+        Task(title="Huge", user_id=user[1].id, position=1e20),
+    ])
+    db.commit()
+
+
+def orm_tasks(db):
+    from app.models import Task
+
+    db.expire_all()
+    return db.query(Task).options(selectinload(Task.tags)).order_by(Task.position, Task.id).all()
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "pydantic"])
+def encoder(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+
+
+class TestFastSerialization:
+    def test_task_list_matches_response_model(self, client, auth_headers, db, tasks, encoder):
+        response = client.get("/tasks", headers=auth_headers)
+        expected = TASK_LIST.dump_json(TASK_LIST.validate_python(orm_tasks(db), from_attributes=True))
+        assert response.content == expected
+
+    def test_task_page_matches_response_model(self, client, auth_headers, db, tasks, encoder):
+        response = client.get("/tasks?limit=10", headers=auth_headers)
+        expected = TaskPage(items=orm_tasks(db), next_cursor=None).model_dump_json().encode()
+        assert response.content == expected
+
+    def test_tag_list_matches_response_model(self, client, auth_headers, db, tasks, encoder):
+        from app.models import Tag
+
+        response = client.get("/tags", headers=auth_headers)
+        db.expire_all()
+        expected = TAG_LIST.dump_json(TAG_LIST.validate_python(db.query(Tag).all(), from_attributes=True))
+        assert response.content == expected
+
+    def test_export_lines_match_response_model(self, client, auth_headers, db, tasks, encoder):
+        lines = client.get("/tasks/export", headers=auth_headers).content.splitlines()
+        assert lines == [TaskResponse.model_validate(task).model_dump_json().encode() for task in orm_tasks(db)]
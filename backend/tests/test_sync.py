@@ -0,0 +1,132 @@
+import base64
+from datetime import timedelta
+
+from app.sync import compact_tombstones, encode_token
+
+
+def sync(client, headers, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get("/sync", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def ids(items):
+    return sorted(item["id"] for item in items)
+
+
+class TestSync:
+    def test_first_sync_is_a_snapshot(self, client, auth_headers, tag):
+        task = client.post("/tasks", json={"title": "Buy milk", "tag_ids": [tag.id]}, headers=auth_headers).json()
+
+        body = sync(client, auth_headers)
+        assert body["reset"] is True
+        assert body["has_more"] is False
+        assert body["tasks"] == [task]
+        assert ids(body["tags"]) == [tag.id]
+        assert body["deleted"] == {"tasks": [], "tags": []}
+
+    def test_returns_only_changes_since_token(self, client, auth_headers):
+        first = client.post("/tasks", json={"title": "First"}, headers=auth_headers).json()
+        second = client.post("/tasks", json={"title": "Second"}, headers=auth_headers).json()
+        token = sync(client, auth_headers)["token"]
+
+        assert sync(client, auth_headers, token)["tasks"] == []
+        client.patch(f"/tasks/{second['id']}/toggle", headers=auth_headers)
+        body = sync(client, auth_headers, token)
+        assert body["reset"] is False
+        assert ids(body["tasks"]) == [second["id"]]
+        assert body["tasks"][0]["completed"] is True
+        assert first["id"] not in ids(body["tasks"])
+
+    def test_reports_deleted_tasks_and_tags(self, client, auth_headers, tag):
+        task = client.post("/tasks", json={"title": "Doomed"}, headers=auth_headers).json()
+        token = sync(client, auth_headers)["token"]
+
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+        client.delete(f"/tags/{tag.id}", headers=auth_headers)
+        body = sync(client, auth_headers, token)
+        assert body["tasks"] == [] and body["tags"] == []
+        assert body["deleted"] == {"tasks": [task["id"]], "tags": [tag.id]}
+
+    def test_snapshot_skips_tombstones(self, client, auth_headers):
+        task = client.post("/tasks", json={"title": "Gone"}, headers=auth_headers).json()
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+        assert sync(client, auth_headers)["deleted"] == {"tasks": [], "tags": []}
+
+    def test_snapshot_pages_report_later_deletes(self, client, auth_headers):
+        created = client.post(
+            "/tasks/bulk", json={"tasks": [{"title": f"Task {i}"} for i in range(3)]}, headers=auth_headers
+        ).json()
+        first, second, third = sorted(result["task"]["id"] for result in created["results"])
+
+        page = sync(client, auth_headers, limit=1)
+        assert ids(page["tasks"]) == [first] and page["has_more"] is True
+        client.delete(f"/tasks/{first}", headers=auth_headers)
+        client.patch(f"/tasks/{second}/toggle", headers=auth_headers)
+
+        body = sync(client, auth_headers, page["token"], limit=5)
+        assert ids(body["tasks"]) == [second, third]
+        assert body["deleted"] == {"tasks": [first], "tags": []}
+        assert body["has_more"] is False
+
+    def test_tag_changes_mark_their_tasks(self, client, auth_headers, tag):
+        task = client.post("/tasks", json={"title": "Tagged"}, headers=auth_headers).json()
+        token = sync(client, auth_headers)["token"]
+
+        client.post("/tasks/bulk/tags", json={"ids": [task["id"]], "add": [tag.id]}, headers=auth_headers)
+        body = sync(client, auth_headers, token)
+        assert ids(body["tasks"]) == [task["id"]]
+        assert ids(body["tasks"][0]["tags"]) == [tag.id]
+
+        client.delete(f"/tags/{tag.id}", headers=auth_headers)
+        body = sync(client, auth_headers, body["token"])
+        assert ids(body["tasks"]) == [task["id"]]
+        assert body["tasks"][0]["tags"] == []
+        assert body["deleted"]["tags"] == [tag.id]
+
+    def test_pages_through_changes(self, client, auth_headers):
+        created = client.post(
+            "/tasks/bulk", json={"tasks": [{"title": f"Task {i}"} for i in range(5)]}, headers=auth_headers
+        ).json()
+        expected = sorted(result["task"]["id"] for result in created["results"])
+
+        seen, token, has_more = [], None, True
+        while has_more:
+            body = sync(client, auth_headers, token, limit=2)
+            seen += ids(body["tasks"])
+            token, has_more = body["token"], body["has_more"]
+        assert sorted(seen) == expected
+
+        client.post("/tasks", json={"title": "Later"}, headers=auth_headers)
+        body = sync(client, auth_headers, token, limit=2)
+        assert body["reset"] is False
+        assert [task["title"] for task in body["tasks"]] == ["Later"]
+
+    def test_compaction_resets_stale_tokens(self, client, auth_headers, db):
+        kept = client.post("/tasks", json={"title": "Kept"}, headers=auth_headers).json()
+        doomed = client.post("/tasks", json={"title": "Doomed"}, headers=auth_headers).json()
+        stale = sync(client, auth_headers)["token"]
+        client.delete(f"/tasks/{doomed['id']}", headers=auth_headers)
+
+        assert compact_tombstones(db, older_than=timedelta(seconds=-5)) == 1
+        body = sync(client, auth_headers, stale)
+        assert body["reset"] is True
+        assert ids(body["tasks"]) == [kept["id"]]
+
+        fresh = body["token"]
+        assert sync(client, auth_headers, fresh)["reset"] is False
+
+    def test_only_syncs_own_rows(self, client, auth_headers, auth_headers_user2):
+        client.post("/tasks", json={"title": "Someone else's"}, headers=auth_headers_user2)
+        assert sync(client, auth_headers)["tasks"] == []
+
+    def test_rejects_invalid_tokens(self, client, auth_headers):
+        assert client.get("/sync?since=not-a-token", headers=auth_headers).status_code == 400
+        assert client.get(f"/sync?since={encode_token(0)[:-1]}", headers=auth_headers).status_code == 400
+        overflow = base64.urlsafe_b64encode(b'{"q":1e400}').decode().rstrip("=")
+        assert client.get(f"/sync?since={overflow}", headers=auth_headers).status_code == 400
+
+    def test_requires_auth(self, client):
+        assert client.get("/sync").status_code == 401
@@ -98,3 +98,140 @@ class TestTagDelete:
 
         response = client.delete(f"/tags/{tag.id}", headers=auth_headers_user2)
         assert response.status_code == 404
+
+
+class TestTagCounts:
+    def test_counts_total_and_pending_tasks(self, client, auth_headers, tag):
+        other = client.post("/tags", json={"name": "unused"}, headers=auth_headers).json()
+        for title in ("A", "B", "C"):
+            client.post("/tasks", json={"title": title, "tag_ids": [tag.id]}, headers=auth_headers)
+        done = client.post("/tasks", json={"title": "D", "tag_ids": [tag.id]}, headers=auth_headers).json()
+        client.patch(f"/tasks/{done['id']}/toggle", headers=auth_headers)
+
+        response = client.get("/tags?counts=true", headers=auth_headers)
+        assert response.status_code == 200
+        counts = {t["id"]: (t["task_count"], t["pending_count"]) for t in response.json()}
+        assert counts == {tag.id: (4, 3), other["id"]: (0, 0)}
+
+    def test_counts_are_opt_in(self, client, auth_headers, tag):
+        assert "task_count" not in client.get("/tags", headers=auth_headers).json()[0]
+
+    def test_counts_change_the_etag(self, client, auth_headers, tag):
+        first = client.get("/tags?counts=true", headers=auth_headers)
+        client.post("/tasks", json={"title": "A", "tag_ids": [tag.id]}, headers=auth_headers)
+        response = client.get(
+            "/tags?counts=true", headers={**auth_headers, "If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 200
+        assert response.json()[0]["task_count"] == 1
+
+
+class TestTagUniqueness:
+    def test_duplicate_name_is_a_conflict(self, client, auth_headers, tag):
+        response = client.post("/tags", json={"name": tag.name}, headers=auth_headers)
+        assert response.status_code == 409
+
+    def test_other_users_may_reuse_names(self, client, auth_headers_user2, tag):
+        assert client.post("/tags", json={"name": tag.name}, headers=auth_headers_user2).status_code == 201
+
+
+class TestBulkTagCreate:
+    def test_gets_or_creates_by_name(self, client, auth_headers, tag):
+        response = client.post("/tags/bulk", json={"tags": [
+            {"name": "home", "color": "#00ff00"},
+            {"name": tag.name, "color": "#000000"},
+            {"name": "home"},
+        ]}, headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["created"] == 1
+        assert [(t["name"], t["color"]) for t in body["tags"]] == [("home", "#00ff00"), ("work", "#ff0000")]
+        assert body["tags"][1]["id"] == tag.id
+
+        again = client.post("/tags/bulk", json={"tags": [{"name": "home"}]}, headers=auth_headers).json()
+        assert again["created"] == 0
+        assert again["tags"][0]["id"] == body["tags"][0]["id"]
+
+    def test_rejects_empty_and_oversized_batches(self, client, auth_headers):
+        assert client.post("/tags/bulk", json={"tags": []}, headers=auth_headers).status_code == 422
+        tags = [{"name": f"t{i}"} for i in range(1001)]
+        assert client.post("/tags/bulk", json={"tags": tags}, headers=auth_headers).status_code == 422
+
+
+class TestBulkTagRename:
+    def create(self, client, headers, *names):
+        response = client.post("/tags/bulk", json={"tags": [{"name": name} for name in names]}, headers=headers)
+        return [t["id"] for t in response.json()["tags"]]
+
+    def test_renames_and_recolours(self, client, auth_headers):
+        first, second = self.create(client, auth_headers, "a", "b")
+        task = client.post("/tasks", json={"title": "T", "tag_ids": [first]}, headers=auth_headers).json()
+        client.get("/tasks", headers=auth_headers)  # cache the list with the old name
+
+        response = client.patch("/tags/bulk", json={"tags": [
+            {"id": second, "name": "bee"},
+            {"id": first, "name": "ay", "color": "#123456"},
+        ]}, headers=auth_headers)
+        assert response.status_code == 200
+        assert [(t["id"], t["name"], t["color"]) for t in response.json()] == [
+            (second, "bee", "#6b7280"), (first, "ay", "#123456"),
+        ]
+        listed = client.get("/tasks", headers=auth_headers).json()
+        assert [g["name"] for t in listed if t["id"] == task["id"] for g in t["tags"]] == ["ay"]
+
+    def test_swaps_names(self, client, auth_headers):
+        first, second = self.create(client, auth_headers, "a", "b")
+        response = client.patch("/tags/bulk", json={"tags": [
+            {"id": first, "name": "b"}, {"id": second, "name": "a"},
+        ]}, headers=auth_headers)
+        assert response.status_code == 200
+        names = {t["id"]: t["name"] for t in client.get("/tags", headers=auth_headers).json()}
+        assert names == {first: "b", second: "a"}
+
+    def test_name_of_another_tag_is_a_conflict(self, client, auth_headers):
+        first, _ = self.create(client, auth_headers, "a", "b")
+        response = client.patch("/tags/bulk", json={"tags": [{"id": first, "name": "b"}]}, headers=auth_headers)
+        assert response.status_code == 409
+        assert "b" in response.json()["detail"]
+
+    def test_unknown_or_foreign_tags_are_not_found(self, client, auth_headers, auth_headers_user2):
+        [mine] = self.create(client, auth_headers, "a")
+        response = client.patch("/tags/bulk", json={"tags": [{"id": mine, "name": "x"}]}, headers=auth_headers_user2)
+        assert response.status_code == 404
+        assert client.get("/tags", headers=auth_headers).json()[0]["name"] == "a"
+
+    def test_rejects_repeated_ids_or_names(self, client, auth_headers):
+        first, second = self.create(client, auth_headers, "a", "b")
+        for tags in (
+            [{"id": first, "name": "x"}, {"id": first, "name": "y"}],
+            [{"id": first, "name": "x"}, {"id": second, "name": "x"}],
+        ):
+            assert client.patch("/tags/bulk", json={"tags": tags}, headers=auth_headers).status_code == 422
+
+
+class TestUniqueTagNamesUpgrade:
+    def test_merges_duplicates_before_creating_the_index(self, tmp_path):
+        from sqlalchemy import create_engine, inspect
+        from app.database import Base
+        from app.indexes import apply_indexes
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX uq_tags_user_id_name")
+            conn.exec_driver_sql("CREATE INDEX ix_tags_user_id_name ON tags (user_id, name)")
+            conn.exec_driver_sql("INSERT INTO users (id, email, password) VALUES (1, 'a@example.com', 'x')")
+            conn.exec_driver_sql("INSERT INTO tags (id, name, user_id) VALUES (1, 'dup', 1), (2, 'dup', 1), (3, 'solo', 1)")
+            conn.exec_driver_sql("INSERT INTO tasks (id, title, user_id) VALUES (1, 'a', 1), (2, 'b', 1)")
+            conn.exec_driver_sql("INSERT INTO task_tags VALUES (1, 1), (1, 2), (2, 2)")
+
+        assert "uq_tags_user_id_name" in apply_indexes(engine)
+        indexes = {ix["name"]: ix for ix in inspect(engine).get_indexes("tags")}
+        assert indexes["uq_tags_user_id_name"]["unique"]
+        assert "ix_tags_user_id_name" not in indexes
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT id FROM tags ORDER BY id").scalars().all() == [1, 3]
+            assert conn.exec_driver_sql(
+                "SELECT task_id, tag_id FROM task_tags ORDER BY task_id"
+            ).all() == [(1, 1), (2, 1)]
+        engine.dispose()
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def tasks(client, auth_headers, tag):
+    client.post("/tasks", json={"title": "First", "priority": 2, "tag_ids": [tag.id]}, headers=auth_headers)
+    client.post("/tasks", json={"title": "Second", "description": "with, comma"}, headers=auth_headers)
+    client.post("/tasks", json={"title": "Third", "priority": 2}, headers=auth_headers)
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestTaskExport:
+    def test_ndjson_matches_task_list(self, client, auth_headers, tasks):
+        response = client.get("/tasks/export", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        assert ndjson(response) == client.get("/tasks", headers=auth_headers).json()
+
+    def test_csv(self, client, auth_headers, tasks):
+        response = client.get("/tasks/export?format=csv", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["title"] for row in rows] == ["First", "Second", "Third"]
+        assert rows[0]["tags"] == "work"
+        assert rows[1]["description"] == "with, comma"
+        assert rows[1]["priority"] == ""
+
+    def test_csv_without_tasks_has_header(self, client, auth_headers):
+        response = client.get("/tasks/export?format=csv", headers=auth_headers)
+        assert response.text.strip().split(",")[:2] == ["id", "title"]
+
+    def test_unknown_format_rejected(self, client, auth_headers):
+        response = client.get("/tasks/export?format=xml", headers=auth_headers)
+        assert response.status_code == 422
+
+    def test_accepts_task_filters_and_sort(self, client, auth_headers, tasks):
+        response = client.get(
+            "/tasks/export?priority=2&sort_by=created_at&sort_order=desc", headers=auth_headers
+        )
+        assert [task["title"] for task in ndjson(response)] == ["Third", "First"]
+
+    def test_scoped_to_current_user(self, client, auth_headers_user2, tasks):
+        response = client.get("/tasks/export", headers=auth_headers_user2)
+        assert response.text == ""
+
+    def test_requires_auth(self, client):
+        assert client.get("/tasks/export").status_code == 401
+
+    def test_reads_in_batches(self, client, auth_headers, tag, count_queries, monkeypatch):
+        from app.utils import export
+
+        monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+        tag_id = tag.id
+        client.post(
+            "/tasks/bulk",
+            json={"tasks": [{"title": f"Task {i}", "tag_ids": [tag_id]} for i in range(5)]},
+            headers=auth_headers,
+        )
+        client.get("/auth/me", headers=auth_headers)
+
+        with count_queries() as counter:
+            response = client.get("/tasks/export", headers=auth_headers)
+
+        exported = ndjson(response)
+        assert len(exported) == 5
+        assert all(task["tags"][0]["id"] == tag_id for task in exported)
+        tag_lookups = [s for s in counter.statements if "FROM task_tags" in s]
+        assert len(tag_lookups) == 3
@@ -0,0 +1,73 @@
+import pytest
+
+
+@pytest.fixture
+def task_id(client, auth_headers, tag):
+    response = client.post(
+        "/tasks",
+        json={"title": "Groceries", "description": "milk", "priority": 2, "tag_ids": [tag.id]},
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
+class TestSparseFieldsets:
+    def test_fields_select_only_requested_columns(self, client, auth_headers, task_id, count_queries):
+        client.get("/auth/me", headers=auth_headers)
+        with count_queries() as counter:
+            response = client.get(
+                "/tasks?fields=title,completed,priority,due_date&expand=none", headers=auth_headers
+            )
+        assert response.json() == [
+            {"title": "Groceries", "priority": 2, "due_date": None, "id": task_id, "completed": False}
+        ]
+        task_selects = [s for s in counter.statements if "FROM tasks" in s and "user_versions" not in s]
+        assert len(task_selects) == 1
+        assert "tasks.description" not in task_selects[0]
+        assert not any("task_tags" in s for s in counter.statements)
+
+    def test_expand_tag_ids(self, client, auth_headers, task_id, tag, count_queries):
+        tag_id = tag.id
+        with count_queries() as counter:
+            response = client.get("/tasks?fields=title&expand=tag_ids", headers=auth_headers)
+        assert response.json() == [{"title": "Groceries", "id": task_id, "tag_ids": [tag_id]}]
+        assert not any("FROM tags" in s for s in counter.statements)
+
+    def test_default_expands_tag_objects(self, client, auth_headers, task_id):
+        task = client.get("/tasks?fields=title", headers=auth_headers).json()[0]
+        assert list(task) == ["title", "id", "tags"]
+        assert task["tags"][0]["name"] == "work"
+
+    def test_unknown_field_rejected(self, client, auth_headers):
+        response = client.get("/tasks?fields=title,secret", headers=auth_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown fields: secret"
+
+    def test_unknown_expand_rejected(self, client, auth_headers):
+        assert client.get("/tasks?expand=everything", headers=auth_headers).status_code == 422
+
+    def test_pagination_with_projection(self, client, auth_headers, task_id):
+        client.post("/tasks", json={"title": "Second"}, headers=auth_headers)
+        first = client.get("/tasks?fields=title&expand=none&limit=1&sort_by=priority", headers=auth_headers).json()
+        assert first["items"] == [{"title": "Second", "id": first["items"][0]["id"]}]
+        second = client.get(
+            f"/tasks?fields=title&expand=none&limit=1&sort_by=priority&cursor={first['next_cursor']}",
+            headers=auth_headers,
+        ).json()
+        assert second == {"items": [{"title": "Groceries", "id": task_id}], "next_cursor": None}
+
+    def test_projection_is_part_of_cache_key(self, client, auth_headers, task_id):
+        full = client.get("/tasks", headers=auth_headers).json()
+        sparse = client.get("/tasks?fields=title&expand=none", headers=auth_headers).json()
+        assert "description" in full[0]
+        assert sparse == [{"title": "Groceries", "id": task_id}]
+
+    def test_get_task_projection(self, client, auth_headers, task_id, tag):
+        tag_id = tag.id
+        response = client.get(f"/tasks/{task_id}?fields=completed&expand=tag_ids", headers=auth_headers)
+        assert response.json() == {"id": task_id, "completed": False, "tag_ids": [tag_id]}
+        assert "etag" in response.headers
+
+    def test_get_task_other_user_not_found(self, client, auth_headers_user2, task_id):
+        response = client.get(f"/tasks/{task_id}?fields=title", headers=auth_headers_user2)
+        assert response.status_code == 404
@@ -0,0 +1,142 @@
+import json
+
+
+def upload(client, headers, content, filename="tasks.ndjson", **params):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return client.post(
+        "/tasks/import", headers=headers, params=params, files={"file": (filename, content)}
+    )
+
+
+def ndjson(*records):
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+class TestTaskImport:
+    def test_imports_ndjson_in_file_order(self, client, auth_headers):
+        response = upload(client, auth_headers, ndjson(
+            {"title": "One", "priority": 2},
+            {"title": "Two", "description": "details", "completed": True},
+        ))
+        assert response.status_code == 200
+        assert response.json() == {"imported": 2, "failed": 0, "tags_created": 0, "errors": []}
+
+        tasks = client.get("/tasks", headers=auth_headers).json()
+        assert [(t["title"], t["priority"], t["completed"]) for t in tasks] == [
+            ("One", 2, False),
+            ("Two", None, True),
+        ]
+
+    def test_imports_csv(self, client, auth_headers):
+        content = "title,description,priority,tags\nOne,,3,home;errands\nTwo,\"a, b\",,\n"
+        response = upload(client, auth_headers, content, filename="tasks.csv")
+        assert response.json()["imported"] == 2
+
+        tasks = client.get("/tasks", headers=auth_headers).json()
+        assert tasks[0]["priority"] == 3
+        assert sorted(tag["name"] for tag in tasks[0]["tags"]) == ["errands", "home"]
+        assert tasks[1]["description"] == "a, b"
+
+    def test_format_parameter_overrides_file_name(self, client, auth_headers):
+        response = upload(client, auth_headers, "title\nOne\n", filename="upload.txt", format="csv")
+        assert response.json()["imported"] == 1
+
+    def test_reports_invalid_rows_and_keeps_valid_ones(self, client, auth_headers):
+        content = ndjson({"title": "Good"}, {"priority": 9}) + "{not json\n[1]\n"
+        response = upload(client, auth_headers, content)
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["failed"] == 3
+        assert [error["line"] for error in data["errors"]] == [2, 3, 4]
+        assert "title" in data["errors"][0]["error"]
+        assert data["errors"][1]["error"] == "invalid JSON"
+
+    def test_error_list_is_capped(self, client, auth_headers, monkeypatch):
+        from app.routers import tasks
+
+        monkeypatch.setattr(tasks, "MAX_IMPORT_ERRORS", 2)
+        response = upload(client, auth_headers, ndjson(*({} for _ in range(5))))
+        data = response.json()
+        assert data["failed"] == 5
+        assert len(data["errors"]) == 2
+
+    def test_invalid_utf8_stops_import(self, client, auth_headers):
+        response = upload(client, auth_headers, b'{"title": "ok"}\n\xff\xfe\n')
+        data = response.json()
+        assert data["failed"] == 1
+        assert data["errors"][0]["error"] == "file is not valid UTF-8"
+
+    def test_resolves_existing_tags_and_creates_missing_once(self, client, auth_headers, tag):
+        response = upload(client, auth_headers, ndjson(
+            {"title": "One", "tags": ["work", "new"]},
+            {"title": "Two", "tags": "new"},
+            {"title": "Three", "tags": [{"name": "work"}]},
+        ))
+        assert response.json()["tags_created"] == 1
+
+        tags = client.get("/tags", headers=auth_headers).json()
+        assert sorted(t["name"] for t in tags) == ["new", "work"]
+        tasks = client.get("/tasks", headers=auth_headers).json()
+        assert [[t["name"] for t in task["tags"]] for task in tasks] == [
+            ["work", "new"], ["new"], ["work"]
+        ]
+
+    def test_inserts_in_chunks(self, client, auth_headers, count_queries, monkeypatch):
+        from app.routers import tasks
+
+        monkeypatch.setattr(tasks, "IMPORT_CHUNK_SIZE", 2)
+        client.get("/auth/me", headers=auth_headers)
+        with count_queries() as counter:
+            response = upload(client, auth_headers, ndjson(*({"title": f"T{i}", "tags": ["x"]} for i in range(5))))
+        assert response.json()["imported"] == 5
+        assert response.json()["tags_created"] == 1
+        inserts = [s for s in counter.statements if s.startswith("INSERT INTO tasks")]
+        tag_lookups = [
+            s for s in counter.statements if s.startswith(("INSERT OR IGNORE INTO tags", "SELECT tags.name"))
+        ]
+        assert len(inserts) == 3
+        assert len(tag_lookups) == 1
+
+    def test_round_trips_export(self, client, auth_headers, auth_headers_user2, tag):
+        client.post("/tasks", json={"title": "Kept", "priority": 4, "tag_ids": [tag.id]}, headers=auth_headers)
+        for format in ("ndjson", "csv"):
+            exported = client.get(f"/tasks/export?format={format}", headers=auth_headers).content
+            response = upload(client, auth_headers_user2, exported, filename=f"backup.{format}")
+            assert response.json()["imported"] == 1
+
+        imported = client.get("/tasks", headers=auth_headers_user2).json()
+        assert [(t["title"], t["priority"], [g["name"] for g in t["tags"]]) for t in imported] == [
+            ("Kept", 4, ["work"]),
+            ("Kept", 4, ["work"]),
+        ]
+
+    def test_round_trip_keeps_order(self, client, auth_headers, auth_headers_user2):
+        for title in ("Second", "First", "Third"):
+            client.post("/tasks", json={"title": title}, headers=auth_headers)
+        ids = [t["id"] for t in client.get("/tasks?sort_by=created_at", headers=auth_headers).json()]
+        client.put("/tasks/reorder", headers=auth_headers, json={"tasks": [
+            {"id": task_id, "position": position} for task_id, position in zip(ids, (2.0, 1.0, 3.5))
+        ]})
+        client.post("/tasks", json={"title": "Existing"}, headers=auth_headers_user2)
+        client.put("/tasks/reorder", headers=auth_headers_user2, json={"tasks": [
+            {"id": client.get("/tasks", headers=auth_headers_user2).json()[0]["id"], "position": 10.0}
+        ]})
+
+        exported = client.get("/tasks/export", headers=auth_headers).content
+        upload(client, auth_headers_user2, exported + ndjson({"title": "Appended"}).encode())
+
+        tasks = client.get("/tasks", headers=auth_headers_user2).json()
+        assert [(t["title"], t["position"]) for t in tasks] == [
+            ("First", 1.0), ("Second", 2.0), ("Third", 3.5), ("Existing", 10.0), ("Appended", 11.0),
+        ]
+
+    def test_rows_without_position_append_after_existing_tasks(self, client, auth_headers):
+        client.post("/tasks", json={"title": "Existing"}, headers=auth_headers)
+        upload(client, auth_headers, ndjson({"title": "One"}, {"title": "Two"}))
+        titles = [t["title"] for t in client.get("/tasks", headers=auth_headers).json()]
+        assert titles == ["Existing", "One", "Two"]
+
+    def test_requires_auth(self, client):
+        response = client.post("/tasks/import", files={"file": ("t.ndjson", b"{}")})
+        assert response.status_code == 401
@@ -0,0 +1,167 @@
+import pytest
+
+
+def task_selects(counter):
+    return [s for s in counter.statements if "FROM tasks" in s]
+
+
+class TestTaskListCache:
+    def test_repeated_query_served_from_cache(self, client, auth_headers, db, count_queries):
+        from app.models import Task
+
+        db.add(Task(title="Task", user_id=1))
+        db.commit()
+        first = client.get("/tasks?status=pending", headers=auth_headers)
+
+        with count_queries() as counter:
+            second = client.get("/tasks?status=pending", headers=auth_headers)
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert task_selects(counter) == []
+
+    def test_cached_body_matches_schema(self, client, auth_headers, db, tag):
+        from app.models import Task
+
+        task = Task(title="Task", user_id=1, priority=2)
+        task.tags.append(tag)
+        db.add(task)
+        db.commit()
+        client.get("/tasks", headers=auth_headers)
+        data = client.get("/tasks", headers=auth_headers).json()
+        assert data[0]["title"] == "Task"
+        assert data[0]["tags"][0]["name"] == "work"
+
+    @pytest.mark.parametrize("write", [
+        lambda c, h, t: c.post("/tasks", headers=h, json={"title": "New"}),
+        lambda c, h, t: c.patch(f"/tasks/{t}", headers=h, json={"title": "New"}),
+        lambda c, h, t: c.patch(f"/tasks/{t}/toggle", headers=h),
+        lambda c, h, t: c.delete(f"/tasks/{t}", headers=h),
+        lambda c, h, t: c.put("/tasks/reorder", headers=h, json={"tasks": [{"id": t, "position": 5.0}]}),
+        lambda c, h, t: c.post("/tasks/bulk/toggle", headers=h, json={"ids": [t]}),
+    ], ids=["create", "update", "toggle", "delete", "reorder", "bulk"])
+    def test_writes_invalidate(self, client, auth_headers, db, write):
+        from app.changes import task_list_cache
+        from app.models import Task
+
+        task = Task(title="Task", user_id=1)
+        db.add(task)
+        db.commit()
+        task_id = task.id
+        before = client.get("/tasks", headers=auth_headers).json()
+        assert len(task_list_cache) == 1
+
+        write(client, auth_headers, task_id)
+        assert len(task_list_cache) == 0
+        assert client.get("/tasks", headers=auth_headers).json() != before
+
+    def test_tag_delete_invalidates(self, client, auth_headers, db, tag):
+        from app.changes import task_list_cache
+        from app.models import Task
+
+        task = Task(title="Task", user_id=1)
+        task.tags.append(tag)
+        db.add(task)
+        db.commit()
+        client.get("/tasks", headers=auth_headers)
+
+        client.delete(f"/tags/{tag.id}", headers=auth_headers)
+        assert len(task_list_cache) == 0
+        assert client.get("/tasks", headers=auth_headers).json()[0]["tags"] == []
+
+    def test_invalidation_is_per_user(self, client, auth_headers, auth_headers_user2):
+        from app.changes import task_list_cache
+
+        client.get("/tasks", headers=auth_headers)
+        client.get("/tasks", headers=auth_headers_user2)
+        assert len(task_list_cache) == 2
+
+        client.post("/tasks", headers=auth_headers_user2, json={"title": "Theirs"})
+        assert len(task_list_cache) == 1
+
+    def test_overdue_not_cached(self, client, auth_headers):
+        from app.changes import task_list_cache
+
+        client.get("/tasks?overdue=true", headers=auth_headers)
+        assert len(task_list_cache) == 0
+
+    def test_pages_cached_by_cursor(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([Task(title=f"Task {i}", user_id=1, position=float(i)) for i in range(3)])
+        db.commit()
+        first = client.get("/tasks?limit=2", headers=auth_headers).json()
+        second = client.get(
+            "/tasks", headers=auth_headers, params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert [t["title"] for t in second["items"]] == ["Task 2"]
+        assert client.get("/tasks?limit=2", headers=auth_headers).json() == first
+
+    def test_stats_endpoint(self, client, auth_headers):
+        before = client.get("/health/cache").json()["task_lists"]
+        client.get("/tasks", headers=auth_headers)
+        client.get("/tasks", headers=auth_headers)
+        stats = client.get("/health/cache").json()["task_lists"]
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 1
+        assert set(stats) >= {"size", "maxsize", "evictions", "invalidations"}
+
+
+class TestUserResponseCache:
+    def test_invalidate_user_only_drops_that_user(self):
+        from app.utils.cache import UserResponseCache
+
+        cache = UserResponseCache(maxsize=10, ttl=60)
+        cache.set((1, "a"), b"1")
+        cache.set((1, "b"), b"2")
+        cache.set((2, "a"), b"3")
+        cache.invalidate_user(1)
+        assert cache.get((1, "a")) is None
+        assert cache.get((2, "a")) == b"3"
+        assert cache.stats()["invalidations"] == 2
+
+    def test_evicted_keys_leave_user_index(self):
+        from app.utils.cache import UserResponseCache
+
+        cache = UserResponseCache(maxsize=1, ttl=60)
+        cache.set((1, "a"), b"1")
+        cache.set((2, "a"), b"2")
+        assert cache._keys_by_user == {2: {(2, "a")}}
+        cache.invalidate_user(1)
+        assert cache.get((2, "a")) == b"2"
+
+    def test_total_bytes_are_bounded(self):
+        from app.utils.cache import UserResponseCache
+
+        cache = UserResponseCache(maxsize=10, ttl=60, max_bytes=10)
+        cache.set((1, "a"), b"12345")
+        cache.set((1, "b"), b"12345")
+        cache.set((2, "a"), b"123")
+        assert cache.get((1, "a")) is None
+        assert cache.get((2, "a")) == b"123"
+        assert cache.bytes == 8
+        cache.set((1, "b"), b"1")
+        assert cache.bytes == 4
+        cache.invalidate_user(2)
+        assert cache.bytes == 1
+
+    def test_oversized_values_are_not_stored(self):
+        from app.utils.cache import UserResponseCache
+
+        cache = UserResponseCache(maxsize=10, ttl=60, max_entry_bytes=4)
+        cache.set((1, "a"), b"1234")
+        cache.set((1, "a"), b"12345")
+        assert cache.get((1, "a")) is None
+        assert cache.bytes == 0
+        assert cache.stats()["oversized"] == 1
+
+    def test_large_task_lists_are_served_uncached(self, client, auth_headers, monkeypatch):
+        from app.changes import task_list_cache
+
+        monkeypatch.setattr(task_list_cache, "max_entry_bytes", 10)
+        client.post("/tasks", headers=auth_headers, json={"title": "Task"})
+        before = len(task_list_cache)
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()[0]["title"] == "Task"
+        assert len(task_list_cache) == before
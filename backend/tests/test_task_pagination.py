@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta
+
+
+def collect_pages(client, auth_headers, params):
+    titles = []
+    cursor = None
+    while True:
+        query = dict(params)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/tasks", headers=auth_headers, params=query)
+        assert response.status_code == 200
+        data = response.json()
+        titles.extend(task["title"] for task in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return titles
+
+
+class TestTaskPagination:
+    def test_without_limit_returns_plain_list(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add(Task(title="Task", user_id=1))
+        db.commit()
+
+        response = client.get("/tasks", headers=auth_headers)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    def test_limit_returns_page(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([Task(title=f"Task {i}", user_id=1, position=float(i)) for i in range(5)])
+        db.commit()
+
+        response = client.get("/tasks?limit=2", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["title"] for t in data["items"]] == ["Task 0", "Task 1"]
+        assert data["next_cursor"] is not None
+
+    def test_last_page_has_no_cursor(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([Task(title=f"Task {i}", user_id=1, position=float(i)) for i in range(2)])
+        db.commit()
+
+        response = client.get("/tasks?limit=2", headers=auth_headers)
+        assert response.json()["next_cursor"] is None
+
+    def test_pages_cover_all_tasks_with_ties(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([Task(title=f"Task {i}", user_id=1, position=float(i // 3)) for i in range(10)])
+        db.commit()
+
+        titles = collect_pages(client, auth_headers, {"limit": 3})
+        assert titles == [f"Task {i}" for i in range(10)]
+
+    @pytest.mark.parametrize("sort_by", ["position", "due_date", "priority", "created_at"])
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    def test_pages_match_unpaginated_order(self, client, auth_headers, db, sort_by, sort_order):
+        from app.models import Task
+
+        now = datetime.now()
+        tasks = []
+        for i in range(12):
+            tasks.append(Task(
+                title=f"Task {i}",
+                user_id=1,
+                position=float(i % 4),
+                priority=None if i % 5 == 0 else i % 3 + 1,
+                due_date=None if i % 4 == 0 else now + timedelta(days=i % 3),
+            ))
+        db.add_all(tasks)
+        db.commit()
+
+        params = {"sort_by": sort_by, "sort_order": sort_order}
+        expected = [t["title"] for t in client.get("/tasks", headers=auth_headers, params=params).json()]
+        titles = collect_pages(client, auth_headers, {**params, "limit": 5})
+        assert titles == expected
+
+    def test_pagination_with_filters(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([
+            Task(title=f"Task {i}", user_id=1, completed=i % 2 == 0, position=float(i))
+            for i in range(9)
+        ])
+        db.commit()
+
+        titles = collect_pages(client, auth_headers, {"status": "pending", "limit": 2})
+        assert titles == ["Task 1", "Task 3", "Task 5", "Task 7"]
+
+    def test_pagination_excludes_other_users(self, client, auth_headers, db, user2):
+        from app.models import Task
+
+        db.add_all([Task(title="Mine", user_id=1), Task(title="Theirs", user_id=2)])
+        db.commit()
+
+        titles = collect_pages(client, auth_headers, {"limit": 1})
+        assert titles == ["Mine"]
+
+    def test_invalid_cursor(self, client, auth_headers):
+        response = client.get("/tasks?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("payload", [
+        '{"s":"position","d":false,"v":{"a":1},"i":1}',
+        '{"s":"position","d":false,"v":[1],"i":1}',
+        '{"s":"position","d":false,"v":true,"i":1}',
+        '{"s":"position","d":false,"v":1,"i":1e400}',
+        '[1]',
+    ])
+    def test_malformed_cursor_payload(self, client, auth_headers, payload):
+        import base64
+
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        response = client.get("/tasks", headers=auth_headers, params={"cursor": cursor, "limit": 10})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_cursor_for_different_sort_rejected(self, client, auth_headers, db):
+        from app.models import Task
+
+        db.add_all([Task(title=f"Task {i}", user_id=1) for i in range(3)])
+        db.commit()
+
+        cursor = client.get("/tasks?limit=1", headers=auth_headers).json()["next_cursor"]
+        response = client.get(
+            "/tasks", headers=auth_headers, params={"cursor": cursor, "sort_by": "priority"}
+        )
+        assert response.status_code == 400
+
+    def test_limit_too_large(self, client, auth_headers):
+        response = client.get("/tasks?limit=10000", headers=auth_headers)
+        assert response.status_code == 422
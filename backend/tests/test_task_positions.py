@@ -0,0 +1,130 @@
+import pytest
+
+
+@pytest.fixture
+def ordered_tasks(db, user):
+    from app.models import Task
+
+    tasks = [Task(title=f"Task {i}", user_id=1, position=float(i + 1)) for i in range(4)]
+    db.add_all(tasks)
+    db.commit()
+    return [t.id for t in tasks]
+
+
+def titles(client, auth_headers):
+    return [t["title"] for t in client.get("/tasks", headers=auth_headers).json()]
+
+
+class TestReorder:
+    def test_reorder_is_single_update(self, client, auth_headers, ordered_tasks, count_queries):
+        client.get("/auth/me", headers=auth_headers)
+        with count_queries() as counter:
+            response = client.put(
+                "/tasks/reorder",
+                headers=auth_headers,
+                json={"tasks": [{"id": i, "position": float(10 - n)} for n, i in enumerate(ordered_tasks)]}
+            )
+        assert response.status_code == 204
+        assert [s for s in counter.statements if s.startswith("UPDATE")] == [counter.statements[0]]
+        assert counter.count == 1
+        assert titles(client, auth_headers) == ["Task 3", "Task 2", "Task 1", "Task 0"]
+
+    def test_large_reorder_stays_within_parameter_limit(self, client, auth_headers, ordered_tasks, count_queries):
+        from app.utils.positions import REORDER_CHUNK_SIZE, SQLITE_MAX_VARIABLES
+
+        client.get("/auth/me", headers=auth_headers)
+        moves = [{"id": i, "position": float(-i)} for i in range(1, 2 * REORDER_CHUNK_SIZE + 2)]
+        with count_queries() as counter:
+            response = client.put("/tasks/reorder", headers=auth_headers, json={"tasks": moves})
+        assert response.status_code == 204
+        updates = [parameters for statement, parameters in counter.executions if statement.startswith("UPDATE")]
+        assert len(updates) == 3
+        assert max(len(parameters) for parameters in updates) <= SQLITE_MAX_VARIABLES
+        assert titles(client, auth_headers) == ["Task 3", "Task 2", "Task 1", "Task 0"]
+
+    def test_reorder_ignores_other_users_tasks(self, client, auth_headers_user2, ordered_tasks, db):
+        from app.models import Task
+
+        response = client.put(
+            "/tasks/reorder",
+            headers=auth_headers_user2,
+            json={"tasks": [{"id": ordered_tasks[0], "position": 99.0}]}
+        )
+        assert response.status_code == 204
+        assert db.get(Task, ordered_tasks[0]).position == 1.0
+
+
+class TestMoveTask:
+    def test_move_between_neighbours(self, client, auth_headers, ordered_tasks):
+        first, second, third, fourth = ordered_tasks
+        response = client.patch(
+            f"/tasks/{fourth}/move",
+            headers=auth_headers,
+            json={"after_id": first, "before_id": second}
+        )
+        assert response.status_code == 200
+        assert response.json()["position"] == 1.5
+        assert titles(client, auth_headers) == ["Task 0", "Task 3", "Task 1", "Task 2"]
+
+    def test_move_to_top_and_bottom(self, client, auth_headers, ordered_tasks):
+        first, second, third, fourth = ordered_tasks
+        client.patch(f"/tasks/{third}/move", headers=auth_headers, json={"before_id": first})
+        client.patch(f"/tasks/{first}/move", headers=auth_headers, json={"after_id": fourth})
+        assert titles(client, auth_headers) == ["Task 2", "Task 1", "Task 3", "Task 0"]
+
+    def test_move_writes_one_row(self, client, auth_headers, ordered_tasks, count_queries):
+        client.get("/auth/me", headers=auth_headers)
+        with count_queries() as counter:
+            client.patch(
+                f"/tasks/{ordered_tasks[3]}/move",
+                headers=auth_headers,
+                json={"after_id": ordered_tasks[0], "before_id": ordered_tasks[1]}
+            )
+        updates = [s for s in counter.statements if s.startswith("UPDATE")]
+        assert len(updates) == 1
+
+    def test_move_unknown_task(self, client, auth_headers, ordered_tasks):
+        response = client.patch("/tasks/9999/move", headers=auth_headers, json={})
+        assert response.status_code == 404
+        response = client.patch(
+            f"/tasks/{ordered_tasks[0]}/move", headers=auth_headers, json={"after_id": 9999}
+        )
+        assert response.status_code == 404
+
+    def test_move_other_users_task(self, client, auth_headers_user2, ordered_tasks):
+        response = client.patch(
+            f"/tasks/{ordered_tasks[0]}/move", headers=auth_headers_user2, json={}
+        )
+        assert response.status_code == 404
+
+    def test_repeated_bisection_rebalances(self, client, auth_headers, ordered_tasks, db):
+        from app.models import Task
+
+        first, second, third, fourth = ordered_tasks
+        upper = first
+        for _ in range(60):
+            client.patch(
+                f"/tasks/{third}/move", headers=auth_headers, json={"after_id": upper, "before_id": second}
+            )
+            client.patch(
+                f"/tasks/{fourth}/move", headers=auth_headers, json={"after_id": third, "before_id": second}
+            )
+            third, fourth = fourth, third
+
+        order = titles(client, auth_headers)
+        assert order[0] == "Task 0" and order[-1] == "Task 1"
+        db.expire_all()
+        positions = sorted(t.position for t in db.query(Task).all())
+        assert len(set(positions)) == 4
+        assert min(b - a for a, b in zip(positions, positions[1:])) > 1e-6
+
+
+class TestPositionHelpers:
+    def test_position_between(self):
+        from app.utils.positions import position_between
+
+        assert position_between(2.0, 1.0) == 1.5
+        assert position_between(None, 3.0) == 4.0
+        assert position_between(3.0, None) == 2.0
+        assert position_between(1.0, 1.0) is None
+        assert position_between(1.0, 1.0 + 2.2e-16) is None
@@ -0,0 +1,115 @@
+import pytest
+
+
+def titles(response):
+    data = response.json()
+    items = data["items"] if isinstance(data, dict) else data
+    return [task["title"] for task in items]
+
+
+@pytest.fixture
+def tasks(client, auth_headers):
+    for title, description in [
+        ("Buy milk", "from the corner store"),
+        ("Write report", "quarterly numbers, mention milk prices"),
+        ("Call mom", None),
+        ("Milk the milk budget", "milk"),
+    ]:
+        client.post("/tasks", json={"title": title, "description": description}, headers=auth_headers)
+
+
+class TestTaskSearch:
+    def test_matches_title_and_description_ranked(self, client, auth_headers, tasks):
+        response = client.get("/tasks?q=milk", headers=auth_headers)
+        assert response.status_code == 200
+        result = titles(response)
+        assert set(result) == {"Buy milk", "Write report", "Milk the milk budget"}
+        assert result[0] == "Milk the milk budget"
+
+    def test_all_words_must_match(self, client, auth_headers, tasks):
+        response = client.get("/tasks?q=milk store", headers=auth_headers)
+        assert titles(response) == ["Buy milk"]
+
+    def test_last_word_matches_prefix(self, client, auth_headers, tasks):
+        response = client.get("/tasks?q=quart", headers=auth_headers)
+        assert titles(response) == ["Write report"]
+
+    def test_operators_in_input_are_literal(self, client, auth_headers, tasks):
+        response = client.get('/tasks?q=milk" OR (mom', headers=auth_headers)
+        assert response.status_code == 200
+        assert titles(response) == []
+
+    def test_query_without_words_matches_nothing(self, client, auth_headers, tasks):
+        response = client.get("/tasks?q=!!!", headers=auth_headers)
+        assert response.status_code == 200
+        assert titles(response) == []
+        assert client.get("/tasks/stats?q=!!!", headers=auth_headers).json()["total"] == 0
+        response = client.post("/tasks/bulk/delete", json={"filter": {"q": "!!!"}}, headers=auth_headers)
+        assert response.json()["affected"] == 0
+
+    def test_combines_with_filters(self, client, auth_headers, tasks):
+        task_id = client.get("/tasks?q=buy", headers=auth_headers).json()[0]["id"]
+        client.patch(f"/tasks/{task_id}/toggle", headers=auth_headers)
+
+        response = client.get("/tasks?q=milk&status=pending", headers=auth_headers)
+        assert set(titles(response)) == {"Write report", "Milk the milk budget"}
+
+    def test_explicit_sort_overrides_relevance(self, client, auth_headers, tasks):
+        response = client.get("/tasks?q=milk&sort_by=created_at", headers=auth_headers)
+        assert titles(response) == ["Buy milk", "Write report", "Milk the milk budget"]
+
+    def test_paginates_by_relevance(self, client, auth_headers, tasks):
+        expected = titles(client.get("/tasks?q=milk", headers=auth_headers))
+
+        seen, cursor = [], None
+        while True:
+            url = "/tasks?q=milk&limit=1" + (f"&cursor={cursor}" if cursor else "")
+            page = client.get(url, headers=auth_headers).json()
+            seen.extend(task["title"] for task in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+
+    def test_index_follows_updates_and_deletes(self, client, auth_headers, tasks):
+        task_id = client.get("/tasks?q=mom", headers=auth_headers).json()[0]["id"]
+
+        client.patch(f"/tasks/{task_id}", json={"title": "Call dad"}, headers=auth_headers)
+        assert titles(client.get("/tasks?q=mom", headers=auth_headers)) == []
+        assert titles(client.get("/tasks?q=dad", headers=auth_headers)) == ["Call dad"]
+
+        client.delete(f"/tasks/{task_id}", headers=auth_headers)
+        assert titles(client.get("/tasks?q=dad", headers=auth_headers)) == []
+
+    def test_scoped_to_current_user(self, client, auth_headers, auth_headers_user2, tasks):
+        response = client.get("/tasks?q=milk", headers=auth_headers_user2)
+        assert response.json() == []
+
+    def test_bulk_selection_accepts_q(self, client, auth_headers, tasks):
+        response = client.post(
+            "/tasks/bulk/toggle",
+            json={"filter": {"q": "milk"}, "completed": True},
+            headers=auth_headers,
+        )
+        assert response.json()["affected"] == 3
+        assert titles(client.get("/tasks?status=pending", headers=auth_headers)) == ["Call mom"]
+
+
+class TestSearchIndexUpgrade:
+    def test_existing_tasks_are_indexed(self, db, user):
+        from app.models import Task
+        from app.search import apply_search_index
+        from tests.conftest import engine
+
+        db.add(Task(title="Legacy errand", user_id=user[1].id))
+        db.commit()
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE tasks_fts")
+
+        assert apply_search_index(engine) is True
+        assert apply_search_index(engine) is False
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(
+                "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'legacy'"
+            ).all()
+        assert len(rows) == 1
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+NOW = datetime(2030, 6, 15, 12, 0)
+
+
+@pytest.fixture
+def seeded(db, user, tag):
+    from app.models import Tag, Task
+
+    user_id = user[1].id
+    home = Tag(name="home", user_id=user_id)
+    unused = Tag(name="unused", user_id=user_id)
+    db.add_all([home, unused])
+    db.add_all([
+        Task(title="Overdue", user_id=user_id, priority=1, due_date=NOW - timedelta(days=2), tags=[tag]),
+        Task(title="Due this afternoon", user_id=user_id, priority=1, due_date=NOW + timedelta(hours=3), tags=[tag, home]),
+        Task(title="Done today", user_id=user_id, priority=3, completed=True, due_date=NOW - timedelta(hours=1)),
+        Task(title="Someday", user_id=user_id),
+        Task(title="Next week", user_id=user_id, priority=3, due_date=NOW + timedelta(days=7), tags=[home]),
+    ])
+    db.commit()
+    return {"work": tag.id, "home": home.id, "unused": unused.id}
+
+
+def stats(db, user_id=1, now=NOW, **filters):
+    from app.utils.filters import TaskFilters
+    from app.utils.stats import task_stats
+
+    params = dict(status=None, priority=None, tag_id=None, due_before=None, due_after=None,
+                  overdue=None, no_due_date=None, q=None)
+    params.update(filters)
+    return task_stats(db, user_id, TaskFilters(**params), now=now)
+
+
+class TestTaskStats:
+    def test_counts(self, db, seeded):
+        result = stats(db)
+        assert (result.total, result.pending, result.completed) == (5, 4, 1)
+        assert result.overdue == 1
+        # "Done today" is completed, so only the pending task is due today.
+        assert result.due_today == 1
+        assert [(p.priority, p.count) for p in result.by_priority] == [(None, 1), (1, 2), (3, 2)]
+        assert [(t.name, t.count) for t in result.by_tag] == [("home", 2), ("unused", 0), ("work", 2)]
+
+    def test_filters_apply_to_every_count(self, db, seeded):
+        result = stats(db, tag_id=seeded["home"])
+        assert (result.total, result.pending, result.completed) == (2, 2, 0)
+        assert result.due_today == 1
+        assert [(t.name, t.count) for t in result.by_tag] == [("home", 2), ("unused", 0), ("work", 1)]
+
+        result = stats(db, status="completed")
+        assert (result.total, result.completed, result.overdue, result.due_today) == (1, 1, 0, 0)
+
+    def test_overdue_follows_the_clock(self, db, seeded):
+        assert stats(db).overdue == 1
+        # Cached until the next pending due date passes...
+        assert stats(db, now=NOW + timedelta(hours=2)).overdue == 1
+        assert stats(db, now=NOW + timedelta(hours=3, minutes=1)).overdue == 2
+        # ...and recomputed at midnight.
+        assert stats(db, now=NOW + timedelta(days=1)).due_today == 0
+
+    def test_cached_until_write(self, db, seeded, count_queries):
+        stats(db)
+        with count_queries() as counter:
+            stats(db)
+        assert counter.count == 1  # data version only
+
+        from app.models import Task
+
+        db.add(Task(title="New", user_id=1, priority=5))
+        db.commit()
+        result = stats(db)
+        assert result.total == 6
+        assert result.by_priority[-1].priority == 5
+
+    def test_overdue_filter_is_not_cached(self, db, seeded):
+        from app.changes import task_list_cache
+        from app.models import Task
+
+        # The overdue filter compares against the real clock.
+        db.add(Task(title="Long overdue", user_id=1, due_date=datetime(2020, 1, 1)))
+        db.commit()
+        assert stats(db, overdue=True).total == 1
+        assert len(task_list_cache) == 0
+
+
+class TestTaskStatsEndpoint:
+    def test_endpoint(self, client, auth_headers, seeded):
+        response = client.get("/tasks/stats?priority=3", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["by_priority"] == [{"priority": 3, "count": 2}]
+        assert set(data) == {"total", "pending", "completed", "overdue", "due_today", "by_priority", "by_tag"}
+
+    def test_scoped_to_current_user(self, client, auth_headers_user2, seeded):
+        data = client.get("/tasks/stats", headers=auth_headers_user2).json()
+        assert data["total"] == 0
+        assert data["by_tag"] == []
+
+    def test_invalidated_by_api_writes(self, client, auth_headers, seeded):
+        assert client.get("/tasks/stats", headers=auth_headers).json()["completed"] == 1
+        task_id = client.get("/tasks?status=pending", headers=auth_headers).json()[0]["id"]
+        client.patch(f"/tasks/{task_id}/toggle", headers=auth_headers)
+        assert client.get("/tasks/stats", headers=auth_headers).json()["completed"] == 2
+
+    def test_requires_auth(self, client):
+        assert client.get("/tasks/stats").status_code == 401